@@ -1,35 +1,562 @@
+import functools
+import math
+import re
 import tkinter as tk
 from tkinter import messagebox
+from tkworkers import TkExecutor, after_first_paint, profiling_requested
+
+# Expression engine limits. They keep every evaluation small and predictable:
+# the work done is bounded by the expression length, and no single operand or
+# intermediate result can grow without limit (e.g. a pasted 9**9**9).
+MAX_EXPRESSION_LENGTH = 4096 # Characters accepted in one expression
+MAX_OPERAND_DIGITS = 400 # Longest number literal (a float result can print with ~310 digits)
+MAX_RESULT_BITS = 1330 # Roughly 400 decimal digits for integer results
+COMPILE_CACHE_SIZE = 4096 # Compiled expressions kept in the LRU cache
+
+OPERATORS = '+-*/'
+NEGATE = '~' # Opcode for unary minus in compiled programs
+_PRECEDENCE = {'+': 1, '-': 1, '*': 2, '/': 2, NEGATE: 3}
+_TOKEN_RE = re.compile(r'\s*(?:(\d+\.?\d*|\.\d+)|([-+*/])|(\S))')
+
+
+def tokenize(expression):
+    """Splits an expression into numbers (int/float) and operator characters."""
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise OverflowError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+    tokens = []
+    for number, operator, junk in _TOKEN_RE.findall(expression):
+        if junk:
+            raise SyntaxError(f"Unexpected character {junk!r}")
+        if operator:
+            tokens.append(operator)
+        elif number:
+            tokens.append(_parse_number(number))
+    return tokens
+
+
+def _parse_number(text):
+    """Converts a number literal, enforcing the operand size limit."""
+    if len(text) > MAX_OPERAND_DIGITS:
+        raise OverflowError(f"Number longer than {MAX_OPERAND_DIGITS} digits")
+    if '.' not in text:
+        return int(text)
+    return _check_result(float(text))
+
+
+@functools.lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_expression(expression):
+    """Compiles an expression into a postfix program (a tuple of numbers and opcodes).
+
+    Results are cached, so repeated expressions skip tokenizing and parsing altogether.
+    """
+    return _compile_tokens(tokenize(expression))
+
+
+def _compile_tokens(tokens):
+    """Turns infix tokens into a postfix program using the shunting-yard algorithm.
+
+    Anything that is not an operator string is treated as an operand, which lets
+    the batch engine compile expression shapes with parameter slots. It never
+    recurses, regardless of how many operators are chained.
+    """
+    program = []
+    pending = [] # Operator stack
+    expect_operand = True
+    for token in tokens:
+        if type(token) is not str:
+            if not expect_operand:
+                raise SyntaxError("Missing operator between numbers")
+            program.append(token)
+            expect_operand = False
+        elif expect_operand:
+            # Only a sign may appear where a number is expected (e.g. "-5+3" or "5*-3")
+            if token == '-':
+                pending.append(NEGATE)
+            elif token != '+':
+                raise SyntaxError(f"Operator {token!r} is missing its left operand")
+        else:
+            precedence = _PRECEDENCE[token]
+            while pending and _PRECEDENCE[pending[-1]] >= precedence:
+                program.append(pending.pop())
+            pending.append(token)
+            expect_operand = True
+    if expect_operand:
+        raise SyntaxError("Expression is incomplete")
+    program.extend(reversed(pending))
+    return tuple(program)
+
+
+def _check_result(value):
+    """Rejects results that are infinite or too large to keep working with."""
+    if type(value) is int:
+        if value.bit_length() > MAX_RESULT_BITS:
+            raise OverflowError("Result is too large")
+    elif not math.isfinite(value):
+        raise OverflowError("Result is too large")
+    return value
+
+
+def apply_operator(operator, left, right):
+    """Applies one binary operator, enforcing the result limits."""
+    if operator == '+':
+        result = left + right
+    elif operator == '-':
+        result = left - right
+    elif operator == '*':
+        # Refuse integer products that would blow past the limit before computing them
+        if type(left) is int and type(right) is int and left.bit_length() + right.bit_length() > MAX_RESULT_BITS + 1:
+            raise OverflowError("Result is too large")
+        result = left * right
+    else:
+        result = left / right # Raises ZeroDivisionError like eval() did
+    return _check_result(result)
+
+
+def run_program(program):
+    """Executes a compiled postfix program and returns its numeric result."""
+    stack = []
+    push, pop = stack.append, stack.pop
+    for item in program:
+        if type(item) is not str:
+            push(item)
+        elif item == NEGATE:
+            stack[-1] = -stack[-1]
+        else:
+            right = pop()
+            stack[-1] = apply_operator(item, stack[-1], right)
+    return stack[-1]
+
+
+def evaluate(expression):
+    """Evaluates a '+-*/.' expression without Tk or eval().
+
+    Raises SyntaxError for malformed input, ZeroDivisionError for division by
+    zero and OverflowError when a limit is exceeded.
+    """
+    return run_program(compile_expression(expression))
+
+
+def format_result(value):
+    """Formats a result so that it can be typed back into the calculator (no exponent notation)."""
+    text = repr(value)
+    if 'e' in text:
+        from decimal import Decimal # Rarely needed, so not loaded at startup
+        text = format(Decimal(text), 'f')
+    return text
+
+
+class IncrementalExpression:
+    """An expression that is evaluated as it is typed, one character at a time.
+
+    After every character a small snapshot of the partial result is pushed:
+    the sum of the finished terms, the product of the finished factors of the
+    current term, the pending operators and the number being typed. Pushing
+    a character only folds the previous number into that snapshot, so it
+    respects precedence without re-parsing, and popping (DEL) just drops the
+    last snapshot. value() gives exactly what evaluate() would for the text.
+    """
+
+    # Snapshot layout: (total, add_op, term, mul_op, negative, number, error)
+    _EMPTY = (None, None, None, None, False, '', None)
+
+    def __init__(self, text=''):
+        self._chars = []
+        self._states = [self._EMPTY]
+        self.extend(text)
+
+    def __len__(self):
+        return len(self._chars)
+
+    def __str__(self):
+        return ''.join(self._chars)
+
+    @property
+    def last_char(self):
+        """The most recently typed character, or '' when empty."""
+        return self._chars[-1] if self._chars else ''
+
+    def clear(self):
+        """Forgets the whole expression."""
+        self._chars.clear()
+        del self._states[1:]
+
+    def push(self, char):
+        """Appends one character and updates the running result."""
+        self._chars.append(char)
+        self._states.append(self._advance(self._states[-1], char))
+
+    def extend(self, text):
+        """Appends several characters (e.g. pasted text); whitespace is skipped."""
+        for char in text:
+            if not char.isspace():
+                self.push(char)
+
+    def pop(self):
+        """Removes the last character in O(1) and returns it ('' when empty)."""
+        if not self._chars:
+            return ''
+        self._states.pop()
+        return self._chars.pop()
+
+    def _advance(self, state, char):
+        """Returns the snapshot that follows `state` once `char` is typed.
+
+        Arithmetic errors (e.g. a division by zero) are recorded but the syntax
+        is still followed, because a syntax error further on takes precedence,
+        just as it does in evaluate().
+        """
+        total, add_op, term, mul_op, negative, number, error = state
+        if isinstance(error, SyntaxError):
+            return state
+        if char.isdigit() or char == '.':
+            if char == '.' and '.' in number:
+                return state[:-1] + (SyntaxError("Number has two decimal points"),)
+            return (total, add_op, term, mul_op, negative, number + char, error)
+        if char not in OPERATORS:
+            return state[:-1] + (SyntaxError(f"Unexpected character {char!r}"),)
+        if not number:
+            # Only a sign may appear where a number is expected (e.g. "-5+3" or "5*-3")
+            if char == '-':
+                return (total, add_op, term, mul_op, not negative, number, error)
+            if char == '+':
+                return state
+            return state[:-1] + (SyntaxError(f"Operator {char!r} is missing its left operand"),)
+        if number == '.':
+            return state[:-1] + (SyntaxError("Expected a digit"),)
+        if error is None:
+            try:
+                term = self._fold_number(term, mul_op, negative, number)
+                if char in '+-':
+                    total = term if total is None else apply_operator(add_op, total, term)
+            except (ZeroDivisionError, OverflowError) as exc:
+                error = exc
+        if char in '*/':
+            return (total, add_op, term, char, False, '', error)
+        return (total, char, None, None, False, '', error)
+
+    @staticmethod
+    def _fold_number(term, mul_op, negative, number):
+        """Multiplies or divides the current term by the number being typed."""
+        value = _parse_number(number)
+        if negative:
+            value = -value
+        return value if term is None else apply_operator(mul_op, term, value)
+
+    def value(self):
+        """Returns the value of the whole expression, raising like evaluate() does."""
+        if len(self._chars) > MAX_EXPRESSION_LENGTH:
+            raise OverflowError(f"Expression longer than {MAX_EXPRESSION_LENGTH} characters")
+        total, add_op, term, mul_op, negative, number, error = self._states[-1]
+        if isinstance(error, SyntaxError):
+            raise error
+        if not number or number == '.':
+            raise SyntaxError("Expression is incomplete")
+        if error is not None:
+            raise error
+        term = self._fold_number(term, mul_op, negative, number)
+        return term if total is None else apply_operator(add_op, total, term)
+
+    def preview(self):
+        """Returns the value of the complete part of the expression, or None.
+
+        Trailing operators are ignored, so "12+3*" previews 12+3. Only the few
+        snapshots after the last number are skipped, so this stays O(1).
+        """
+        if len(self._chars) > MAX_EXPRESSION_LENGTH:
+            return None
+        index = len(self._states) - 1
+        while index > 0 and not self._states[index][5] and self._states[index][6] is None:
+            index -= 1
+        total, add_op, term, mul_op, negative, number, error = self._states[index]
+        if error is not None or not number or number == '.':
+            return None
+        try:
+            term = self._fold_number(term, mul_op, negative, number)
+            return term if total is None else apply_operator(add_op, total, term)
+        except (ZeroDivisionError, OverflowError):
+            return None
+
+
+# Batch evaluation. Rows that differ only in their numbers (e.g. "12*3+4" and
+# "7*9+1") share a shape ("#*#+#"), which is compiled once and evaluated over
+# whole columns with NumPy when it is installed. Errors are reported per row
+# as codes instead of exceptions or message boxes.
+ERR_OK = 0
+ERR_SYNTAX = 1
+ERR_ZERO_DIVISION = 2
+ERR_OVERFLOW = 3
+ERROR_NAMES = {ERR_OK: "ok", ERR_SYNTAX: "syntax", ERR_ZERO_DIVISION: "zero-division", ERR_OVERFLOW: "overflow"}
+
+VECTORIZE_MIN_ROWS = 32 # Smaller shape groups are cheaper to run one by one
+BATCH_CHUNK_ROWS = 65536 # Rows read from a file per batch
+_EXACT_INT_DIGITS = 15 # Int literals up to this many digits are exact as float64
+_EXACT_FLOAT_INT = 2 ** 53 # Integer results beyond this are not exact as float64
+_NUMBER_SPLIT_RE = re.compile(r'(\d+\.?\d*|\.\d+)')
+_SHAPE_CHARS = frozenset('#.' + OPERATORS)
+
+
+def _error_code(exc):
+    """Maps an engine exception onto a batch error code."""
+    if isinstance(exc, ZeroDivisionError):
+        return ERR_ZERO_DIVISION
+    if isinstance(exc, OverflowError):
+        return ERR_OVERFLOW
+    return ERR_SYNTAX
+
+
+def _evaluate_row(expression):
+    """Evaluates one row, returning a (value, error_code) pair."""
+    try:
+        return evaluate(expression), ERR_OK
+    except (SyntaxError, ZeroDivisionError, OverflowError) as exc:
+        return None, _error_code(exc)
+
+
+def split_shape(expression):
+    """Splits an expression into its shape and its number literals (as strings).
+
+    In the shape, int literals become '#' and float literals '.', so every row
+    of a shape has the same operand types and a shape program gives the same
+    results as evaluate() on each row.
+    """
+    parts = _NUMBER_SPLIT_RE.split(expression)
+    literals = parts[1::2]
+    if '.' in expression:
+        shape = ''.join(sep + ('.' if '.' in literal else '#') for sep, literal in zip(parts[0::2], literals)) + parts[-1]
+    else:
+        shape = '#'.join(parts[0::2])
+    if ' ' in shape:
+        shape = shape.replace(' ', '')
+    return shape, literals
+
+
+@functools.lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_shape(shape):
+    """Compiles a shape; operands in the program are column indexes."""
+    tokens = []
+    slot = 0
+    for char in shape:
+        if char in '#.':
+            tokens.append(slot)
+            slot += 1
+        else:
+            tokens.append(char)
+    return _compile_tokens(tokens)
+
+
+def _import_numpy():
+    """Returns the numpy module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _run_vectorized(np, program, shape, columns):
+    """Runs a shape program over columns of literal strings.
+
+    Returns (values, errors, exact, holds_ints). Rows flagged as not exact
+    involve numbers float64 cannot represent exactly (or literals over the
+    size limit) and must be re-run through evaluate().
+    """
+    int_operands = [char == '#' for char in shape if char in '#.']
+    rows = len(columns[0])
+    errors = np.zeros(rows, dtype=np.uint8)
+    exact = np.ones(rows, dtype=bool)
+    arrays = []
+    for column, is_int in zip(columns, int_operands):
+        text = np.array(column)
+        lengths = np.char.str_len(text)
+        exact &= lengths <= (_EXACT_INT_DIGITS if is_int else MAX_OPERAND_DIGITS)
+        values = np.where(exact, text, '0').astype(np.float64)
+        errors[~np.isfinite(values) & (errors == ERR_OK)] = ERR_OVERFLOW
+        arrays.append(values)
+
+    stack = [] # (array, holds_ints) pairs
+    with np.errstate(all='ignore'):
+        for item in program:
+            if type(item) is not str:
+                stack.append((arrays[item], int_operands[item]))
+                continue
+            if item == NEGATE:
+                values, is_int = stack[-1]
+                stack[-1] = (-values, is_int)
+                continue
+            right, right_int = stack.pop()
+            left, left_int = stack[-1]
+            is_int = left_int and right_int
+            if item == '+':
+                result = left + right
+            elif item == '-':
+                result = left - right
+            elif item == '*':
+                result = left * right
+            else:
+                errors[(right == 0) & (errors == ERR_OK)] = ERR_ZERO_DIVISION
+                result = left / right
+                is_int = False
+            if is_int:
+                exact &= np.abs(result) < _EXACT_FLOAT_INT
+            errors[~np.isfinite(result) & (errors == ERR_OK)] = ERR_OVERFLOW
+            stack[-1] = (result, is_int)
+    values, is_int = stack[-1]
+    return values, errors, exact, is_int
+
+
+def evaluate_batch(expressions, vectorize=True):
+    """Evaluates many expressions, returning a list of (value, error_code) pairs.
+
+    value is None whenever error_code is not ERR_OK. With vectorize=True and
+    NumPy installed, rows sharing a shape are evaluated as arrays; the results
+    are identical to calling evaluate() on each row.
+    """
+    expressions = list(expressions)
+    np = _import_numpy() if vectorize else None
+    if np is None:
+        return [_evaluate_row(expression) for expression in expressions]
+
+    results = [None] * len(expressions)
+    groups = {} # shape -> ([row indexes], [literal lists])
+    for row, expression in enumerate(expressions):
+        if len(expression) > MAX_EXPRESSION_LENGTH:
+            results[row] = (None, ERR_OVERFLOW)
+            continue
+        shape, literals = split_shape(expression)
+        group = groups.get(shape)
+        if group is None:
+            group = groups[shape] = ([], [])
+        group[0].append(row)
+        group[1].append(literals)
+
+    for shape, (rows, literal_rows) in groups.items():
+        # A '#' or a bare '.' typed in a row looks like an operand slot in its
+        # shape ("5-." shares "#-." with "14-278.7"); such rows run one by one.
+        slots = shape.count('#') + shape.count('.')
+        if any(len(literals) != slots for literals in literal_rows):
+            kept = []
+            for row, literals in zip(rows, literal_rows):
+                if len(literals) == slots:
+                    kept.append((row, literals))
+                else:
+                    results[row] = _evaluate_row(expressions[row])
+            if not kept:
+                continue
+            rows, literal_rows = map(list, zip(*kept))
+        program = None
+        if len(rows) >= VECTORIZE_MIN_ROWS and _SHAPE_CHARS.issuperset(shape) and ('#' in shape or '.' in shape):
+            try:
+                program = _compile_shape(shape)
+            except SyntaxError:
+                for row in rows:
+                    results[row] = (None, ERR_SYNTAX)
+                continue
+        if program is None:
+            for row in rows:
+                results[row] = _evaluate_row(expressions[row])
+            continue
+        columns = list(zip(*literal_rows))
+        values, errors, exact, is_int = _run_vectorized(np, program, shape, columns)
+        convert = int if is_int else float
+        for row, value, error, is_exact in zip(rows, values.tolist(), errors.tolist(), exact.tolist()):
+            if not is_exact:
+                results[row] = _evaluate_row(expressions[row])
+            elif error:
+                results[row] = (None, error)
+            else:
+                results[row] = (convert(value), ERR_OK)
+    return results
+
+
+def evaluate_file(lines, vectorize=True, chunk_rows=BATCH_CHUNK_ROWS):
+    """Streams (expression, value, error_code) triples for an iterable of lines (e.g. an open file)."""
+    chunk = []
+    for line in lines:
+        chunk.append(line.strip())
+        if len(chunk) >= chunk_rows:
+            yield from zip(chunk, *zip(*evaluate_batch(chunk, vectorize)))
+            chunk = []
+    if chunk:
+        yield from zip(chunk, *zip(*evaluate_batch(chunk, vectorize)))
+
+
+def run_batch_cli(argv=None):
+    """Command line entry point: evaluates one expression per input line.
+
+    Writes "value<TAB>error" per line, where error is one of ERROR_NAMES.
+    """
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Evaluate calculator expressions in bulk.")
+    parser.add_argument("--batch", metavar="FILE", required=True, help="file with one expression per line ('-' for stdin)")
+    parser.add_argument("--output", metavar="FILE", default="-", help="where to write results ('-' for stdout)")
+    parser.add_argument("--no-vectorize", action="store_true", help="evaluate rows one by one even if NumPy is available")
+    args = parser.parse_args(argv)
+
+    source = sys.stdin if args.batch == '-' else open(args.batch, encoding="utf-8")
+    target = sys.stdout if args.output == '-' else open(args.output, "w", encoding="utf-8")
+    try:
+        for _, value, error in evaluate_file(source, vectorize=not args.no_vectorize):
+            target.write(f"{'' if value is None else format_result(value)}\t{ERROR_NAMES[error]}\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
 
 class CalculatorApp:
     def __init__(self, root):
         """Initialize the calculator ."""
         self.root = root
         self.root.title("PRO Calc-o-Matic 🖤")
-        self.root.geometry("300x450") # Slightly larger to fit buttons
+        self.root.geometry("300x470") # Slightly larger to fit buttons and the live preview
         self.root.resizable(False, False)
         self.root.configure(bg="#000000") # Jet Black background
 
-        self.expression = ""
+        # The expression is kept as a token stack with running partial results,
+        # so each key press and DEL is O(1) and "=" needs no re-parse.
+        self.expr = IncrementalExpression()
         self.input_text = tk.StringVar()
+        self.preview_text = tk.StringVar()
+        # Held keys and pastes can queue many edits per frame; the preview is
+        # recomputed once per idle pass instead of once per edit. It is O(1)
+        # from the running result, so only coalesce() is used and it stays on
+        # the Tk thread; the executor never starts a pool here.
+        self.workers = TkExecutor(root)
 
         # Display Field
         # A sleek, dark display for input and results
-        self.input_frame = tk.Frame(root, width=300, height=80, bd=0, highlightbackground="#333333", highlightthickness=1, bg="#1a1a1a")
+        self.input_frame = tk.Frame(root, width=300, height=100, bd=0, highlightbackground="#333333", highlightthickness=1, bg="#1a1a1a")
         self.input_frame.pack(side=tk.TOP, pady=10)
         self.input_frame.pack_propagate(False) # Prevents the frame from resizing to fit contents
 
+        # Live preview of the result, updated on every key press
+        self.preview_label = tk.Label(self.input_frame, textvariable=self.preview_text, font=("Inter", 11),
+                                      bg="#1a1a1a", fg="#888888", anchor="e")
+        self.preview_label.pack(side=tk.BOTTOM, fill="x", padx=6)
+
         self.input_field = tk.Entry(self.input_frame, font=("Inter", 24, "bold"), textvariable=self.input_text,
                                     width=50, bg="#1a1a1a", fg="#E0E0E0", bd=0, justify=tk.RIGHT,
                                     insertbackground="#E0E0E0", cursor="xterm") # Dark grey background, light text
         self.input_field.pack(ipady=10, expand=True, fill="both")
         self.input_field.focus_set()
+        # Typed keys and pasted text go through the same path as the buttons,
+        # so the display always matches the expression being evaluated.
+        self.input_field.bind("<Key>", self.key_press)
+        self.input_field.bind("<<Paste>>", self.paste)
 
         # Buttons Frame
         # Organize buttons in a grid for a standard calculator layout
         self.btns_frame = tk.Frame(root, bg="#000000")
         self.btns_frame.pack()
+        # The display paints first and takes typing straight away; the 18
+        # buttons are built once it is on screen.
+        after_first_paint(root, self._create_buttons)
 
+    def _create_buttons(self):
+        """Builds the button grid."""
         # Button styling dictionary for reusability and theme consistency
         self.button_style = {
             "font": ("Inter", 16),
@@ -98,47 +625,90 @@ class CalculatorApp:
     def button_click(self, char):
         """Handles number and operator button clicks."""
         # Prevent multiple operators in a row (e.g., "5++")
-        if char in '+-*/.' and self.expression and self.expression[-1] in '+-*/.':
+        if char in '+-*/.' and self.expr.last_char and self.expr.last_char in '+-*/.':
             # Replace the last operator if a new one is pressed
-            self.expression = self.expression[:-1] + char
+            self.expr.pop()
+            self.input_field.delete(len(self.expr))
+        self.expr.push(char)
+        self.input_field.insert(tk.END, char) # Only the new character is sent to the display
+        self.workers.coalesce("preview", self._update_preview)
+
+    def key_press(self, event):
+        """Routes keyboard input through the button handlers."""
+        if event.char and event.char in '0123456789+-*/.':
+            self.button_click(event.char)
+        elif event.keysym == 'BackSpace':
+            self.clear_last()
+        elif event.keysym in ('Return', 'KP_Enter') or event.char == '=':
+            self.evaluate_expression()
+        elif event.keysym == 'Escape':
+            self.clear_all()
         else:
-            self.expression += str(char)
-        self.input_text.set(self.expression)
+            return None # Let navigation and shortcut keys (e.g. Ctrl+V) through
+        return "break"
+
+    def paste(self, event=None):
+        """Appends pasted text to the expression in one go."""
+        try:
+            text = ''.join(self.root.clipboard_get().split())
+        except tk.TclError:
+            return "break"
+        self.expr.extend(text)
+        self.input_field.insert(tk.END, text)
+        self.workers.coalesce("preview", self._update_preview)
+        return "break"
 
     def clear_all(self):
         """Clears the entire expression."""
-        self.expression = ""
+        self.workers.cancel("preview")
+        self.expr.clear()
         self.input_text.set("")
+        self.preview_text.set("")
 
     def clear_last(self):
         """Deletes the last character from the expression (backspace functionality)."""
-        self.expression = self.expression[:-1]
-        self.input_text.set(self.expression)
+        if self.expr.pop():
+            self.input_field.delete(len(self.expr))
+        self.workers.coalesce("preview", self._update_preview)
+
+    def _update_preview(self):
+        """Shows the running result of the expression typed so far."""
+        value = self.expr.preview()
+        self.preview_text.set("" if value is None else "= " + format_result(value))
 
     def evaluate_expression(self):
         """Evaluates the mathematical expression and displays the result."""
         try:
-            # Using eval() for simplicity; for production, a safer parser is recommended.
-            # Replace 'x' with '*' for multiplication if needed (input uses '*')
-            # eval() handles standard operators directly.
-            result = str(eval(self.expression))
-            self.expression = result
+            # The running result is already known, so "=" does not re-parse the
+            # text. Only numbers and + - * / are understood (no eval()).
+            self.workers.cancel("preview")
+            result = format_result(self.expr.value())
+            self.expr = IncrementalExpression(result)
             self.input_text.set(result)
+            self.preview_text.set("")
         except ZeroDivisionError:
             messagebox.showerror("Error", "Can't divide by zero! ⛔", parent=self.root)
-            self.expression = "" # Clear expression on error
-            self.input_text.set("")
+            self.clear_all() # Clear expression on error
         except SyntaxError:
             messagebox.showerror("Error", "Invalid expression! 🤔", parent=self.root)
-            self.expression = ""
-            self.input_text.set("")
+            self.clear_all()
+        except OverflowError:
+            messagebox.showerror("Error", "That number is too big! 🚀", parent=self.root)
+            self.clear_all()
         except Exception as e:
             messagebox.showerror("Error", f"An unexpected error occurred: {e} 🐛", parent=self.root)
-            self.expression = ""
-            self.input_text.set("")
+            self.clear_all()
 
 if __name__ == "__main__":
+    import sys
+    profile = profiling_requested(sys.argv)
+    if len(sys.argv) > 1:
+        run_batch_cli()
+        sys.exit()
     app_root = tk.Tk()
+    if profile:
+        import tkprofile
+        tkprofile.install(app_root)
     calculator = CalculatorApp(app_root)
     app_root.mainloop()
 
@@ -1,17 +1,844 @@
+import io
+import os
+import queue
+import re
+import sqlite3
+import sys
+import threading
+import unicodedata
 import tkinter as tk
-from tkinter import messagebox
+import tkinter.font as tkfont
+from array import array
+from bisect import bisect_left, insort
+from collections import OrderedDict, defaultdict
+from heapq import nsmallest
+from itertools import chain, islice
+from tkinter import filedialog, messagebox
+from tkworkers import TkExecutor, after_first_paint, profiling_requested
+
+SEARCH_FIELDS = ('name', 'phone', 'email', 'address')
+SEARCH_DEBOUNCE_MS = 150 # Delay before search-as-you-type runs
+_WORD_RE = re.compile(r'\w+')
+_NON_DIGITS_RE = re.compile(r'\D+')
+
+class ContactStore:
+    """Contacts keyed by stable integer IDs, in insertion order, with O(1) get/update/delete."""
+
+    def __init__(self):
+        self._contacts = {} # id -> contact dict
+        self._next_id = 1
+
+    def __len__(self): return len(self._contacts)
+    def __iter__(self): return iter(self._contacts.values())
+    def __contains__(self, cid): return cid in self._contacts
+    def ids(self): return list(self._contacts)
+    def items(self): return self._contacts.items()
+    def get(self, cid): return self._contacts.get(cid)
+
+    def add(self, data):
+        cid = self._next_id; self._next_id += 1
+        self._contacts[cid] = dict(data); return cid
+
+    def update(self, cid, data): self._contacts[cid].update(data)
+    def delete(self, cid): return self._contacts.pop(cid)
+
+class _SortedList:
+    """A sorted list stored as chunks of at most 2 * CHUNK items, so add and discard move few items."""
+    CHUNK = 512
+
+    def __init__(self): self._chunks = []; self._maxes = []
+
+    def add(self, item):
+        if not self._chunks: self._chunks.append([item]); self._maxes.append(item); return
+        k = min(bisect_left(self._maxes, item), len(self._maxes) - 1); chunk = self._chunks[k]
+        insort(chunk, item); self._maxes[k] = chunk[-1]
+        if len(chunk) > 2 * self.CHUNK:
+            self._chunks[k:k + 1] = [chunk[:self.CHUNK], chunk[self.CHUNK:]]; self._maxes[k:k + 1] = [chunk[self.CHUNK - 1], chunk[-1]]
+
+    def discard(self, item):
+        k = bisect_left(self._maxes, item)
+        if k == len(self._maxes): return
+        chunk = self._chunks[k]; i = bisect_left(chunk, item)
+        if i < len(chunk) and chunk[i] == item:
+            del chunk[i]
+            if chunk: self._maxes[k] = chunk[-1]
+            else: del self._chunks[k]; del self._maxes[k]
+
+    def __iter__(self): return chain.from_iterable(self._chunks)
+
+    def irange(self, start):
+        """Items >= start, in order."""
+        k = bisect_left(self._maxes, start)
+        if k == len(self._maxes): return iter(())
+        return chain(islice(self._chunks[k], bisect_left(self._chunks[k], start), None), chain.from_iterable(self._chunks[k + 1:]))
+
+SEARCH_WINDOW = 64 # Ranked matches computed at a time for the list: a screenful and then some
+_RANK_WHOLE = 4096 # A rank with at most this many candidates is ranked whole; larger ones are read in name order
+
+class ContactSearchIndex:
+    """Incremental search index over contact fields.
+
+    Queries of 3+ characters match substrings through trigram indexes kept per
+    field, so each rank of _rank (name, phone, email, address) has its own
+    candidates: only the posting list of the query's rarest trigram in that
+    field. Shorter queries match word prefixes through postings of every
+    1- and 2-character word prefix. Phone numbers are also indexed as bare
+    digits, so "555 123" finds "(555) 123-4567".
+
+    search(query, limit) ranks only the best `limit` matches: name-prefix
+    matches (ranks 0 and 1) are read from a name-sorted list, and every later
+    rank is ranked whole if it has few candidates or else read in name order
+    until enough are found. count() counts matches without ranking them.
+    Postings are append-only arrays; removed or changed contacts are filtered
+    out at query time and the arrays are rebuilt once enough of them are stale.
+    """
+
+    def __init__(self):
+        self._docs = {} # id -> (name, phone, email, address, phone digits, all fields, all words), lowercased
+        self._grams = [{} for _ in range(5)] # Per doc field: trigram -> array of ids
+        self._prefixes = {} # 1- or 2-character word prefix -> array of ids
+        self._names = _SortedList() # (name, id) of every contact
+        self._stale = 0
+
+    def __len__(self): return len(self._docs)
+
+    @staticmethod
+    def _digits(text): return ''.join(ch for ch in text if ch.isdigit())
+
+    def add(self, cid, contact):
+        fields = [contact.get(f, '').lower() for f in SEARCH_FIELDS] + [self._digits(contact.get('phone', ''))]
+        hay = '\n'.join(fields); words = set(_WORD_RE.findall(hay))
+        self._docs[cid] = (*fields, hay, ' ' + ' '.join(words)); self._names.add((fields[0], cid))
+        for grams, t in zip(self._grams, fields):
+            for g in {t[i:i + 3] for i in range(len(t) - 2)}: grams.setdefault(g, array('I')).append(cid)
+        for p in {w[:n] for w in words for n in (1, 2)}: self._prefixes.setdefault(p, array('I')).append(cid)
+
+    def remove(self, cid):
+        doc = self._docs.pop(cid, None)
+        if doc is not None: self._names.discard((doc[0], cid)); self._stale += 1; self._maybe_rebuild()
+
+    def update(self, cid, contact):
+        self.remove(cid); self.add(cid, contact)
+
+    def _maybe_rebuild(self):
+        if self._stale < max(1024, len(self._docs)): return
+        docs = self._docs; self.__init__()
+        for cid, doc in docs.items(): self.add(cid, dict(zip(SEARCH_FIELDS, doc)))
+
+    @classmethod
+    def _terms(cls, query):
+        """The lowercased query and, for a phone-like query of 3+ digits, its digits; fewer digits are matched as text only."""
+        q = query.strip().lower()
+        qd = cls._digits(q) if q.strip('0123456789+-(). ') == '' else ''
+        return q, qd if len(qd) >= 3 else ''
+
+    @staticmethod
+    def _match(doc, q, qd):
+        if len(q) >= 3 or len(qd) >= 3: return q in doc[5] or bool(qd and qd in doc[4])
+        return ' ' + q in doc[6] # Word prefix
+
+    def _posting(self, field, needle):
+        """Candidates for `needle` in one field: the posting list of its rarest trigram."""
+        if len(needle) < 3: return ()
+        posts = [self._grams[field].get(needle[i:i + 3]) for i in range(len(needle) - 2)]
+        return min(posts, key=len) if all(posts) else ()
+
+    def _candidates(self, q, qd):
+        """Posting lists covering every match: per field for 3+ characters, by word prefix otherwise."""
+        if len(q) < 3 and len(qd) < 3: return [self._prefixes.get(q, ())]
+        return [self._posting(f, q) for f in range(4)] + [self._posting(4, qd)]
+
+    def matches(self, query, cid):
+        """Whether contact `cid` matches `query`."""
+        q, qd = self._terms(query); doc = self._docs.get(cid)
+        return bool(q) and doc is not None and self._match(doc, q, qd)
+
+    def count(self, query):
+        """The number of contacts matching `query`."""
+        q, qd = self._terms(query); docs = self._docs
+        if not q: return 0
+        return sum(1 for cid in set(chain.from_iterable(self._candidates(q, qd))) if cid in docs and self._match(docs[cid], q, qd))
+
+    def search(self, query, limit=None):
+        """Returns matching contact IDs, best matches first: at most `limit` of them, all when it is None."""
+        q, qd = self._terms(query); docs = self._docs
+        if not q: return []
+        rank = lambda cid: (*self._rank(docs[cid], q, qd), cid) # ID breaks ties, as in ContactRepository
+        if limit is None:
+            cands = set(chain.from_iterable(self._candidates(q, qd)))
+            return sorted((cid for cid in cands if cid in docs and self._match(docs[cid], q, qd)), key=rank)
+        found = []
+        for name, cid in self._names.irange((q,)): # Ranks 0 and 1, already in order
+            if len(found) == limit or not name.startswith(q): break
+            if self._match(docs[cid], q, qd): found.append(cid)
+        if len(q) < 3 and len(qd) < 3: groups = [((2, 3, 4, 5), self._candidates(q, qd))]
+        else: groups = [((2,), [self._posting(0, q)]), ((3,), [self._posting(1, q), self._posting(4, qd)]), ((4,), [self._posting(2, q)]), ((5,), [self._posting(3, q)])]
+        for scores, postings in groups:
+            need = limit - len(found)
+            if need <= 0: break
+            if sum(map(len, postings)) <= _RANK_WHOLE:
+                hits = {cid for cid in chain.from_iterable(postings) if cid in docs and self._match(docs[cid], q, qd) and self._rank(docs[cid], q, qd)[0] in scores}
+                found += nsmallest(need, hits, key=rank); continue
+            buckets = {score: [] for score in scores} # Filled in name order; done once the best rank has enough
+            for name, cid in self._names:
+                doc = docs[cid]
+                if not self._match(doc, q, qd): continue
+                score = self._rank(doc, q, qd)[0]
+                if score in buckets:
+                    buckets[score].append(cid)
+                    if score == scores[0] and len(buckets[score]) >= need: break
+            found += list(chain.from_iterable(buckets.values()))[:need]
+        return found
+
+    @staticmethod
+    def _rank(doc, q, qd):
+        name = doc[0]
+        if name.startswith(q): score = 0 if name == q else 1
+        elif q in name: score = 2
+        elif q in doc[1] or (qd and qd in doc[4]): score = 3
+        elif q in doc[2]: score = 4
+        else: score = 5
+        return score, name
+
+class SearchRows:
+    """Ranked search results as a lazy sequence for VirtualListbox, like PagedRows for the whole book.
+
+    Matches are ranked only as far as the rows asked for: each read past them
+    ranks twice as many. The count is taken without ranking. Mutations go to
+    the repository first; append/extend/del here only drop what was ranked.
+    """
+
+    def __init__(self, index, query, lock): self._index = index; self._query = query; self._lock = lock; self.reset()
+    def reset(self): self._ids = []; self._complete = False; self._len = None
+    def append(self, cid): self.reset()
+    def extend(self, cids): self.reset()
+    def __delitem__(self, pos): self.reset()
+
+    def __len__(self):
+        if self._len is None:
+            with self._lock: self._len = self._index.count(self._query)
+        return self._len
+
+    def _ranked(self, stop):
+        if stop > len(self._ids) and not self._complete:
+            limit = max(stop, 2 * len(self._ids), SEARCH_WINDOW)
+            with self._lock: self._ids = self._index.search(self._query, limit)
+            self._complete = len(self._ids) < limit
+        return self._ids
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, _ = i.indices(len(self))
+            return self._ranked(stop)[start:stop]
+        if i < 0: i += len(self)
+        ids = self._ranked(i + 1)
+        if not 0 <= i < len(ids): raise IndexError("row index out of range")
+        return ids[i]
+
+    def __iter__(self): return iter(self._ranked(len(self)))
+    def __contains__(self, cid):
+        with self._lock: return self._index.matches(self._query, cid) # Without ranking up to it
+    def index(self, cid):
+        if cid not in self._ids: self._ranked(len(self))
+        return self._ids.index(cid)
+
+# --- Repositories ---
+# The app talks to one of two repositories with the same interface:
+# add/add_many/update/delete/get/__len__, rows(query) for the list view
+# (safe to call from a worker thread when there is a query),
+# export_rows() for a background export, items() for duplicate search,
+# add_batches (None when imports must be inserted on the Tk thread) and close().
+
+DB_PATH = os.path.join(os.path.expanduser('~'), '.contact_book', 'contacts.db')
+PAGE_ROWS = 256 # IDs per keyset page
+PAGE_CACHE_PAGES = 64
+
+class MemoryContactRepository:
+    """Unsaved, in-process contacts: a ContactStore plus its ContactSearchIndex."""
+
+    def __init__(self):
+        self.store = ContactStore(); self.index = ContactSearchIndex()
+        self._lock = threading.Lock() # Searches run on a worker while the Tk thread edits
+
+    def __len__(self): return len(self.store)
+    def get(self, cid): return self.store.get(cid)
+
+    def rows(self, query=''):
+        if not query.strip(): return self.store.ids()
+        rows = SearchRows(self.index, query, self._lock); len(rows); rows[:SEARCH_WINDOW] # Counted and first window ranked on the calling (worker) thread
+        return rows
+
+    def add(self, data):
+        cid = self.store.add(data)
+        with self._lock: self.index.add(cid, self.store.get(cid))
+        return cid
+
+    def add_many(self, contacts): return [self.add(c) for c in contacts]
+    add_batches = None # Not thread-safe: imported batches go through add_many on the Tk thread
+
+    def update(self, cid, data):
+        self.store.update(cid, data)
+        with self._lock: self.index.update(cid, self.store.get(cid))
+
+    def delete(self, cid):
+        self.store.delete(cid)
+        with self._lock: self.index.remove(cid)
+
+    def export_rows(self):
+        return (c for c in map(self.store.get, self.store.ids()) if c is not None) # IDs snapshotted now, rows read lazily
+
+    def items(self): return [(cid, dict(c)) for cid, c in self.store.items()] # Snapshot, safe to hand to a worker
+
+    def close(self): pass
+
+# Accents are kept (remove_diacritics 0), so "é" and "e" differ in both search backends.
+_WORDS_TABLE = """CREATE VIRTUAL TABLE IF NOT EXISTS contacts_words USING fts5(name, phone, email, address,
+    content='contacts', content_rowid='id', prefix='1 2', tokenize='unicode61 remove_diacritics 0')"""
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS contacts (id INTEGER PRIMARY KEY, name TEXT NOT NULL, phone TEXT NOT NULL,
+    email TEXT NOT NULL DEFAULT '', address TEXT NOT NULL DEFAULT '', digits TEXT NOT NULL DEFAULT '');
+CREATE TABLE IF NOT EXISTS contact_count (n INTEGER NOT NULL);
+INSERT INTO contact_count SELECT (SELECT count(*) FROM contacts) WHERE NOT EXISTS (SELECT 1 FROM contact_count);
+DELETE FROM contact_count WHERE rowid > (SELECT min(rowid) FROM contact_count); -- Extra (0) rows left by older versions; the first row was always kept current
+CREATE VIRTUAL TABLE IF NOT EXISTS contacts_grams USING fts5(name, phone, email, address, digits,
+    content='contacts', content_rowid='id', tokenize='trigram');
+{_WORDS_TABLE};
+CREATE TRIGGER IF NOT EXISTS contacts_ai AFTER INSERT ON contacts BEGIN
+    INSERT INTO contacts_grams(rowid, name, phone, email, address, digits) VALUES (new.id, new.name, new.phone, new.email, new.address, new.digits);
+    INSERT INTO contacts_words(rowid, name, phone, email, address) VALUES (new.id, new.name, new.phone, new.email, new.address);
+    UPDATE contact_count SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_ad AFTER DELETE ON contacts BEGIN
+    INSERT INTO contacts_grams(contacts_grams, rowid, name, phone, email, address, digits) VALUES ('delete', old.id, old.name, old.phone, old.email, old.address, old.digits);
+    INSERT INTO contacts_words(contacts_words, rowid, name, phone, email, address) VALUES ('delete', old.id, old.name, old.phone, old.email, old.address);
+    UPDATE contact_count SET n = n - 1;
+END;
+CREATE TRIGGER IF NOT EXISTS contacts_au AFTER UPDATE ON contacts BEGIN
+    INSERT INTO contacts_grams(contacts_grams, rowid, name, phone, email, address, digits) VALUES ('delete', old.id, old.name, old.phone, old.email, old.address, old.digits);
+    INSERT INTO contacts_words(contacts_words, rowid, name, phone, email, address) VALUES ('delete', old.id, old.name, old.phone, old.email, old.address);
+    INSERT INTO contacts_grams(rowid, name, phone, email, address, digits) VALUES (new.id, new.name, new.phone, new.email, new.address, new.digits);
+    INSERT INTO contacts_words(rowid, name, phone, email, address) VALUES (new.id, new.name, new.phone, new.email, new.address);
+END;
+"""
+# Statements are fixed strings, so sqlite3's per-connection statement cache prepares each one once.
+_INSERT_SQL = "INSERT INTO contacts (name, phone, email, address, digits) VALUES (:name, :phone, :email, :address, :digits)"
+_UPDATE_SQL = "UPDATE contacts SET name = :name, phone = :phone, email = :email, address = :address, digits = :digits WHERE id = :id"
+_DELETE_SQL = "DELETE FROM contacts WHERE id = ?"
+_GET_SQL = "SELECT name, phone, email, address FROM contacts WHERE id = ?"
+# Matches ranked like ContactSearchIndex._rank: exact name, name prefix, name substring, phone, email, anything else.
+# py_lower is str.lower (SQLite's lower() only folds ASCII), run once per column by materializing f.
+_SEARCH_SQL = """WITH f AS MATERIALIZED (SELECT c.id AS id, py_lower(c.name) AS n, py_lower(c.phone) AS p, py_lower(c.email) AS e, c.digits AS d
+    FROM {fts} JOIN contacts c ON c.id = {fts}.rowid WHERE {fts} MATCH :match)
+SELECT id FROM f ORDER BY CASE WHEN n = :q THEN 0 WHEN substr(n, 1, length(:q)) = :q THEN 1 WHEN instr(n, :q) THEN 2
+    WHEN instr(p, :q) OR (:qd <> '' AND instr(d, :qd)) THEN 3 WHEN instr(e, :q) THEN 4 ELSE 5 END, n, id"""
+_GRAM_SEARCH_SQL = _SEARCH_SQL.format(fts='contacts_grams')
+_WORD_SEARCH_SQL = _SEARCH_SQL.format(fts='contacts_words')
+# Keyset pages over all contacts in id order; OFFSET only for jumps to an uncached page.
+_PAGE_AFTER_SQL = "SELECT id FROM contacts WHERE id > ? ORDER BY id LIMIT ?"
+_PAGE_BEFORE_SQL = "SELECT id FROM contacts WHERE id < ? ORDER BY id DESC LIMIT ?"
+_PAGE_AT_SQL = "SELECT id FROM contacts ORDER BY id LIMIT ? OFFSET ?"
+_POSITION_SQL = "SELECT count(*) FROM contacts WHERE id < ?"
+
+class PagedRows:
+    """All contact IDs in id order, as a lazy sequence for VirtualListbox.
+
+    IDs are read a page at a time. A page next to a cached one is read by
+    keyset (WHERE id > last id), so scrolling never re-reads the rows it
+    skips; only a jump to an uncached page (dragging the scrollbar) falls back
+    to OFFSET. Mutations go to the repository first; append/extend/del here
+    only drop the cache.
+    """
+
+    def __init__(self, db): self._db = db; self.reset()
+    def reset(self): self._pages = OrderedDict(); self._len = None
+    def append(self, cid): self.reset()
+    def extend(self, cids): self.reset()
+    def __delitem__(self, pos): self.reset()
+
+    def __len__(self):
+        if self._len is None: self._len = self._db.execute("SELECT n FROM contact_count").fetchone()[0]
+        return self._len
+
+    def _page(self, k):
+        page = self._pages.get(k)
+        if page is not None: self._pages.move_to_end(k); return page
+        prev, nxt = self._pages.get(k - 1), self._pages.get(k + 1)
+        if prev: rows = self._db.execute(_PAGE_AFTER_SQL, (prev[-1], PAGE_ROWS))
+        elif nxt: rows = reversed(self._db.execute(_PAGE_BEFORE_SQL, (nxt[0], PAGE_ROWS)).fetchall())
+        else: rows = self._db.execute(_PAGE_AT_SQL, (PAGE_ROWS, k * PAGE_ROWS))
+        page = self._pages[k] = [row[0] for row in rows]
+        if len(self._pages) > PAGE_CACHE_PAGES: self._pages.popitem(last=False)
+        return page
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, _ = i.indices(len(self))
+            if start >= stop: return []
+            first = start // PAGE_ROWS; ids = []
+            for k in range(first, (stop - 1) // PAGE_ROWS + 1): ids += self._page(k)
+            return ids[start - first * PAGE_ROWS:stop - first * PAGE_ROWS]
+        if i < 0: i += len(self)
+        page = self._page(i // PAGE_ROWS) if i >= 0 else []
+        if i % PAGE_ROWS >= len(page): raise IndexError("row index out of range")
+        return page[i % PAGE_ROWS]
+
+    def __iter__(self):
+        k = 0
+        while page := self._page(k): yield from page; k += 1
+
+    def __contains__(self, cid):
+        return isinstance(cid, int) and self._db.execute("SELECT 1 FROM contacts WHERE id = ?", (cid,)).fetchone() is not None
+
+    def index(self, cid):
+        for k, page in self._pages.items(): # The visible window is always cached
+            if cid in page: return k * PAGE_ROWS + page.index(cid)
+        if cid not in self: raise ValueError(f"{cid} is not in the list")
+        return self._db.execute(_POSITION_SQL, (cid,)).fetchone()[0]
+
+class ContactRepository:
+    """Contacts saved in SQLite (WAL mode) with FTS5 search.
+
+    Two external-content FTS5 tables are kept in sync by triggers: a trigram
+    table answers substring queries of 3+ characters, and a word table with a
+    prefix index answers shorter, word-prefix queries, the same split as
+    ContactSearchIndex. rows() returns PagedRows for the whole book, so opening
+    it costs the same whatever its size, and a ranked array of IDs for a search.
+    """
+
+    def __init__(self, path=DB_PATH):
+        if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._db = self._connect(path); self._owner = threading.get_ident()
+        self._local = threading.local(); self._readers = [] # Search connections of worker threads
+        with self._db: self._db.executescript(_SCHEMA)
+        if 'remove_diacritics 0' not in self._db.execute("SELECT sql FROM sqlite_master WHERE name = 'contacts_words'").fetchone()[0]:
+            with self._db: # Built by an older version that folded accents away; re-tokenize it
+                self._db.execute("DROP TABLE contacts_words"); self._db.execute(_WORDS_TABLE)
+                self._db.execute("INSERT INTO contacts_words(contacts_words) VALUES ('rebuild')")
+
+    @staticmethod
+    def _connect(path, **kw):
+        db = sqlite3.connect(path, **kw)
+        db.execute("PRAGMA journal_mode=WAL"); db.execute("PRAGMA synchronous=NORMAL")
+        db.create_function('py_lower', 1, str.lower, deterministic=True)
+        return db
+
+    def __len__(self): return self._db.execute("SELECT n FROM contact_count").fetchone()[0]
+
+    def get(self, cid):
+        row = self._db.execute(_GET_SQL, (cid,)).fetchone()
+        return dict(zip(SEARCH_FIELDS, row)) if row else None
+
+    @staticmethod
+    def _params(data):
+        p = {k: data.get(k, '') for k in SEARCH_FIELDS}; p['digits'] = ContactSearchIndex._digits(p['phone']); return p
+
+    def add(self, data):
+        with self._db: return self._db.execute(_INSERT_SQL, self._params(data)).lastrowid
+
+    def add_many(self, contacts, db=None):
+        db = db or self._db
+        with db: return [db.execute(_INSERT_SQL, self._params(c)).lastrowid for c in contacts] # One transaction per batch
+
+    def add_batches(self, batches):
+        """Inserts batches of contacts from a worker thread, on its own connection, yielding each batch's IDs.
+
+        WAL lets the Tk thread keep reading while a batch commits.
+        """
+        db = self._connect(self.path)
+        try:
+            for batch in batches: yield self.add_many(batch, db)
+        finally: db.close()
+
+    def update(self, cid, data):
+        with self._db: self._db.execute(_UPDATE_SQL, {**self._params({**self.get(cid), **data}), 'id': cid})
+
+    def delete(self, cid):
+        with self._db: self._db.execute(_DELETE_SQL, (cid,))
+
+    def _reader(self):
+        """The main connection on the thread that opened the repository, else one kept per worker thread."""
+        if threading.get_ident() == self._owner: return self._db
+        db = getattr(self._local, 'db', None)
+        if db is None: db = self._local.db = self._connect(self.path, check_same_thread=False); self._readers.append(db)
+        return db
+
+    def rows(self, query=''):
+        q, qd = ContactSearchIndex._terms(query)
+        if not q: return PagedRows(self._db)
+        quote = lambda s: '"' + s.replace('"', '""') + '"'
+        if len(q) >= 3 or len(qd) >= 3:
+            terms = ([quote(q)] if len(q) >= 3 else []) + (['digits:' + quote(qd)] if len(qd) >= 3 else [])
+            sql, match = _GRAM_SEARCH_SQL, ' OR '.join(terms)
+        else: sql, match = _WORD_SEARCH_SQL, quote(q) + '*'
+        return array('I', (row[0] for row in self._reader().execute(sql, {'q': q, 'qd': qd, 'match': match})))
+
+    def export_rows(self):
+        """Yields every contact from a separate read connection, so it can run on a worker thread."""
+        db = self._connect(self.path)
+        try:
+            for row in db.execute("SELECT name, phone, email, address FROM contacts ORDER BY id"): yield dict(zip(SEARCH_FIELDS, row))
+        finally: db.close()
+
+    def items(self):
+        """Yields (id, contact) pairs from a separate read connection, so it can run on a worker thread."""
+        db = self._connect(self.path)
+        try:
+            for cid, *row in db.execute("SELECT id, name, phone, email, address FROM contacts ORDER BY id"): yield cid, dict(zip(SEARCH_FIELDS, row))
+        finally: db.close()
+
+    def close(self):
+        for db in self._readers: db.close()
+        self._db.close()
+
+def open_contact_repository(path=DB_PATH):
+    """Opens the saved book, or an unsaved in-memory one for ':memory:' or when SQLite lacks FTS5."""
+    if path != ':memory:':
+        try: return ContactRepository(path)
+        except sqlite3.OperationalError as e:
+            if 'fts5' not in str(e) and 'tokenizer' not in str(e): raise
+            print(f"Contacts will not be saved: this SQLite has no FTS5 trigram support ({e}).", file=sys.stderr)
+    return MemoryContactRepository()
+
+# --- Streaming import/export ---
+# Readers are generators over an open text file, so a file is never held in
+# memory whole; records flow reader -> _clean -> _batched into the app.
+
+CONTACT_FORMATS = {'.csv': 'csv', '.vcf': 'vcard', '.vcard': 'vcard', '.jsonl': 'jsonl', '.ndjson': 'jsonl'}
+IMPORT_BATCH_SIZE = 5000 # Contacts inserted (and the list refreshed) per Tk callback
+IMPORT_QUEUE_BATCHES = 4 # Parsed batches buffered ahead of the UI
+PROGRESS_POLL_MS = 50
+_CSV_ALIASES = {'full name': 'name', 'fn': 'name', 'telephone': 'phone', 'tel': 'phone', 'mobile': 'phone', 'e-mail': 'email', 'mail': 'email'}
+
+def contact_format(path):
+    """Picks the file format from the extension."""
+    fmt = CONTACT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt is None: raise ValueError(f"Unsupported file type: {path} (use .csv, .vcf or .jsonl)")
+    return fmt
+
+def read_csv(f):
+    import csv
+    rows = csv.reader(f); header = next(rows, None)
+    if header is None: return
+    cols = [(i, _CSV_ALIASES.get(h.strip().lower(), h.strip().lower())) for i, h in enumerate(header)]
+    cols = [(i, k) for i, k in cols if k in SEARCH_FIELDS]
+    for row in rows: yield {k: row[i] for i, k in cols if i < len(row)}
+
+def _vcard_unescape(value): return re.sub(r'\\(.)', lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+def _vcard_escape(value): return value.replace('\\', '\\\\').replace(',', '\\,').replace(';', '\\;').replace('\n', '\\n')
+
+def _vcard_lines(f):
+    """Unfolds vCard continuation lines (those starting with a space or tab)."""
+    pending = None
+    for line in f:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and pending is not None: pending += line[1:]; continue
+        if pending is not None: yield pending
+        pending = line
+    if pending is not None: yield pending
+
+def read_vcard(f):
+    card = None
+    for line in _vcard_lines(f):
+        key, sep, value = line.partition(':')
+        if not sep: continue
+        prop = key.split(';', 1)[0].split('.')[-1].upper() # Drops parameters and group prefixes
+        if prop == 'BEGIN' and value.strip().upper() == 'VCARD': card = {}
+        elif card is None: continue
+        elif prop == 'END': yield card; card = None
+        elif prop == 'FN': card.setdefault('name', _vcard_unescape(value))
+        elif prop == 'N' and 'name' not in card:
+            parts = [_vcard_unescape(p) for p in re.split(r'(?<!\\);', value)]
+            card['name'] = ' '.join(p for p in (parts[1:2] + parts[:1]) if p)
+        elif prop == 'TEL': card.setdefault('phone', _vcard_unescape(value))
+        elif prop == 'EMAIL': card.setdefault('email', _vcard_unescape(value))
+        elif prop == 'ADR': card.setdefault('address', ', '.join(p for p in (_vcard_unescape(p).strip() for p in re.split(r'(?<!\\);', value)) if p))
+
+def read_jsonl(f):
+    import json
+    for line in f:
+        if line.strip(): yield json.loads(line)
+
+def write_csv(f, contacts):
+    import csv
+    out = csv.writer(f); out.writerow(SEARCH_FIELDS)
+    for c in contacts: out.writerow([c.get(k, '') for k in SEARCH_FIELDS])
+
+def write_vcard(f, contacts):
+    for c in contacts:
+        f.write(f"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:{_vcard_escape(c.get('name', ''))}\r\nTEL:{_vcard_escape(c.get('phone', ''))}\r\n")
+        if c.get('email'): f.write(f"EMAIL:{_vcard_escape(c['email'])}\r\n")
+        if c.get('address'): f.write(f"ADR:;;{_vcard_escape(c['address'])};;;;\r\n")
+        f.write("END:VCARD\r\n")
+
+def write_jsonl(f, contacts):
+    import json
+    for c in contacts: f.write(json.dumps({k: c.get(k, '') for k in SEARCH_FIELDS}, ensure_ascii=False) + '\n')
+
+READERS = {'csv': read_csv, 'vcard': read_vcard, 'jsonl': read_jsonl}
+WRITERS = {'csv': write_csv, 'vcard': write_vcard, 'jsonl': write_jsonl}
+
+def _clean(records, skipped):
+    """Keeps the known fields as stripped strings; drops records without a name or phone (counted in skipped[0])."""
+    for r in records:
+        c = {k: str(r.get(k) or '').strip() for k in SEARCH_FIELDS} if isinstance(r, dict) else {}
+        if c.get('name') and c.get('phone'): yield c
+        else: skipped[0] += 1
+
+def _batched(items, size):
+    items = iter(items)
+    while batch := list(islice(items, size)): yield batch
+
+def import_batches(path, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """Yields lists of clean contacts from a file; progress(done_bytes, total_bytes, skipped) runs per batch."""
+    total = os.path.getsize(path); skipped = [0]
+    with open(path, 'rb') as raw, io.TextIOWrapper(raw, encoding='utf-8-sig', newline='') as f:
+        for batch in _batched(_clean(READERS[contact_format(path)](f), skipped), batch_size):
+            if progress: progress(raw.tell(), total, skipped[0])
+            yield batch
+    if progress: progress(total, total, skipped[0])
+
+def export_contacts(path, contacts):
+    """Streams contacts to a file in the format its extension names."""
+    writer = WRITERS[contact_format(path)]
+    with open(path, 'w', encoding='utf-8', newline='' if writer is write_csv else None) as f: writer(f, contacts)
+
+# --- Duplicate detection ---
+# Contacts are only compared when they share a blocking key (the same
+# normalized phone number or email, or for a short number such as an
+# extension, the same number and name), and within a block only with their
+# next few neighbours in name order, so the work grows with the book, not its square.
+# A candidate pair's score adds fixed weights for a shared phone and email to
+# a weighted fuzzy name similarity; pairs at or above the threshold are joined
+# into groups with union-find. A link through a shared phone alone (households
+# and offices share numbers) never joins groups whose names conflict, so
+# "Jane Smith" and "John Smith" stay apart even through a "J. Smith".
+
+MIN_PHONE_DIGITS = 7 # Shorter numbers are too ambiguous to block on without the name
+PHONE_KEY_DIGITS = 10 # Trailing digits compared, so "+44 20 7946 0958" == "020 7946 0958"
+DEDUPE_WINDOW = 8 # Neighbours compared within a block (sorted by name)
+PHONE_WEIGHT, EMAIL_WEIGHT, NAME_WEIGHT = 0.4, 0.4, 0.5
+DUPLICATE_THRESHOLD = 0.8 # Shared phone or email alone is not enough; it needs a name similarity of 0.8 too
+NAME_WORD_SIMILARITY = 0.75 # Words at least this alike are spellings of one name ("jon"/"john"), not two names
+
+def normalize_phone(phone):
+    digits = _NON_DIGITS_RE.sub('', phone)
+    return digits[-PHONE_KEY_DIGITS:] if len(digits) >= MIN_PHONE_DIGITS else ''
+
+def normalize_email(email):
+    local, at, domain = email.strip().lower().rpartition('@')
+    if not at or not local or not domain: return ''
+    local = local.split('+', 1)[0] # Plus-addressing tags
+    if domain in ('gmail.com', 'googlemail.com'): local = local.replace('.', ''); domain = 'gmail.com'
+    return f'{local}@{domain}'
+
+def normalize_name(name):
+    """Lowercase words without accents, sorted so "Smith, John" == "John Smith"."""
+    text = name.lower()
+    if not text.isascii(): text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    return ' '.join(sorted(_WORD_RE.findall(text)))
+
+def duplicate_score(a, b, threshold=0.0):
+    """Scores two (phone, email, name) key tuples in [0, 1]; returns 0 early once `threshold` is out of reach."""
+    base = PHONE_WEIGHT * bool(a[0] and a[0] == b[0]) + EMAIL_WEIGHT * bool(a[1] and a[1] == b[1])
+    if a[2] == b[2]: return min(1.0, base + NAME_WEIGHT * bool(a[2]))
+    need = (threshold - base) / NAME_WEIGHT
+    if need > 1 or not a[2] or not b[2]: return min(1.0, base) if need <= 0 else 0.0
+    from difflib import SequenceMatcher # Only duplicate search needs it, so it is not loaded at startup
+    m = SequenceMatcher(None, a[2], b[2], autojunk=False)
+    if need > 0 and (m.real_quick_ratio() < need or m.quick_ratio() < need): return 0.0 # Cheap upper bounds first
+    return min(1.0, base + NAME_WEIGHT * m.ratio())
+
+def names_conflict(a, b):
+    """Whether two normalized names belong to different people, e.g. "jane smith" and "john smith".
+
+    Words both share are set aside; every word left in the shorter name must be
+    a prefix or initial of, or spelled nearly like, a word left in the other.
+    """
+    wa, wb = a.split(), b.split()
+    for w in set(wa) & set(wb): wa.remove(w); wb.remove(w)
+    if len(wa) > len(wb): wa, wb = wb, wa
+    if not wa: return False
+    from difflib import SequenceMatcher
+    return any(not any(x.startswith(w) or w.startswith(x) or SequenceMatcher(None, w, x).ratio() >= NAME_WORD_SIMILARITY for x in wb) for w in wa)
+
+def find_duplicates(items, threshold=DUPLICATE_THRESHOLD):
+    """Groups likely duplicates among (id, contact) pairs.
+
+    Returns lists of IDs (lowest first, so the oldest contact leads), biggest groups first.
+    """
+    keys = {}; blocks = defaultdict(list)
+    for cid, c in items:
+        phone = c.get('phone', '')
+        k = keys[cid] = (normalize_phone(phone) or _NON_DIGITS_RE.sub('', phone), normalize_email(c.get('email', '')), normalize_name(c.get('name', '')))
+        if len(k[0]) >= MIN_PHONE_DIGITS: blocks['p' + k[0]].append(cid)
+        elif k[0] and k[2]: blocks['s' + k[0] + ' ' + k[2]].append(cid)
+        if k[1]: blocks['e' + k[1]].append(cid)
+    parent = {}; names = {} # Root -> normalized names in its group, for phone-only links
+    def root(x):
+        while parent.get(x, x) != x: parent[x] = parent.get(parent[x], parent[x]); x = parent[x] # Path halving
+        return x
+    for members in blocks.values():
+        if len(members) < 2: continue
+        members.sort(key=lambda cid: keys[cid][2])
+        for i, a in enumerate(members):
+            for b in members[i + 1:i + 1 + DEDUPE_WINDOW]:
+                if duplicate_score(keys[a], keys[b], threshold) >= threshold:
+                    ra, rb = root(a), root(b)
+                    if ra == rb: continue
+                    na, nb = names.get(ra, [keys[ra][2]]), names.get(rb, [keys[rb][2]])
+                    if not (keys[a][1] and keys[a][1] == keys[b][1]) and any(names_conflict(x, y) for x in na for y in nb): continue
+                    parent[max(ra, rb)] = min(ra, rb); names[min(ra, rb)] = na + nb; names.pop(max(ra, rb), None)
+    groups = defaultdict(list) # Roots never get a parent entry, so each group is its root plus the IDs under it
+    for cid in parent: groups[root(cid)].append(cid)
+    return sorted((sorted([r] + g) for r, g in groups.items()), key=lambda g: (-len(g), g[0]))
+
+def merge_contacts(records):
+    """Folds a group into its first record: the longest name, then each field's first non-empty value."""
+    merged = {k: records[0].get(k, '') for k in SEARCH_FIELDS}
+    merged['name'] = max((r.get('name', '') for r in records), key=len)
+    for k in SEARCH_FIELDS[1:]:
+        if not merged[k]: merged[k] = next((r[k] for r in records if r.get(k)), '')
+    return merged
+
+def merge_duplicates(repo, ids):
+    """Merges a group of contact IDs into the first one and deletes the rest; returns the kept ID."""
+    ids = [cid for cid in ids if repo.get(cid) is not None]
+    if not ids: return None
+    repo.update(ids[0], merge_contacts([repo.get(cid) for cid in ids]))
+    for cid in ids[1:]: repo.delete(cid)
+    return ids[0]
+
+class VirtualListbox:
+    """Shows a window of a long row list in a Listbox, rendering only the visible rows.
+
+    `rows` is a list of contact IDs and `formatter` turns an ID into row text.
+    The widget holds at most one screenful of items; scrolling goes through
+    the Scrollbar protocol (yview/set) and every render only rewrites the
+    rows whose text actually changed, so an edit touches a single item.
+    """
+
+    def __init__(self, listbox, scrollbar, formatter, empty_text=""):
+        self.listbox, self.scrollbar, self.formatter, self.empty_text = listbox, scrollbar, formatter, empty_text
+        self.rows = []; self.top = 0; self.visible = int(listbox.cget('height'))
+        self._rendered = [] # Texts currently in the widget
+        self._selected = None # Selected ID, kept while it is scrolled out of view
+        self._line = tkfont.Font(font=listbox.cget('font')).metrics('linespace') + 1
+        scrollbar.config(command=self.yview); listbox.config(yscrollcommand='')
+        listbox.bind('<<ListboxSelect>>', self._on_select, add='+')
+        listbox.bind('<Configure>', self._on_resize)
+        listbox.bind('<MouseWheel>', lambda e: self.yview('scroll', -1 if e.delta > 0 else 1, 'units'))
+        listbox.bind('<Button-4>', lambda e: self.yview('scroll', -1, 'units'))
+        listbox.bind('<Button-5>', lambda e: self.yview('scroll', 1, 'units'))
+        for key, step, page in (('<Up>', -1, False), ('<Down>', 1, False), ('<Prior>', -1, True), ('<Next>', 1, True)):
+            listbox.bind(key, lambda e, step=step, page=page: self._move_selection(step * (self.visible if page else 1)))
+
+    def set_rows(self, rows):
+        self.rows = rows; self.top = 0
+        if self._selected not in rows: self._selected = None
+        self.render()
+
+    def append(self, cid):
+        self.rows.append(cid)
+        self.render()
+
+    def extend(self, cids):
+        self.rows.extend(cids)
+        self.render() # One render per batch, not per row
+
+    def remove(self, cid):
+        try: pos = self.rows.index(cid)
+        except ValueError: return
+        del self.rows[pos]
+        if cid == self._selected: self._selected = None
+        if self.top <= pos < self.top + len(self._rendered) and len(self.rows) > 0:
+            # Drop just that item; render() then only fills the freed slot at the bottom
+            self.listbox.delete(pos - self.top); del self._rendered[pos - self.top]
+        elif pos < self.top: self.top -= 1
+        self.render()
+
+    def refresh(self):
+        self.render() # Only rows whose text changed are rewritten
+
+    def selected_id(self): return self._selected
+    def clear_selection(self): self._selected = None; self.listbox.selection_clear(0, tk.END)
+
+    def yview(self, *args):
+        if args[0] == 'moveto': top = int(float(args[1]) * len(self.rows))
+        elif args[0] == 'scroll': top = self.top + int(args[1]) * (self.visible if args[2] == 'pages' else 1)
+        else: return
+        self.top = top; self.render()
+
+    def render(self):
+        self.top = max(0, min(self.top, len(self.rows) - self.visible))
+        texts = [self.formatter(cid) for cid in self.rows[self.top:self.top + self.visible]] or [self.empty_text]
+        lb, old = self.listbox, self._rendered
+        for i, text in enumerate(texts):
+            if i >= len(old): lb.insert(tk.END, text)
+            elif old[i] != text: lb.delete(i); lb.insert(i, text)
+        if len(old) > len(texts): lb.delete(len(texts), tk.END)
+        self._rendered = texts
+        n = len(self.rows)
+        if n: self.scrollbar.set(self.top / n, (self.top + len(texts)) / n)
+        else: self.scrollbar.set(0, 1)
+        lb.selection_clear(0, tk.END)
+        if self._selected is not None:
+            pos = self._position(self._selected)
+            if pos is not None: lb.selection_set(pos)
+
+    def _position(self, cid):
+        window = self.rows[self.top:self.top + self.visible]
+        return window.index(cid) if cid in window else None
+
+    def _on_select(self, event=None):
+        sel = self.listbox.curselection()
+        if sel and self.top + sel[0] < len(self.rows): self._selected = self.rows[self.top + sel[0]]
+
+    def _on_resize(self, event):
+        visible = max(1, event.height // self._line)
+        if visible != self.visible: self.visible = visible; self.render()
+
+    def _move_selection(self, step):
+        if not self.rows: return 'break'
+        pos = self.rows.index(self._selected) + step if self._selected in self.rows else self.top
+        pos = max(0, min(pos, len(self.rows) - 1))
+        if pos < self.top: self.top = pos
+        elif pos >= self.top + self.visible: self.top = pos - self.visible + 1
+        self._selected = self.rows[pos]; self.render(); self.listbox.event_generate('<<ListboxSelect>>')
+        return 'break'
 
 class ContactBookApp:
 
-    def __init__(self, master):
+    def __init__(self, master, db_path=DB_PATH):
         self.master = master
         master.title("My Contact Book")
         master.geometry("800x600")
         master.configure(bg='#8A2BE2') # Violet background
 
-        self.contacts = []
+        self.contacts = None # Opened once the window is on screen
+        self.workers = TkExecutor(master) # Searches run here, off the Tk thread
+        self._search_job = None
+        self._io_queue = None # Set while an import or export runs in the background
+        self._showing_all = True
         self._setup_ui() # Consolidate UI creation
-        self._refresh_list()
+        master.protocol("WM_DELETE_WINDOW", self._on_close)
+        after_first_paint(master, self._finish_startup, db_path)
+
+    def _finish_startup(self, db_path):
+        """Builds the buttons and search bar, then opens the book and shows its first page."""
+        self._setup_actions()
+        self.contacts = open_contact_repository(db_path)
+        self.status.config(text=""); self._refresh_list()
+
+    def _ready(self):
+        """False, with a note in the status bar, until the contact book has been opened."""
+        if self.contacts is None: self.status.config(text="Still opening your contacts, one moment...")
+        return self.contacts is not None
+
+    def _on_close(self):
+        self.workers.shutdown()
+        if self.contacts: self.contacts.close()
+        self.master.destroy()
 
     def _setup_ui(self):
         # Input fields and labels
@@ -22,28 +849,38 @@ class ContactBookApp:
             entry = tk.Entry(input_frame, width=40, bd=2, relief='solid', font=('Arial', 11)); entry.grid(row=i, column=1, padx=5, pady=2)
             self.entries[text.replace(":", "").lower()] = entry
 
+        # Placeholders for the button and search rows, filled in by _setup_actions after the first paint
+        self._btn_frame = tk.Frame(self.master, bg='#8A2BE2'); self._btn_frame.pack(pady=5, padx=10, fill='x')
+        self._srch_frame = tk.Frame(self.master, bg='#8A2BE2'); self._srch_frame.pack(pady=5, padx=10, fill='x')
+
+        # Contact list display
+        list_frame = tk.Frame(self.master, bg='#FFFFFF', bd=2, relief='groove'); list_frame.pack(pady=10, padx=10, expand=True, fill='both')
+        self.contact_listbox = tk.Listbox(list_frame, height=10, bd=2, relief='solid', font=('Arial', 11), selectbackground='#8A2BE2', selectforeground='#FFFFFF')
+        self.contact_listbox.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        scrollbar = tk.Scrollbar(list_frame); scrollbar.pack(side='right', fill='y')
+        self.view = VirtualListbox(self.contact_listbox, scrollbar, self._format_row, "No contacts yet!")
+        self.contact_listbox.bind('<<ListboxSelect>>', self._load_selected, add='+') # After the view has tracked the selection
+        self.status = tk.Label(self.master, text="Opening your contacts...", bg='#8A2BE2', fg='#FFFFFF', font=('Arial', 10), anchor='w'); self.status.pack(fill='x', padx=10, pady=(0, 5))
+
+    def _setup_actions(self):
         # Buttons for actions
-        btn_frame = tk.Frame(self.master, bg='#8A2BE2'); btn_frame.pack(pady=5, padx=10, fill='x')
+        btn_frame = self._btn_frame
         btn_s = {'bg': '#FFFFFF', 'fg': '#8A2BE2', 'font': ('Arial', 10, 'bold'), 'width': 12, 'bd': 2, 'relief': 'raised'}
         tk.Button(btn_frame, text="Add", command=self._add, **btn_s).grid(row=0, column=0, padx=5, pady=5)
         tk.Button(btn_frame, text="Update", command=self._update, **btn_s).grid(row=0, column=1, padx=5, pady=5)
         tk.Button(btn_frame, text="Delete", command=self._delete, **btn_s).grid(row=0, column=2, padx=5, pady=5)
         tk.Button(btn_frame, text="Clear", command=self._clear_fields, **btn_s).grid(row=0, column=3, padx=5, pady=5)
+        tk.Button(btn_frame, text="Import...", command=self._import, **btn_s).grid(row=0, column=4, padx=5, pady=5)
+        tk.Button(btn_frame, text="Export...", command=self._export, **btn_s).grid(row=0, column=5, padx=5, pady=5)
 
         # Search bar and button
-        srch_frame = tk.Frame(self.master, bg='#8A2BE2'); srch_frame.pack(pady=5, padx=10, fill='x')
+        srch_frame = self._srch_frame
         tk.Label(srch_frame, text="Search:", bg='#8A2BE2', fg='#FFFFFF', font=('Arial', 12, 'bold')).pack(side='left', padx=5)
         self.search_entry = tk.Entry(srch_frame, width=30, bd=2, relief='solid', font=('Arial', 11)); self.search_entry.pack(side='left', padx=5)
+        self.search_entry.bind('<KeyRelease>', self._schedule_search) # Search as you type
         tk.Button(srch_frame, text="Search", command=self._search, **btn_s).pack(side='left', padx=5)
         tk.Button(srch_frame, text="View All", command=self._refresh_list, **btn_s).pack(side='left', padx=5)
-
-        # Contact list display
-        list_frame = tk.Frame(self.master, bg='#FFFFFF', bd=2, relief='groove'); list_frame.pack(pady=10, padx=10, expand=True, fill='both')
-        self.contact_listbox = tk.Listbox(list_frame, height=10, bd=2, relief='solid', font=('Arial', 11), selectbackground='#8A2BE2', selectforeground='#FFFFFF')
-        self.contact_listbox.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-        self.contact_listbox.bind('<<ListboxSelect>>', self._load_selected)
-        scrollbar = tk.Scrollbar(list_frame, command=self.contact_listbox.yview); scrollbar.pack(side='right', fill='y')
-        self.contact_listbox.config(yscrollcommand=scrollbar.set)
+        tk.Button(srch_frame, text="Find Duplicates", command=self._find_duplicates, **{**btn_s, 'width': 14}).pack(side='left', padx=5)
 
     def _get_fields_data(self):
         return {k: v.get().strip() for k, v in self.entries.items()}
@@ -52,52 +889,210 @@ class ContactBookApp:
         for entry in self.entries.values(): entry.delete(0, tk.END)
 
     def _add(self):
+        if not self._ready(): return
         data = self._get_fields_data()
         if not data['name'] or not data['phone']: messagebox.showwarning("Input Error", "Name and Phone are required!"); return
-        self.contacts.append(data); messagebox.showinfo("Success", "Contact added!"); self._clear_fields(); self._refresh_list()
+        cid = self.contacts.add(data); messagebox.showinfo("Success", "Contact added!"); self._clear_fields()
+        if self._showing_all: self.view.append(cid)
+        else: self._refresh_list()
 
-    def _refresh_list(self, display_contacts=None):
-        self.contact_listbox.delete(0, tk.END)
-        to_display = display_contacts if display_contacts is not None else self.contacts
-        if not to_display: self.contact_listbox.insert(tk.END, "No contacts yet!"); return
-        for c in to_display: self.contact_listbox.insert(tk.END, f"{c['name']} - {c['phone']}")
+    def _refresh_list(self, rows=None):
+        if not self._ready(): return
+        if rows is None: self.workers.cancel('search') # "View All" wins over a search still running
+        self._showing_all = rows is None
+        self.view.set_rows(self.contacts.rows() if rows is None else rows)
+
+    def _format_row(self, cid):
+        c = self.contacts.get(cid); return f"{c['name']} - {c['phone']}"
+
+    def _selected_id(self): return self.view.selected_id()
 
     def _load_selected(self, event=None):
-        idx = self.contact_listbox.curselection()
-        if not idx: return
-        displayed_txt = self.contact_listbox.get(idx[0])
-        sel_c = next((c for c in self.contacts if f"{c['name']} - {c['phone']}" == displayed_txt), None)
+        if not self._ready(): return
+        sel_c = self.contacts.get(self._selected_id())
         if sel_c:
             self._clear_fields()
             for k, entry_w in self.entries.items(): entry_w.insert(0, sel_c.get(k, ''))
 
     def _update(self):
-        idx = self.contact_listbox.curselection()
-        if not idx: messagebox.showwarning("Error", "Select contact to update."); return
-        displayed_txt = self.contact_listbox.get(idx[0])
-        orig_c = next((c for c in self.contacts if f"{c['name']} - {c['phone']}" == displayed_txt), None)
-        if orig_c:
-            new_data = self._get_fields_data()
-            if not new_data['name'] or not new_data['phone']: messagebox.showwarning("Error", "Name/Phone required for update!"); return
-            orig_c.update(new_data); messagebox.showinfo("Success", "Contact updated!"); self._clear_fields(); self._refresh_list()
+        if not self._ready(): return
+        cid = self._selected_id()
+        if cid is None: messagebox.showwarning("Error", "Select contact to update."); return
+        new_data = self._get_fields_data()
+        if not new_data['name'] or not new_data['phone']: messagebox.showwarning("Error", "Name/Phone required for update!"); return
+        self.contacts.update(cid, new_data); messagebox.showinfo("Success", "Contact updated!"); self._clear_fields(); self.view.clear_selection(); self.view.refresh()
 
     def _delete(self):
-        idx = self.contact_listbox.curselection()
-        if not idx: messagebox.showwarning("Error", "Select contact to delete."); return
-        displayed_txt = self.contact_listbox.get(idx[0])
-        del_c = next((c for c in self.contacts if f"{c['name']} - {c['phone']}" == displayed_txt), None)
+        if not self._ready(): return
+        cid = self._selected_id()
+        if cid is None: messagebox.showwarning("Error", "Select contact to delete."); return
+        del_c = self.contacts.get(cid)
         if del_c and messagebox.askyesno("Confirm", f"Delete {del_c['name']}?"):
-            self.contacts.remove(del_c); messagebox.showinfo("Success", "Contact deleted!"); self._clear_fields(); self._refresh_list()
+            self.contacts.delete(cid); self.view.remove(cid); messagebox.showinfo("Success", "Contact deleted!"); self._clear_fields()
         elif not del_c: messagebox.showerror("Error", "Could not find contact for deletion.")
 
     def _search(self):
-        q = self.search_entry.get().strip().lower()
+        if not self._ready(): return
+        q = self.search_entry.get().strip()
         if not q: self._refresh_list(); messagebox.showinfo("Info", "Showing all contacts."); return
-        found = [c for c in self.contacts if q in c['name'].lower() or q in c['phone'].lower()]
-        self._refresh_list(found)
-        if not found: messagebox.showinfo("Result", "No matching contacts.")
+        self._run_search(q, announce=True)
+
+    def _schedule_search(self, event=None):
+        if self._search_job: self.master.after_cancel(self._search_job)
+        self._search_job = self.master.after(SEARCH_DEBOUNCE_MS, self._live_search)
+
+    def _live_search(self):
+        self._search_job = None
+        if not self._ready(): return
+        q = self.search_entry.get().strip()
+        if q: self._run_search(q)
+        else: self._refresh_list()
+
+    def _run_search(self, q, announce=False):
+        """Searches on a worker thread; a newer search, or View All, supersedes one still running."""
+        def show(found):
+            self._refresh_list(found)
+            if announce and not found: messagebox.showinfo("Result", "No matching contacts.")
+        self.workers.submit('search', self.contacts.rows, q, on_done=show, on_error=lambda e: messagebox.showerror("Error", str(e)))
+
+    def _requery(self):
+        """Re-runs the current view after contacts changed behind it; a burst of changes costs one query."""
+        self.workers.coalesce('requery', lambda: self._refresh_list() if self._showing_all else self._live_search())
+
+    # Import, export and duplicate search run on a worker thread. The worker
+    # talks to the Tk thread through a bounded queue, which _drain_io polls with
+    # after(); anything that touches the widgets happens there, one message per callback.
+
+    def _import(self):
+        if not self._ready() or self._io_busy(): return
+        path = filedialog.askopenfilename(title="Import contacts", filetypes=[("Contacts", "*.csv *.vcf *.vcard *.jsonl *.ndjson"), ("All files", "*.*")])
+        if path and self._supported(path): self._start_io(self._import_worker, f"Importing {os.path.basename(path)}...", path, self.contacts.add_batches)
+
+    def _export(self):
+        if not self._ready() or self._io_busy(): return
+        path = filedialog.asksaveasfilename(title="Export contacts", defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("vCard", "*.vcf"), ("JSON Lines", "*.jsonl")])
+        if path and self._supported(path): self._start_io(self._export_worker, f"Exporting {os.path.basename(path)}...", path, self.contacts.export_rows(), len(self.contacts))
+
+    def _find_duplicates(self):
+        if self._ready() and not self._io_busy(): self._start_io(self._dedupe_worker, "Looking for duplicates...", self.contacts.items())
+
+    def _io_busy(self):
+        if self._io_queue: messagebox.showwarning("Busy", "Another import, export or duplicate search is still running.")
+        return bool(self._io_queue)
+
+    @staticmethod
+    def _supported(path):
+        try: contact_format(path); return True
+        except ValueError as e: messagebox.showerror("Error", str(e)); return False
+
+    def _start_io(self, worker, status, *args):
+        self._io_queue = queue.Queue(IMPORT_QUEUE_BATCHES); self._io_added = 0
+        self.status.config(text=status)
+        threading.Thread(target=worker, args=(self._io_queue, *args), daemon=True).start()
+        self.master.after(PROGRESS_POLL_MS, self._drain_io)
+
+    @staticmethod
+    def _import_worker(q, path, add_batches=None):
+        state = {}
+        def progress(done, total, skipped): state.update(pct=100 * done // max(total, 1), skipped=skipped)
+        try:
+            batches = import_batches(path, progress=progress)
+            if add_batches: # The repository inserts here; the UI only gets the new IDs
+                for cids in add_batches(batches): q.put(('added', cids, state.get('pct', 0)))
+            else:
+                for batch in batches: q.put(('batch', batch, state.get('pct', 0))) # Blocks while the UI catches up
+            q.put(('done', state.get('skipped', 0), None))
+        except Exception as e: q.put(('error', str(e), None)) # Anything else would leave the app busy for good
+
+    @staticmethod
+    def _export_worker(q, path, contacts, total):
+        done = [0]
+        def rows():
+            for c in contacts:
+                yield c; done[0] += 1
+                if done[0] % IMPORT_BATCH_SIZE == 0: q.put(('progress', done[0], 100 * done[0] // max(total, 1)))
+        try: export_contacts(path, rows()); q.put(('exported', done[0], None))
+        except Exception as e: q.put(('error', str(e), None))
+
+    @staticmethod
+    def _dedupe_worker(q, items):
+        try: q.put(('duplicates', find_duplicates(items), None))
+        except Exception as e: q.put(('error', str(e), None))
+
+    def _drain_io(self):
+        try: kind, payload, pct = self._io_queue.get_nowait()
+        except queue.Empty: self.master.after(PROGRESS_POLL_MS, self._drain_io); return
+        if kind in ('batch', 'added'):
+            cids = self.contacts.add_many(payload) if kind == 'batch' else payload
+            if self._showing_all: self.view.extend(cids)
+            self._io_added += len(cids); self.status.config(text=f"Importing... {self._io_added:,} contacts ({pct}%)")
+        elif kind == 'progress': self.status.config(text=f"Exporting... {payload:,} contacts ({pct}%)")
+        else:
+            self._io_queue = None
+            if kind == 'done':
+                msg = f"Imported {self._io_added:,} contacts." + (f" Skipped {payload:,} without a name or phone." if payload else "")
+                self.status.config(text=msg)
+                if not self._showing_all: self._requery() # Let an active search see the new contacts
+                messagebox.showinfo("Import finished", msg)
+            elif kind == 'exported': self.status.config(text=f"Exported {payload:,} contacts.")
+            elif kind == 'duplicates':
+                self.status.config(text=f"Found {len(payload):,} groups of duplicates." if payload else "No duplicates found.")
+                if payload: self._show_duplicates(payload)
+                else: messagebox.showinfo("Duplicates", "No duplicates found.")
+            else: self.status.config(text=""); messagebox.showerror("Error", payload)
+            return
+        self.master.after(1 if self._io_queue.qsize() else PROGRESS_POLL_MS, self._drain_io) # Keep going while batches are waiting
+
+    def _show_duplicates(self, groups):
+        """Lists duplicate groups in a window where they can be merged one by one or all at once."""
+        win = tk.Toplevel(self.master); win.title("Duplicate contacts"); win.geometry("700x400"); win.configure(bg='#8A2BE2')
+        frame = tk.Frame(win, bg='#FFFFFF', bd=2, relief='groove'); frame.pack(pady=10, padx=10, expand=True, fill='both')
+        lb = tk.Listbox(frame, height=12, bd=2, relief='solid', font=('Arial', 11), selectbackground='#8A2BE2', selectforeground='#FFFFFF'); lb.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        sb = tk.Scrollbar(frame); sb.pack(side='right', fill='y')
+        groups = {i: g for i, g in enumerate(groups)} # Row key -> contact IDs; merged groups are dropped
+        def describe(i):
+            recs = [c for c in map(self.contacts.get, groups[i]) if c]
+            return f"{len(recs)} x " + " | ".join(f"{c['name']} - {c['phone']}" + (f" - {c['email']}" if c['email'] else '') for c in recs[:3]) + (" | ..." if len(recs) > 3 else '')
+        view = VirtualListbox(lb, sb, describe, "No duplicates left!"); view.set_rows(list(groups))
+        def merge(keys):
+            for i in keys: merge_duplicates(self.contacts, groups.pop(i))
+            view.set_rows(list(groups)); self._clear_fields(); self.view.clear_selection(); self._requery()
+        def merge_selected():
+            i = view.selected_id()
+            if i is None: messagebox.showwarning("Error", "Select a group to merge.", parent=win); return
+            merge([i])
+        def merge_all():
+            if groups and messagebox.askyesno("Confirm", f"Merge all {len(groups):,} groups?", parent=win): merge(list(groups))
+        btns = tk.Frame(win, bg='#8A2BE2'); btns.pack(pady=5)
+        btn_s = {'bg': '#FFFFFF', 'fg': '#8A2BE2', 'font': ('Arial', 10, 'bold'), 'width': 14, 'bd': 2, 'relief': 'raised'}
+        tk.Button(btns, text="Merge Selected", command=merge_selected, **btn_s).pack(side='left', padx=5)
+        tk.Button(btns, text="Merge All", command=merge_all, **btn_s).pack(side='left', padx=5)
+        tk.Button(btns, text="Close", command=win.destroy, **btn_s).pack(side='left', padx=5)
+
+def main(argv=None):
+    """Command line batch tools for a saved contact book."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Batch tools for the contact book.")
+    parser.add_argument("--find-duplicates", action="store_true", help="list groups of likely duplicates")
+    parser.add_argument("--merge", action="store_true", help="with --find-duplicates, merge every group found")
+    parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD, help="duplicate score needed (0-1)")
+    parser.add_argument("--db", default=DB_PATH, help="contact database file")
+    args = parser.parse_args(argv)
+    if not args.find_duplicates: parser.error("nothing to do; --find-duplicates lists duplicates (add --merge to merge them)")
+    repo = open_contact_repository(args.db)
+    try:
+        groups = find_duplicates(repo.items(), args.threshold)
+        for ids in groups: print(" | ".join(f"{cid}: {c['name']} - {c['phone']}" for cid, c in ((cid, repo.get(cid)) for cid in ids)))
+        if args.merge: # Only after every group has been listed
+            for ids in groups: merge_duplicates(repo, ids)
+        print(f"{len(groups)} groups of duplicates" + (" merged." if args.merge and groups else "."), file=sys.stderr)
+    finally: repo.close()
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = ContactBookApp(root)
-    root.mainloop()
+    profile = profiling_requested(sys.argv)
+    if len(sys.argv) > 1: main()
+    else:
+        root = tk.Tk()
+        if profile: import tkprofile; tkprofile.install(root)
+        app = ContactBookApp(root)
+        root.mainloop()
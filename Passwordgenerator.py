@@ -1,7 +1,237 @@
 import tkinter as tk
 from tkinter import messagebox
-import random
+from tkworkers import TkExecutor, after_first_paint, profiling_requested
+import functools
+import math
+import os
 import string
+import sys
+import time
+
+DEFAULT_ALPHABET = string.ascii_letters + string.digits + string.punctuation
+RANDOM_CHUNK_SIZE = 1 << 16 # Bytes of OS randomness fetched per call.
+PARALLEL_CHUNK_SIZE = 50_000 # Passwords per worker job in parallel mode.
+
+CHARACTER_CLASSES = {
+    "lower": string.ascii_lowercase,
+    "upper": string.ascii_uppercase,
+    "digits": string.digits,
+    "symbols": string.punctuation,
+}
+AMBIGUOUS_CHARACTERS = "Il1|O0o`'\"" # Easy to confuse when read aloud or copied by hand.
+
+
+@functools.lru_cache(maxsize=64)
+def _alphabet_bytes(alphabet):
+    """Validates an alphabet once and returns it as bytes."""
+    if not alphabet or not alphabet.isascii() or len(set(alphabet)) != len(alphabet):
+        raise ValueError("The alphabet must be a non-empty set of distinct ASCII characters.")
+    return alphabet.encode("ascii")
+
+
+@functools.lru_cache(maxsize=256)
+def _sampling_tables(symbols):
+    """Builds the bytes.translate tables that turn random bytes into `symbols`.
+
+    Byte values below the largest multiple of len(symbols) map onto the
+    symbols (value % size); the rest are deleted. Rejecting them, instead of
+    folding them in, keeps every symbol exactly equally likely.
+    """
+    size = len(symbols)
+    limit = 256 - 256 % size
+    table = bytes(symbols[b % size] if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256)), limit
+
+
+def _random_symbols(count, symbols):
+    """Returns `count` bytes drawn uniformly from `symbols` (up to 256 distinct byte values)."""
+    table, rejected, limit = _sampling_tables(symbols)
+    chunks = []
+    have = 0
+    while have < count:
+        # Ask for enough bytes to cover the expected rejections, plus some slack.
+        wanted = min((count - have) * 256 // limit + 64, RANDOM_CHUNK_SIZE)
+        chunk = os.urandom(wanted).translate(table, rejected)
+        chunks.append(chunk)
+        have += len(chunk)
+    return b"".join(chunks)[:count]
+
+
+def random_characters(count, alphabet=DEFAULT_ALPHABET):
+    """Returns `count` characters drawn uniformly from `alphabet` with the OS CSPRNG."""
+    return _random_symbols(count, _alphabet_bytes(alphabet)).decode("ascii")
+
+
+def generate_passwords(count, length, alphabet=DEFAULT_ALPHABET):
+    """Yields `count` passwords of `length` characters, filled from large random buffers."""
+    if length <= 0 or count < 0:
+        raise ValueError("Password length must be positive and count non-negative.")
+    per_batch = max(1, RANDOM_CHUNK_SIZE // length)
+    while count > 0:
+        batch = min(count, per_batch)
+        text = random_characters(batch * length, alphabet)
+        for start in range(0, batch * length, length):
+            yield text[start:start + length]
+        count -= batch
+
+
+def generate_password(length, alphabet=DEFAULT_ALPHABET):
+    """Returns a single password."""
+    return next(generate_passwords(1, length, alphabet))
+
+
+class PasswordPolicy:
+    """Rules for generated passwords: length, required character classes,
+    excluded look-alike characters, a custom alphabet and a minimum entropy.
+
+    Compliant passwords are built directly, with no generate-and-check loop:
+    every position is filled from the full alphabet, then one character of each
+    required class is written to distinct positions picked uniformly at random.
+    That is the same distribution as shuffling the required characters in.
+    """
+
+    def __init__(self, length=16, classes=tuple(CHARACTER_CLASSES), required=None,
+                 exclude_ambiguous=False, alphabet=None, min_entropy=0.0):
+        for name in tuple(classes) + tuple(required or ()):
+            if name not in CHARACTER_CLASSES:
+                raise ValueError(f"Unknown character class: {name}")
+        pool = alphabet if alphabet is not None else "".join(CHARACTER_CLASSES[name] for name in classes)
+        if exclude_ambiguous:
+            pool = "".join(ch for ch in pool if ch not in AMBIGUOUS_CHARACTERS)
+        self.alphabet = "".join(dict.fromkeys(pool)) # Drop duplicates, keep order.
+        _alphabet_bytes(self.alphabet)
+        if required is None:
+            required = () if alphabet is not None else classes
+        self.required = tuple(required)
+        self.required_sets = []
+        for name in self.required:
+            chars = "".join(ch for ch in CHARACTER_CLASSES[name] if ch in self.alphabet)
+            if not chars:
+                raise ValueError(f"No '{name}' characters are left in the alphabet.")
+            self.required_sets.append(chars)
+        if length < max(1, len(self.required_sets)):
+            raise ValueError(f"Length must be at least {max(1, len(self.required_sets))} for this policy.")
+        self.length = length
+        if self.entropy < min_entropy:
+            raise ValueError(f"This policy gives about {self.entropy:.0f} bits of entropy; {min_entropy:.0f} are required.")
+
+    @property
+    def entropy(self):
+        """Lower bound on the entropy of one password, in bits."""
+        free = self.length - len(self.required_sets)
+        return free * math.log2(len(self.alphabet)) + sum(math.log2(len(chars)) for chars in self.required_sets)
+
+    def generate(self, count):
+        """Yields `count` compliant passwords."""
+        length = self.length
+        per_batch = max(1, RANDOM_CHUNK_SIZE // length)
+        while count > 0:
+            batch = min(count, per_batch)
+            fill = random_characters(batch * length, self.alphabet)
+            picks = [random_characters(batch, chars) for chars in self.required_sets]
+            if length > 256:
+                import secrets # Only needed for long passwords, and slow to import at startup.
+            # offsets[j][b]: where required character j of password b goes (partial Fisher-Yates).
+            offsets = [_random_symbols(batch, bytes(range(length - j))) if length - j <= 256
+                       else [secrets.randbelow(length - j) for _ in range(batch)]
+                       for j in range(len(picks))]
+            for b in range(batch):
+                chars = list(fill[b * length:(b + 1) * length])
+                moved = {} # Sparse swaps over the position list 0..length-1.
+                for j, pick in enumerate(picks):
+                    r = j + offsets[j][b]
+                    position = moved.get(r, r)
+                    moved[r] = moved.get(j, j)
+                    chars[position] = pick[b]
+                yield "".join(chars)
+            count -= batch
+
+
+def _generate_chunk(job):
+    """Process pool worker: generates one chunk of passwords."""
+    policy, count = job
+    return list(policy.generate(count))
+
+
+def generate_passwords_parallel(policy, count, workers=None, chunk_size=PARALLEL_CHUNK_SIZE):
+    """Yields `count` passwords generated across a process pool.
+
+    The work is split into fixed-size chunks whose results are yielded in job
+    order, so the output order does not depend on which worker finishes first.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    jobs = [(policy, min(chunk_size, count - start)) for start in range(0, count, chunk_size)]
+    with ProcessPoolExecutor(workers) as pool:
+        for chunk in pool.map(_generate_chunk, jobs):
+            yield from chunk
+
+
+def write_passwords(out, passwords):
+    """Streams one password per line to a text file object."""
+    for password in passwords:
+        out.write(password + "\n")
+
+
+def bench(count=100_000, length=16):
+    """Compares the old per-character random.choice loop with the bulk generator."""
+    import random
+
+    started = time.perf_counter()
+    for _ in range(count):
+        "".join(random.choice(DEFAULT_ALPHABET) for _ in range(length))
+    old = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for _ in generate_passwords(count, length):
+        pass
+    new = time.perf_counter() - started
+
+    print(f"{count:,} passwords of {length} characters")
+    print(f"random.choice per character: {count / old:>12,.0f} passwords/s")
+    print(f"bulk os.urandom + rejection: {count / new:>12,.0f} passwords/s ({old / new:.1f}x)")
+
+
+def main(argv=None):
+    """Command line entry point for bulk generation."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate passwords in bulk.")
+    parser.add_argument("-n", "--count", type=int, default=1, help="number of passwords")
+    parser.add_argument("-l", "--length", type=int, default=16, help="characters per password")
+    parser.add_argument("-o", "--output", default="-", help="file to write ('-' for stdout)")
+    parser.add_argument("--classes", default=",".join(CHARACTER_CLASSES),
+                        help="comma-separated classes to draw from: " + ", ".join(CHARACTER_CLASSES))
+    parser.add_argument("--require", default=None,
+                        help="comma-separated classes every password must contain (default: all of --classes)")
+    parser.add_argument("--alphabet", default=None, help="custom characters to draw from (replaces --classes)")
+    parser.add_argument("--exclude-ambiguous", action="store_true", help=f"leave out look-alikes ({AMBIGUOUS_CHARACTERS})")
+    parser.add_argument("--min-entropy", type=float, default=0.0, help="refuse policies weaker than this many bits")
+    parser.add_argument("--workers", type=int, default=0, help="generate across this many processes")
+    parser.add_argument("--bench", action="store_true", help="measure throughput instead of generating")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench(length=args.length)
+        return
+    try:
+        policy = PasswordPolicy(
+            length=args.length,
+            classes=[c for c in args.classes.split(",") if c],
+            required=None if args.require is None else [c for c in args.require.split(",") if c],
+            exclude_ambiguous=args.exclude_ambiguous,
+            alphabet=args.alphabet,
+            min_entropy=args.min_entropy,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    passwords = generate_passwords_parallel(policy, args.count, args.workers) if args.workers > 1 else policy.generate(args.count)
+    if args.output == "-":
+        write_passwords(sys.stdout, passwords)
+    else:
+        with open(args.output, "w", encoding="ascii") as out:
+            write_passwords(out, passwords)
+
 
 def generate_new_password():
     """Generates a random password based on user's desired length."""
@@ -11,42 +241,109 @@ def generate_new_password():
             messagebox.showerror("Oops!", "Please enter a positive number for password length.")
             return
 
-        all_characters = string.ascii_letters + string.digits + string.punctuation
-        password = ''.join(random.choice(all_characters) for _ in range(length))
+        # Until the options row is built, every class is ticked and look-alikes are allowed.
+        classes = [name for name, var in class_vars.items() if var.get()] if class_vars else list(CHARACTER_CLASSES)
+        if not classes:
+            messagebox.showerror("Oops!", "Please pick at least one kind of character.")
+            return
+        policy = PasswordPolicy(length, classes=classes, exclude_ambiguous=bool(ambiguous_var and ambiguous_var.get()))
+    except ValueError as e:
+        if "invalid literal" in str(e):
+            messagebox.showerror("Uh-oh!", "Please enter a valid whole number for the length.")
+        else:
+            messagebox.showerror("Oops!", str(e))
+        return
+
+    def show(password):
         password_display_label.config(text=password) # Display the generated password.
-    except ValueError:
-        messagebox.showerror("Uh-oh!", "Please enter a valid whole number for the length.")
+        entropy_label.config(text=f"About {policy.entropy:.0f} bits of entropy")
+
+    # Very long passwords take a while, so they are made on a worker thread;
+    # clicking again before one is ready replaces it.
+    workers.submit("generate", _generate_one, policy, on_done=show,
+                   on_error=lambda e: messagebox.showerror("Oops!", str(e)))
+
+
+def _generate_one(policy):
+    return next(policy.generate(1))
+
+
+class_vars = {} # Character class name -> BooleanVar, once the options row exists.
+ambiguous_var = None
+
+
+def build_window(app):
+    """Builds the password window in `app`; the options row is added after the first paint."""
+    global length_entry, password_display_label, entropy_label, workers
+
+    workers = TkExecutor(app)
+    app.title("Your Friendly Password Creator")
+    app.geometry("400x360") # A cozy size for our window
+    app.config(bg="#1A1A1A") # Dark background for the black theme
+
+
+    length_label = tk.Label(app, text="How long should your awesome password be?",
+                            bg="#1A1A1A", fg="#ADD8E6", font=("Arial", 12))
+    length_label.pack(pady=10)
+
+    length_entry = tk.Entry(app, width=10, font=("Arial", 14), bd=2, relief="flat",
+                            bg="#333333", fg="#ADD8E6", insertbackground="#ADD8E6")
+    length_entry.pack(pady=5)
+    length_entry.focus_set() # Ready for typing!
+
+    # Which kinds of characters to mix in (each ticked kind is guaranteed)
+    options_frame = tk.Frame(app, bg="#1A1A1A")
+    options_frame.pack(pady=5)
+    after_first_paint(app, _build_options, options_frame)
+
+    #Generate passsword
+    generate_button = tk.Button(app, text="Conjure My Password!", command=generate_new_password,
+                                bg="#005B96", fg="white", font=("Arial", 12, "bold"),
+                                relief="raised", bd=3, activebackground="#007ACC", activeforeground="white")
+    generate_button.pack(pady=15)
+
+    # Where your new password will appear
+    password_label_heading = tk.Label(app, text="Here's your secret key:",
+                                       bg="#1A1A1A", fg="#ADD8E6", font=("Arial", 11, "italic"))
+    password_label_heading.pack()
 
+    password_display_label = tk.Label(app, text="", wraplength=350, justify="center",
+                                      bg="#2C2C2C", fg="#F0F8FF", font=("Courier New", 14, "bold"),
+                                      relief="sunken", bd=2, padx=10, pady=10)
+    password_display_label.pack(pady=10, padx=20, fill="x")
 
-app = tk.Tk()
-app.title("Your Friendly Password Creator")
-app.geometry("400x250") # A cozy size for our window
-app.config(bg="#1A1A1A") # Dark background for the black theme
+    entropy_label = tk.Label(app, text="", bg="#1A1A1A", fg="#ADD8E6", font=("Arial", 9))
+    entropy_label.pack()
 
 
-length_label = tk.Label(app, text="How long should your awesome password be?",
-                        bg="#1A1A1A", fg="#ADD8E6", font=("Arial", 12))
-length_label.pack(pady=10)
+def _build_options(options_frame):
+    """Adds the character class and look-alike checkboxes."""
+    global ambiguous_var
 
-length_entry = tk.Entry(app, width=10, font=("Arial", 14), bd=2, relief="flat",
-                        bg="#333333", fg="#ADD8E6", insertbackground="#ADD8E6")
-length_entry.pack(pady=5)
-length_entry.focus_set() # Ready for typing!
+    for column, name in enumerate(CHARACTER_CLASSES):
+        class_vars[name] = tk.BooleanVar(value=True)
+        tk.Checkbutton(options_frame, text=name.capitalize(), variable=class_vars[name],
+                       bg="#1A1A1A", fg="#ADD8E6", selectcolor="#333333",
+                       activebackground="#1A1A1A", activeforeground="#ADD8E6").grid(row=0, column=column)
+    ambiguous_var = tk.BooleanVar(value=False)
+    tk.Checkbutton(options_frame, text="Skip look-alikes (Il1 O0)", variable=ambiguous_var,
+                   bg="#1A1A1A", fg="#ADD8E6", selectcolor="#333333",
+                   activebackground="#1A1A1A", activeforeground="#ADD8E6").grid(row=1, column=0, columnspan=4)
 
-#Generate passsword
-generate_button = tk.Button(app, text="Conjure My Password!", command=generate_new_password,
-                            bg="#005B96", fg="white", font=("Arial", 12, "bold"),
-                            relief="raised", bd=3, activebackground="#007ACC", activeforeground="white")
-generate_button.pack(pady=15)
 
-# Where your new password will appear
-password_label_heading = tk.Label(app, text="Here's your secret key:",
-                                   bg="#1A1A1A", fg="#ADD8E6", font=("Arial", 11, "italic"))
-password_label_heading.pack()
+def run_app(profile=False):
+    """Builds the window and runs the Tk main loop; `profile` turns on the tkprofile instrumentation."""
+    app = tk.Tk()
+    if profile:
+        import tkprofile
+        tkprofile.install(app)
+    build_window(app)
+    app.mainloop()
 
-password_display_label = tk.Label(app, text="", wraplength=350, justify="center",
-                                  bg="#2C2C2C", fg="#F0F8FF", font=("Courier New", 14, "bold"),
-                                  relief="sunken", bd=2, padx=10, pady=10)
-password_display_label.pack(pady=10, padx=20, fill="x")
 
-app.mainloop() 
+if __name__ == "__main__":
+    profile = profiling_requested(sys.argv)
+    if len(sys.argv) > 1:
+        main()
+    else:
+        run_app(profile)
@@ -1,87 +1,554 @@
 import random
 import time
+from array import array
+from collections import namedtuple
+
+# Moves are small ints so that outcomes are a table lookup.
+ROCK, PAPER, SCISSORS = 0, 1, 2
+MOVE_NAMES = ('rock', 'paper', 'scissors')
+MOVES = {name: move for move, name in enumerate(MOVE_NAMES)}
+
+# Outcomes from the user's side. Each move beats the one before it (mod 3),
+# so the outcome is just (user - computer) % 3.
+TIE, WIN, LOSE = 0, 1, 2
+OUTCOME_NAMES = ('tie', 'win', 'lose')
+OUTCOMES = tuple(tuple((user - computer) % 3 for computer in range(3)) for user in range(3))
+BEATEN_BY = tuple((move + 1) % 3 for move in range(3)) # BEATEN_BY[m] is the move that beats m.
+
+THINKING_DELAY = 0.7 # Seconds of suspense in the interactive game only.
+SIMULATION_CHUNK = 1 << 20 # Rounds per vectorized block, to bound memory.
+
+Tally = namedtuple('Tally', 'wins losses ties')
+
+def play_round(user_move, computer_move):
+    """Returns the outcome (TIE, WIN or LOSE) of one round for the user."""
+    return OUTCOMES[user_move][computer_move]
+
+class GameSession:
+    """Score keeping for one game, with no I/O."""
+
+    def __init__(self, strategy=None, rng=None):
+        self.strategy = strategy or RandomStrategy(rng)
+        self.user_score = 0
+        self.computer_score = 0
+        self.round_count = 0
+
+    def computer_move(self):
+        """Picks the computer's next move."""
+        return self.strategy.choose()
+
+    def play(self, user_move, computer_move=None):
+        """Plays one round and returns (computer_move, outcome)."""
+        if computer_move is None:
+            computer_move = self.computer_move()
+        outcome = OUTCOMES[user_move][computer_move]
+        self.strategy.observe(user_move, computer_move)
+        self.round_count += 1
+        if outcome == WIN:
+            self.user_score += 1
+        elif outcome == LOSE:
+            self.computer_score += 1
+        return computer_move, outcome
+
+# --- Computer strategies ---
+#
+# A strategy picks its move with choose() and learns from each finished round
+# through observe(their_move, my_move). Both are O(1) however long a game
+# runs: learners keep running counts and forget old rounds through a
+# fixed-size ring buffer rather than rescanning history.
+
+DEFAULT_WINDOW = 200 # Rounds an adaptive strategy remembers.
+
+class RingBuffer:
+    """Fixed-capacity buffer of small ints; push() returns the evicted value."""
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError(f"RingBuffer capacity must be at least 1, not {capacity}")
+        self.values = array('I', bytes(4 * capacity))
+        self.capacity = capacity
+        self.size = 0
+        self.head = 0
+
+    def push(self, value):
+        """Appends `value`, returning the value it displaced or None while filling up."""
+        evicted = self.values[self.head] if self.size == self.capacity else None
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        return evicted
+
+class Strategy:
+    """Base class for computer players."""
+
+    name = 'strategy'
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+
+    def choose(self):
+        """Returns the next move."""
+        raise NotImplementedError
+
+    def observe(self, their_move, my_move):
+        """Records a finished round."""
+
+class RandomStrategy(Strategy):
+    """Uniform random moves; unbeatable on average and the old default."""
+
+    name = 'random'
+
+    def choose(self):
+        return self.rng.randrange(3)
+
+class CountingStrategy(Strategy):
+    """Predicts the opponent's next move from move counts per context and plays
+    whatever beats it. The context is the opponent's last `order` moves, so
+    order 0 is plain frequency counting and higher orders are Markov chains.
+    """
+
+    def __init__(self, order=1, window=DEFAULT_WINDOW, rng=None):
+        super().__init__(rng)
+        self.order = order
+        self.name = f'markov{order}' if order else 'frequency'
+        self.contexts = 3 ** order
+        self.counts = array('I', bytes(4 * 3 * self.contexts)) # counts[context * 3 + move]
+        self.history = RingBuffer(window) # Count slots to decrement as rounds age out.
+        self.context = 0
+
+    def choose(self):
+        base = self.context * 3
+        rock, paper, scissors = self.counts[base:base + 3]
+        best = max(rock, paper, scissors)
+        if not best:
+            return self.rng.randrange(3)
+        if rock == best:
+            predicted = ROCK
+        elif paper == best:
+            predicted = PAPER
+        else:
+            predicted = SCISSORS
+        return BEATEN_BY[predicted]
+
+    def observe(self, their_move, my_move):
+        slot = self.context * 3 + their_move
+        self.counts[slot] += 1
+        evicted = self.history.push(slot)
+        if evicted is not None:
+            self.counts[evicted] -= 1
+        self.context = (self.context * 3 + their_move) % self.contexts
+
+class FrequencyStrategy(CountingStrategy):
+    """Beats the opponent's most common recent move."""
+
+    def __init__(self, window=DEFAULT_WINDOW, rng=None):
+        super().__init__(0, window, rng)
+
+class MarkovStrategy(CountingStrategy):
+    """Beats the move the opponent most often played after their last `order` moves."""
+
+    def __init__(self, order=1, window=DEFAULT_WINDOW, rng=None):
+        super().__init__(max(1, order), window, rng)
+
+class EnsembleStrategy(Strategy):
+    """Plays the move of whichever member has been winning lately.
+
+    Every member chooses and observes each round as if it were playing; its
+    score is a decaying sum of +1 per round it would have won and -1 per round
+    it would have lost.
+    """
+
+    name = 'ensemble'
+
+    def __init__(self, members=None, decay=0.95, rng=None):
+        super().__init__(rng)
+        if members is None:
+            members = [FrequencyStrategy(rng=self.rng), RandomStrategy(self.rng)]
+            members += [MarkovStrategy(order, rng=self.rng) for order in (1, 2, 3)]
+        self.members = members
+        self.scores = [0.0] * len(members)
+        self.choices = [0] * len(members)
+        self.decay = decay
+
+    def choose(self):
+        choices = self.choices
+        for i, member in enumerate(self.members):
+            choices[i] = member.choose()
+        scores = self.scores
+        return choices[scores.index(max(scores))]
+
+    def observe(self, their_move, my_move):
+        decay = self.decay
+        scores = self.scores
+        for i, member in enumerate(self.members):
+            choice = self.choices[i]
+            outcome = OUTCOMES[choice][their_move]
+            scores[i] = scores[i] * decay + (1 if outcome == WIN else -1 if outcome == LOSE else 0)
+            member.observe(their_move, choice)
+
+STRATEGIES = {
+    'random': RandomStrategy,
+    'frequency': FrequencyStrategy,
+    'markov1': lambda rng=None: MarkovStrategy(1, rng=rng),
+    'markov2': lambda rng=None: MarkovStrategy(2, rng=rng),
+    'markov3': lambda rng=None: MarkovStrategy(3, rng=rng),
+    'ensemble': EnsembleStrategy,
+}
+
+def make_strategy(name, seed=None):
+    """Builds a registered strategy by name."""
+    try:
+        factory = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy '{name}'. Try one of: {', '.join(STRATEGIES)}") from None
+    return factory(rng=random.Random(seed))
+
+def play_match(first, second, rounds):
+    """Pits two strategies against each other and returns a Tally for `first`."""
+    counts = [0, 0, 0]
+    choose_a, observe_a = first.choose, first.observe
+    choose_b, observe_b = second.choose, second.observe
+    for _ in range(rounds):
+        a = choose_a()
+        b = choose_b()
+        counts[OUTCOMES[a][b]] += 1
+        observe_a(b, a)
+        observe_b(a, b)
+    return Tally(counts[WIN], counts[LOSE], counts[TIE])
+
+def _tournament_match(job):
+    """Process pool worker: plays one pairing by strategy name."""
+    first, second, rounds, seed = job
+    return play_match(make_strategy(first, seed), make_strategy(second, seed + 1), rounds)
+
+def run_tournament(names, rounds, workers=None, seed=0):
+    """Plays every pairing of the named strategies for `rounds` rounds each.
+
+    Pairings run in parallel across a process pool. Returns a list of
+    (first, second, Tally) in pairing order.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import combinations
+
+    for name in names:
+        make_strategy(name) # Fail fast on typos, before starting workers.
+    pairs = list(combinations(names, 2))
+    jobs = [(first, second, rounds, seed + 2 * i) for i, (first, second) in enumerate(pairs)]
+    with ProcessPoolExecutor(workers) as pool:
+        tallies = list(pool.map(_tournament_match, jobs))
+    return [(first, second, tally) for (first, second), tally in zip(pairs, tallies)]
+
+def _import_numpy():
+    """Returns the numpy module, or None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def score_moves(user_moves, computer_moves):
+    """Scores two equal-length sequences of moves and returns a Tally."""
+    if len(user_moves) != len(computer_moves):
+        raise ValueError("Both players need the same number of moves.")
+    np = _import_numpy()
+    if np is None:
+        counts = [0, 0, 0]
+        for user, computer in zip(user_moves, computer_moves):
+            counts[OUTCOMES[user][computer]] += 1
+    else:
+        user = np.asarray(user_moves, dtype=np.int8)
+        computer = np.asarray(computer_moves, dtype=np.int8)
+        counts = np.bincount((user - computer) % 3, minlength=3).tolist()
+    return Tally(counts[WIN], counts[LOSE], counts[TIE])
+
+def simulate(rounds, seed=None):
+    """Plays `rounds` rounds of uniform random moves for both sides and returns a Tally.
+
+    Uses numpy in blocks of SIMULATION_CHUNK rounds when available, and a
+    plain loop otherwise.
+    """
+    np = _import_numpy()
+    if np is None:
+        rng = random.Random(seed)
+        counts = [0, 0, 0]
+        for _ in range(rounds):
+            counts[OUTCOMES[rng.randrange(3)][rng.randrange(3)]] += 1
+        return Tally(counts[WIN], counts[LOSE], counts[TIE])
+
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(3, dtype=np.int64)
+    for start in range(0, rounds, SIMULATION_CHUNK):
+        size = min(SIMULATION_CHUNK, rounds - start)
+        moves = rng.integers(0, 3, size=(2, size), dtype=np.int8)
+        counts += np.bincount((moves[0] - moves[1]) % 3, minlength=3)
+    return Tally(int(counts[WIN]), int(counts[LOSE]), int(counts[TIE]))
+
+def main(argv=None):
+    """Command line entry point: the interactive game, or headless simulations."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rock-Paper-Scissors, interactive or headless.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--simulate", type=int, metavar="ROUNDS", help="play random rounds headless and report the rate")
+    mode.add_argument("--tournament", type=int, metavar="ROUNDS", help="play every pairing of --strategies for ROUNDS rounds")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES), help="comma-separated strategies for --tournament")
+    parser.add_argument("--workers", type=int, default=None, help="processes for --tournament (default: one per core)")
+    parser.add_argument("--opponent", default="random", choices=list(STRATEGIES), help="computer strategy in the interactive game")
+    mode.add_argument("--serve", action="store_true", help="host games over TCP")
+    mode.add_argument("--load", action="store_true", help="load-test a running server")
+    mode.add_argument("--bench-server", action="store_true", help="serve and load-test on localhost in one process")
+    parser.add_argument("--host", default="127.0.0.1", help="address for --serve/--load")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="port for --serve/--load")
+    parser.add_argument("--delay", type=float, default=None,
+                        help=f"server thinking delay in seconds (default {THINKING_DELAY} for --serve, 0 for --bench-server)")
+    parser.add_argument("--connections", type=int, default=1000, help="concurrent games for --load/--bench-server")
+    parser.add_argument("--rounds", type=int, default=20, help="rounds per game for --load/--bench-server")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a repeatable run")
+    args = parser.parse_args(argv)
+    if args.serve and args.delay is None:
+        args.delay = THINKING_DELAY
+
+    if args.simulate is not None:
+        start = time.perf_counter()
+        tally = simulate(args.simulate, args.seed)
+        elapsed = time.perf_counter() - start
+        print(f"{args.simulate} rounds: {tally.wins} wins, {tally.losses} losses, {tally.ties} ties")
+        print(f"{args.simulate / elapsed if elapsed else float('inf'):,.0f} rounds/s")
+    elif args.tournament is not None:
+        names = [name for name in args.strategies.split(",") if name]
+        try:
+            start = time.perf_counter()
+            results = run_tournament(names, args.tournament, args.workers, args.seed or 0)
+        except ValueError as e:
+            parser.error(str(e))
+        elapsed = time.perf_counter() - start
+        for first, second, tally in results:
+            print(f"{first:>10} vs {second:<10} {tally.wins:>10} wins {tally.losses:>10} losses {tally.ties:>10} ties")
+        total = args.tournament * len(results)
+        print(f"{total} rounds in {elapsed:.1f}s ({total / elapsed if elapsed else float('inf'):,.0f} rounds/s)")
+    elif args.serve:
+        import asyncio # Only the network modes import it; it is most of a cold start.
+
+        async def serve():
+            server = await start_server(args.host, args.port, args.opponent, args.delay)
+            print(f"Serving Rock-Paper-Scissors on {args.host}:{args.port}")
+            async with server:
+                await server.serve_forever()
+
+        try:
+            asyncio.run(serve())
+        except KeyboardInterrupt:
+            pass
+    elif args.load:
+        import asyncio
+        latencies, elapsed = asyncio.run(run_load(args.host, args.port, args.connections, args.rounds, args.seed))
+        print(load_report(latencies, elapsed))
+    elif args.bench_server:
+        import asyncio
+        print(asyncio.run(bench_server(args.connections, args.rounds, args.delay or 0.0, args.opponent)))
+    else:
+        main_game(make_strategy(args.opponent, args.seed))
+
+# --- Game text, shared by the terminal game and the network server ---
+
+WELCOME_LINES = (
+    "Welcome to the Ultimate Rock-Paper-Scissors Showdown!",
+    "Let's see if you can outwit the mighty AI!",
+    "--------------------------------------------------",
+)
+MOVE_PROMPT = "Your move! Choose (rock, paper, or scissors): "
+INVALID_MOVE = "Hmm, that's not a valid choice. Please try 'rock', 'paper', or 'scissors'."
+THINKING = "Computer is thinking..."
+AGAIN_PROMPT = "Wanna play another round? (yes/no): "
+ROUND_VERDICTS = {
+    WIN: "You won this round! Excellent move!",
+    LOSE: "Ouch! The computer got you this time. Better luck next round!",
+    TIE: "It's a tie! Great minds think alike... or just got lucky together!",
+}
+
+def round_lines(session, user_choice, computer_choice, outcome):
+    """Returns the lines that announce a finished round."""
+    return [
+        f"\nYou chose: {MOVE_NAMES[user_choice].capitalize()}!",
+        f"The computer chose: {MOVE_NAMES[computer_choice].capitalize()}!",
+        ROUND_VERDICTS[outcome],
+        "-" * 30,
+        f"Current Score: You {session.user_score} | Computer {session.computer_score}",
+    ]
+
+def final_lines(session):
+    """Returns the closing lines of a game."""
+    user_score, computer_score = session.user_score, session.computer_score
+    lines = [
+        "\n--------------------------------------------------",
+        "Game Over! Here are the final results:",
+        f"Final Score: You {user_score} | Computer {computer_score}",
+    ]
+    if user_score > computer_score:
+        lines.append("CONGRATULATIONS! You are the CHAMPION of this game!")
+        lines.append("Your human intuition triumphs over silicon logic!")
+    elif computer_score > user_score:
+        lines.append("The computer reigns supreme this time. Don't worry, even grandmasters lose sometimes!")
+        lines.append("Keep practicing, and you'll get 'em next time!")
+    else:
+        lines.append("It's a glorious tie! A true battle of wits without a clear victor. Well played!")
+    lines.append("Thanks for playing! See you next time!")
+    return lines
+
+# --- Interactive front end ---
 
 def get_user_choice():
     """Prompts the user for their choice."""
-    valid_choices = ['rock', 'paper', 'scissors']
     while True:
-        user_input = input("Your move! Choose (rock, paper, or scissors): ").lower().strip()
-        if user_input in valid_choices:
-            return user_input
+        user_input = input(MOVE_PROMPT).lower().strip()
+        if user_input in MOVES:
+            return MOVES[user_input]
         else:
-            print("Hmm, that's not a valid choice. Please try 'rock', 'paper', or 'scissors'.")
-
-def get_computer_choice():
-    """Generates a random choice for the computer."""
-    choices = ['rock', 'paper', 'scissors']
-    print("Computer is thinking...")
-    time.sleep(0.7)
-    computer_choice = random.choice(choices)
-    return computer_choice
-
-def determine_winner(user_choice, computer_choice):
-    """Determines the winner of the round."""
-    print(f"\nYou chose: {user_choice.capitalize()}!")
-    print(f"The computer chose: {computer_choice.capitalize()}!")
-
-    if user_choice == computer_choice:
-        return 'tie'
-    elif (user_choice == 'rock' and computer_choice == 'scissors') or \
-         (user_choice == 'scissors' and computer_choice == 'paper') or \
-         (user_choice == 'paper' and computer_choice == 'rock'):
-        return 'win'
-    else:
-        return 'lose'
+            print(INVALID_MOVE)
 
-def main_game():
-    """Main function to run the Rock-Paper-Scissors game."""
-    user_score = 0
-    computer_score = 0
-    round_count = 0
+def get_computer_choice(session):
+    """Lets the computer pick its move, with a moment of suspense."""
+    print(THINKING)
+    time.sleep(THINKING_DELAY)
+    return session.computer_move()
 
-    print("Welcome to the Ultimate Rock-Paper-Scissors Showdown!")
-    print("Let's see if you can outwit the mighty AI!")
-    print("--------------------------------------------------")
+def main_game(strategy=None):
+    """Main function to run the Rock-Paper-Scissors game."""
+    session = GameSession(strategy)
+    print("\n".join(WELCOME_LINES))
 
     while True:
-        round_count += 1
-        print(f"\n--- Round {round_count} ---")
+        print(f"\n--- Round {session.round_count + 1} ---")
         user_choice = get_user_choice()
-        computer_choice = get_computer_choice()
+        computer_choice = get_computer_choice(session)
+        _, outcome = session.play(user_choice, computer_choice)
+        print("\n".join(round_lines(session, user_choice, computer_choice, outcome)))
 
-        outcome = determine_winner(user_choice, computer_choice)
+        play_again = input(AGAIN_PROMPT).lower().strip()
+        if play_again != 'yes':
+            break
 
-        if outcome == 'win':
-            print("You won this round! Excellent move!")
-            user_score += 1
-        elif outcome == 'lose':
-            print("Ouch! The computer got you this time. Better luck next round!")
-            computer_score += 1
-        else:
-            print("It's a tie! Great minds think alike... or just got lucky together!")
-        print("-" * 30)
+    print("\n".join(final_lines(session)))
 
-        print(f"Current Score: You {user_score} | Computer {computer_score}")
+# --- Network server ---
+#
+# One TCP connection is one game, using the same text as the terminal game
+# with every message (prompts included) ending in a newline. The client
+# answers each prompt with one line. Sessions are independent coroutines on
+# a single event loop, and the thinking delay is an asyncio.sleep, so a slow
+# round never holds up the others. asyncio is imported inside the functions
+# that use it, so the terminal game does not pay for loading it.
 
-        play_again = input("Wanna play another round? (yes/no): ").lower().strip()
-        if play_again != 'yes':
-            break
+SERVER_PORT = 5050
+MAX_LINE = 256 # Longest reply a client may send.
 
-    print("\n--------------------------------------------------")
-    print("Game Over! Here are the final results:")
-    print(f"Final Score: You {user_score} | Computer {computer_score}")
+async def _send(writer, lines):
+    writer.write(("\n".join(lines) + "\n").encode())
+    await writer.drain()
 
-    if user_score > computer_score:
-        print("CONGRATULATIONS! You are the CHAMPION of this game!")
-        print("Your human intuition triumphs over silicon logic!")
-    elif computer_score > user_score:
-        print("The computer reigns supreme this time. Don't worry, even grandmasters lose sometimes!")
-        print("Keep practicing, and you'll get 'em next time!")
-    else:
-        print("It's a glorious tie! A true battle of wits without a clear victor. Well played!")
+async def handle_client(reader, writer, strategy_name='random', delay=THINKING_DELAY):
+    """Plays one game with a connected client."""
+    import asyncio
+    session = GameSession(make_strategy(strategy_name))
+    try:
+        await _send(writer, WELCOME_LINES)
+        while True:
+            await _send(writer, [f"\n--- Round {session.round_count + 1} ---", MOVE_PROMPT])
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                user_input = line.decode(errors='replace').lower().strip()
+                if user_input in MOVES:
+                    break
+                await _send(writer, [INVALID_MOVE, MOVE_PROMPT])
+            user_choice = MOVES[user_input]
+            await _send(writer, [THINKING])
+            if delay:
+                await asyncio.sleep(delay)
+            computer_choice, outcome = session.play(user_choice)
+            await _send(writer, round_lines(session, user_choice, computer_choice, outcome) + [AGAIN_PROMPT])
+            line = await reader.readline()
+            if line.decode(errors='replace').lower().strip() != 'yes':
+                break
+        await _send(writer, final_lines(session))
+    except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+        pass # The client went away or sent garbage; drop its game.
+    finally:
+        writer.close()
+
+async def start_server(host='127.0.0.1', port=SERVER_PORT, strategy_name='random', delay=THINKING_DELAY):
+    """Starts listening and returns the asyncio server."""
+    import asyncio
+    make_strategy(strategy_name) # Reject unknown names before accepting anyone.
+
+    async def on_connect(reader, writer):
+        await handle_client(reader, writer, strategy_name, delay)
+
+    return await asyncio.start_server(on_connect, host, port, limit=MAX_LINE, backlog=4096)
+
+async def _read_until(reader, prefix):
+    """Reads lines until one starts with `prefix`."""
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection.")
+        if line.startswith(prefix):
+            return
+
+async def _load_session(host, port, rounds, latencies, rng):
+    import asyncio
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        move_prompt, again_prompt = MOVE_PROMPT.encode(), AGAIN_PROMPT.encode()
+        await _read_until(reader, move_prompt)
+        for round_number in range(rounds):
+            start = time.perf_counter()
+            writer.write(MOVE_NAMES[rng.randrange(3)].encode() + b"\n")
+            await _read_until(reader, again_prompt)
+            latencies.append(time.perf_counter() - start)
+            last = round_number == rounds - 1
+            writer.write(b"no\n" if last else b"yes\n")
+            if not last:
+                await _read_until(reader, move_prompt)
+        await _read_until(reader, b"Thanks for playing!")
+    finally:
+        writer.close()
+
+async def run_load(host, port, connections=1000, rounds=20, seed=None):
+    """Plays `connections` concurrent games of `rounds` rounds each.
+
+    Returns (latencies, elapsed): the move-to-result time of every round in
+    seconds, and the wall time of the whole run.
+    """
+    import asyncio
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_load_session(host, port, rounds, latencies, rng) for _ in range(connections)))
+    return latencies, time.perf_counter() - start
+
+def load_report(latencies, elapsed):
+    """Formats throughput and latency percentiles for a load run."""
+    ordered = sorted(latencies)
+    if not ordered:
+        return f"0 rounds in {elapsed:.2f}s: no latencies recorded"
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000
+
+    return (f"{len(ordered)} rounds in {elapsed:.2f}s: {len(ordered) / elapsed if elapsed else float('inf'):,.0f} rounds/s, "
+            f"p50 {percentile(50):.2f} ms, p99 {percentile(99):.2f} ms, max {ordered[-1] * 1000:.2f} ms")
 
-    print("Thanks for playing! See you next time!")
+async def bench_server(connections=1000, rounds=20, delay=0.0, strategy_name='random'):
+    """Runs a server on an ephemeral localhost port and loads it from the same loop."""
+    server = await start_server('127.0.0.1', 0, strategy_name, delay)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        latencies, elapsed = await run_load('127.0.0.1', port, connections, rounds)
+    return load_report(latencies, elapsed)
 
 # Ensure the game starts when the script is executed directly
 if __name__ == "__main__":
-    main_game()
+    main()
@@ -1,21 +1,623 @@
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk
-import uuid
+from array import array
+from bisect import bisect_left, insort
+from itertools import compress
+from operator import itemgetter
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from tkworkers import TkExecutor, after_first_paint, profiling_requested
+
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".prodigy_todo") # Where tasks are kept between runs.
+COMPACT_AFTER_OPS = 10000 # Journal entries before they are folded into a new snapshot.
+FSYNC_INTERVAL = 1.0 # Seconds between fsyncs with the "batch" policy.
+PAGE_ROWS = 200 # Tasks shown per page of the list.
+SEARCH_DELAY_MS = 150 # Search-as-you-type waits this long for more keystrokes.
+VIEW_FILTERS = {"All tasks": "all", "Ongoing": "ongoing", "Conquered": "completed"}
+COLUMN_TITLES = {"Status": "Status", "Description": "Your Daily Tasks"}
+
+def _uuid_text(raw_id):
+    h = raw_id.hex() # Same text as str(uuid.UUID(bytes=raw_id)), much faster.
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+def _uuid_bytes(task_id):
+    return bytes.fromhex(task_id.replace("-", ""))
+
+def _new_uuid_bytes():
+    raw = bytearray(os.urandom(16)) # A random (version 4) uuid, as uuid.uuid4().bytes, without importing uuid at startup.
+    raw[6] = raw[6] & 0x0F | 0x40
+    raw[8] = raw[8] & 0x3F | 0x80
+    return bytes(raw)
+
+_BIT_BYTES = [bytes(byte >> i & 1 for i in range(8)) for byte in range(256)]
+
+def _bit_mask(bits):
+    """A bitset (bit i of byte k is position 8k + i) as one 0/1 byte per position, for itertools.compress."""
+    return b"".join(map(_BIT_BYTES.__getitem__, bits))
+
+_BIT_DIGITS = bytes.maketrans(b"\0\1", b"01")
+
+def _pack_bits(flags):
+    """The bitset of 0/1 bytes `flags`; the inverse of _bit_mask()."""
+    digits = flags[::-1].translate(_BIT_DIGITS) # Most significant bit first, for int().
+    return int(digits or b"0", 2).to_bytes((len(flags) + 7) // 8, "little")
+
+def _set_bits(bits):
+    """Positions of the set bits in a bitset, ascending."""
+    mask = _bit_mask(bits)
+    return array("I", compress(range(len(mask)), mask))
+
+def _remove_sorted(items, item, key=None):
+    del items[bisect_left(items, item if key is None else key(item), key=key)]
+
+class TaskSnapshot:
+    """Read-only, memory-mapped snapshot file, stored a column at a time so it loads in bulk.
+
+    Layout: magic, task count, then four columns: 16-byte uuids, completion
+    bits (bit i of byte k is task 8k + i, as in TaskStore), uint32 UTF-8
+    description lengths, and the descriptions, each followed by a NUL byte.
+    columns() copies the id and flag columns as they are and decodes all
+    descriptions with one decode() and one split(), so loading does no
+    Python work per task. Snapshots in the older one-record-per-task layout
+    (TODOSNP1) are still read.
+    """
+    MAGIC = b"TODOSNP2"
+    _V1_MAGIC = b"TODOSNP1"
+    _HEADER = struct.Struct("<8sQ")
+    _V1_RECORD = struct.Struct("<16s?I")
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < self._HEADER.size or self._map[:8] not in (self.MAGIC, self._V1_MAGIC):
+            self._map.close()
+            raise ValueError(f"{path} is not a task snapshot")
+        self._version = 1 if self._map[:8] == self._V1_MAGIC else 2
+        _, self._count = self._HEADER.unpack_from(self._map, 0)
+        per_task = 8 if self._version == 1 else 16 + 4 # Offset table, or id and length columns.
+        if len(self._map) < self._HEADER.size + per_task * self._count:
+            self._map.close()
+            raise ValueError(f"{path} is truncated")
+
+    def __len__(self):
+        return self._count
+
+    def columns(self):
+        """(ids, completion bits, descriptions): 16 bytes per task, a bitset and a list of interned strings."""
+        if self._version == 1:
+            return self._v1_columns()
+        count, pos = self._count, self._HEADER.size
+        ids = self._map[pos:pos + 16 * count]
+        pos += 16 * count
+        completed = self._map[pos:pos + (count + 7) // 8]
+        pos += (count + 7) // 8
+        lengths = array("I")
+        lengths.frombytes(self._map[pos:pos + 4 * count])
+        pos += 4 * count
+        text = self._map[pos:]
+        if len(lengths) != count or len(text) != sum(lengths) + count:
+            raise ValueError("task snapshot is truncated")
+        descriptions = text.decode("utf-8").split("\0")
+        descriptions.pop() # Empty string after the last NUL.
+        if len(descriptions) != count: # Some description contains a NUL itself.
+            descriptions, start = [], 0
+            for size in lengths:
+                descriptions.append(text[start:start + size].decode("utf-8"))
+                start += size + 1
+        return ids, completed, list(map(sys.intern, descriptions))
+
+    def _v1_columns(self):
+        ids, completed, descriptions = bytearray(), bytearray((self._count + 7) // 8), []
+        offset = self._HEADER.size + 8 * self._count # Records are contiguous, so no table lookups.
+        for slot in range(self._count):
+            try:
+                raw_id, done, size = self._V1_RECORD.unpack_from(self._map, offset)
+            except struct.error:
+                raise ValueError("task snapshot is truncated") from None
+            offset += self._V1_RECORD.size
+            if offset + size > len(self._map):
+                raise ValueError("task snapshot is truncated")
+            ids += raw_id
+            descriptions.append(sys.intern(self._map[offset:offset + size].decode("utf-8")))
+            if done:
+                completed[slot >> 3] |= 1 << (slot & 7)
+            offset += size
+        return ids, completed, descriptions
+
+    def close(self):
+        self._map.close()
+
+    @classmethod
+    def write(cls, path, tasks):
+        """Writes a TaskStore, or (id, description, completed) tuples, to `path` atomically."""
+        if isinstance(tasks, TaskStore):
+            ids, completed, descriptions = tasks._columns()
+        else:
+            ids, completed, descriptions = bytearray(), bytearray(), []
+            for slot, (task_id, description, done) in enumerate(tasks):
+                ids += _uuid_bytes(task_id)
+                descriptions.append(description)
+                if slot & 7 == 0:
+                    completed.append(0)
+                if done:
+                    completed[slot >> 3] |= 1 << (slot & 7)
+        encoded = [description.encode("utf-8") for description in descriptions]
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cls._HEADER.pack(cls.MAGIC, len(encoded)))
+            f.write(ids)
+            f.write(completed)
+            f.write(array("I", map(len, encoded)).tobytes())
+            f.write(b"\0".join(encoded))
+            if encoded:
+                f.write(b"\0")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+class TaskStorage:
+    """Crash-safe task persistence: an append-only journal of operations plus periodic snapshots.
+
+    Every add/edit/toggle/delete is one small JSON line appended to the journal.
+    Entries record the resulting state (a toggle stores the new flag), so
+    replaying a journal over a snapshot that already contains it is harmless
+    and a crash at any point during compaction loses nothing.
+    fsync policy: "always" (every operation), "batch" (at most every FSYNC_INTERVAL) or "never".
+    """
+
+    def __init__(self, directory=DATA_DIR, fsync="batch", compact_after=COMPACT_AFTER_OPS):
+        if fsync not in ("always", "batch", "never"):
+            raise ValueError(f"Unknown fsync policy: {fsync}")
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, "tasks.snapshot")
+        self.journal_path = os.path.join(directory, "tasks.journal")
+        self.fsync = fsync
+        self.compact_after = compact_after
+        self.journal_ops = 0
+        self._journal = None
+        self._last_sync = 0.0
+
+    @property
+    def needs_compaction(self):
+        return self.journal_ops >= self.compact_after
+
+    def load(self):
+        """Returns the saved tasks as a TaskStore."""
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.snapshot_path):
+            snapshot = TaskSnapshot(self.snapshot_path)
+            try:
+                tasks = TaskStore._from_columns(*snapshot.columns())
+            finally:
+                snapshot.close()
+        else:
+            tasks = TaskStore()
+        self.journal_ops = self._replay(tasks)
+        return tasks
+
+    def _replay(self, tasks):
+        if not os.path.exists(self.journal_path):
+            return 0
+        ops = 0
+        good_end = 0
+        with open(self.journal_path, "rb") as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("torn write")
+                    entry = json.loads(line)
+                except ValueError:
+                    break # A torn or unreadable tail from a crash; everything before it is intact.
+                op, task_id, description, completed = self._parse_entry(entry, ops + 1)
+                if op == "add" and task_id not in tasks:
+                    tasks.add(description, task_id, bool(completed))
+                elif op == "delete":
+                    if task_id in tasks:
+                        tasks.remove(task_id)
+                elif task_id in tasks: # Including an "add" replayed over a snapshot that has it.
+                    if description is not None:
+                        tasks.set_description(task_id, description)
+                    if completed is not None or op == "add":
+                        tasks.set_completed(task_id, bool(completed))
+                good_end += len(line)
+                ops += 1
+        if good_end != os.path.getsize(self.journal_path):
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_end)
+        return ops
+
+    def _parse_entry(self, entry, line_number):
+        """(op, id, description, completed) of a journal entry, None for absent fields.
+
+        A complete line that is not a valid entry was not left by a crash, so it
+        raises ValueError rather than being cut off with everything after it.
+        """
+        try:
+            op, task_id = entry["op"], entry["id"]
+            description, completed = entry.get("description"), entry.get("completed")
+            if (op not in ("add", "edit", "toggle", "delete") or len(_uuid_bytes(task_id)) != 16
+                    or not isinstance(description, (str, type(None))) or not isinstance(completed, (bool, type(None)))
+                    or (op in ("add", "edit") and description is None)):
+                raise ValueError
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise ValueError(f"{self.journal_path} line {line_number} is not a valid journal entry") from None
+        return op, task_id, description, completed
+
+    def set_aside(self):
+        """Renames the snapshot and journal to *.corrupt-<time> so nothing written later replaces them.
+
+        Returns the new paths.
+        """
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        moved = []
+        self.close()
+        for path in (self.snapshot_path, self.journal_path):
+            if os.path.exists(path):
+                os.replace(path, f"{path}.corrupt-{stamp}")
+                moved.append(f"{path}.corrupt-{stamp}")
+        self.journal_ops = 0
+        return moved
+
+    def append(self, op, task_id, **fields):
+        """Journals one operation ("add", "edit", "toggle" or "delete") for a task."""
+        entry = {"op": op, "id": task_id}
+        entry.update(fields)
+        if self._journal is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        now = time.monotonic()
+        if self.fsync == "always" or (self.fsync == "batch" and now - self._last_sync >= FSYNC_INTERVAL):
+            os.fsync(self._journal.fileno())
+            self._last_sync = now
+        self.journal_ops += 1
+
+    def compact(self, tasks):
+        """Writes all tasks to a new snapshot and empties the journal."""
+        TaskSnapshot.write(self.snapshot_path, tasks)
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, "w", encoding="utf-8")
+        os.fsync(self._journal.fileno())
+        self.journal_ops = 0
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+            self._journal.close()
+            self._journal = None
+
+class TaskStore:
+    """Tasks in display order with an ID index, so lookups, edits and deletes are O(1).
+
+    Storage is columnar to keep large imported backlogs small: IDs are 16-byte
+    uuids packed into one bytearray, descriptions are interned (imports repeat
+    them a lot) and completion flags are single bits. A deleted task leaves a
+    hole (description None) that iteration skips; holes are dropped whenever
+    the store is rebuilt from a snapshot.
+
+    view() opens a filtered, searched and sorted TaskView. The indexes behind
+    views (description order, trigrams of descriptions) are built the first
+    time a view needs them and then kept up to date by every change, as are
+    the open views themselves.
+    """
+
+    def __init__(self):
+        self._ids = bytearray() # 16 bytes per slot.
+        self._descriptions = [] # Interned strings, None for deleted slots.
+        self._completed = bytearray() # One bit per slot.
+        self._live = bytearray() # One bit per slot, set unless the task was deleted.
+        self._slots = {} # uuid bytes -> slot
+        self._by_description = None # Live slots sorted by (casefolded description, slot).
+        self._grams = None # Trigram of a casefolded description -> array of text ids
+        self._text_ids = {} # Description -> text id, for descriptions in the trigram index
+        self._texts = [] # Text id -> description
+        self._views = [] # Open TaskViews
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, task_id):
+        return _uuid_bytes(task_id) in self._slots
+
+    def __iter__(self):
+        """Yields (id, description, completed) tuples in display order."""
+        ids, completed = self._ids, self._completed
+        for slot, description in enumerate(self._descriptions):
+            if description is not None:
+                yield _uuid_text(ids[16 * slot:16 * slot + 16]), description, bool(completed[slot >> 3] >> (slot & 7) & 1)
+
+    def _slot(self, task_id):
+        return self._slots[_uuid_bytes(task_id)]
+
+    @classmethod
+    def _from_columns(cls, ids, completed, descriptions):
+        """A store holding the columns read by TaskSnapshot.columns(), taken over in bulk."""
+        store = cls()
+        count = len(descriptions)
+        ids = bytes(ids)
+        if len(ids) != 16 * count or len(completed) != (count + 7) // 8:
+            raise ValueError("task columns have different lengths")
+        store._ids = bytearray(ids)
+        store._completed = bytearray(completed)
+        store._live = bytearray(_pack_bits(b"\1" * count))
+        store._descriptions = descriptions
+        store._slots = dict(zip(map(itemgetter(0), struct.iter_unpack("16s", ids)), range(count))) # The one per-task step, done in C.
+        if len(store._slots) != count:
+            raise ValueError("task snapshot has duplicate task IDs")
+        return store
+
+    def _columns(self):
+        """(ids, completion bits, descriptions) of the tasks, without the holes left by deletes."""
+        if len(self._slots) == len(self._descriptions):
+            return bytes(self._ids), bytes(self._completed), self._descriptions
+        live = _set_bits(self._live)
+        ids = b"".join([self._ids[16 * slot:16 * slot + 16] for slot in live])
+        flags = _bit_mask(self._completed)
+        completed = _pack_bits(bytes(map(flags.__getitem__, live)))
+        return ids, completed, list(map(self._descriptions.__getitem__, live))
+
+    def _is_completed(self, slot):
+        return bool(self._completed[slot >> 3] >> (slot & 7) & 1)
+
+    def _task(self, slot):
+        return _uuid_text(self._ids[16 * slot:16 * slot + 16]), self._descriptions[slot], self._is_completed(slot)
+
+    def get(self, task_id):
+        slot = self._slots.get(_uuid_bytes(task_id))
+        if slot is None:
+            return None
+        return {"id": task_id, "description": self._descriptions[slot], "completed": self._is_completed(slot)}
+
+    def add(self, description, task_id=None, completed=False):
+        raw_id = _uuid_bytes(task_id) if task_id else _new_uuid_bytes()
+        slot = len(self._descriptions)
+        self._slots[raw_id] = slot
+        self._ids += raw_id
+        self._descriptions.append(sys.intern(description))
+        if slot & 7 == 0:
+            self._completed.append(0)
+            self._live.append(0)
+        self._live[slot >> 3] |= 1 << (slot & 7)
+        if completed:
+            self._completed[slot >> 3] |= 1 << (slot & 7)
+        if self._views or self._grams is not None or self._by_description is not None:
+            self._index(slot)
+        return task_id or _uuid_text(raw_id)
+
+    def set_description(self, task_id, description):
+        slot = self._slot(task_id)
+        self._unindex(slot)
+        self._descriptions[slot] = sys.intern(description)
+        self._index(slot)
+
+    def set_completed(self, task_id, completed):
+        slot = self._slot(task_id)
+        if self._is_completed(slot) == bool(completed):
+            return
+        # Only views that filter or sort by status can move; the description indexes cannot.
+        views = [view for view in self._views if view.by_status]
+        for view in views:
+            view._discard(slot)
+        if completed:
+            self._completed[slot >> 3] |= 1 << (slot & 7)
+        else:
+            self._completed[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+        for view in views:
+            view._insert(slot)
+
+    def remove(self, task_id):
+        slot = self._slots.pop(_uuid_bytes(task_id))
+        self._unindex(slot)
+        self._descriptions[slot] = None
+        self._completed[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+        self._live[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+
+    def view(self, state="all", query="", sort="added", reverse=False):
+        """Opens a TaskView of the tasks in `state` ("all", "ongoing" or "completed") whose description contains `query`.
+
+        `sort` is "added", "status" or "description"; ties keep the order tasks were added in.
+        """
+        return TaskView(self, state, query, sort, reverse)
+
+    # Indexes. _unindex() runs before a slot changes and _index() after, so
+    # sorted arrays can find a slot's old position by its old sort key.
+
+    def _unindex(self, slot):
+        for view in self._views:
+            view._discard(slot)
+        if self._by_description is not None:
+            _remove_sorted(self._by_description, slot, self._description_key)
+
+    def _index(self, slot):
+        if self._by_description is not None:
+            insort(self._by_description, slot, key=self._description_key)
+        if self._grams is not None and self._descriptions[slot] not in self._text_ids:
+            self._index_text(self._descriptions[slot])
+        for view in self._views:
+            view._insert(slot)
+
+    def _status_key(self, slot):
+        return self._is_completed(slot), slot
+
+    def _description_key(self, slot):
+        return self._descriptions[slot].casefold(), slot
+
+    def _state_bits(self, state):
+        """The bitset of live slots in `state`."""
+        if state == "completed":
+            return self._completed
+        if state == "ongoing":
+            size = len(self._live)
+            return (int.from_bytes(self._live, "little") & ~int.from_bytes(self._completed, "little")).to_bytes(size, "little")
+        return self._live
+
+    def _description_order(self):
+        if self._by_description is None:
+            groups = {}
+            folded = {} # Descriptions are interned, so each distinct one is casefolded once.
+            for slot, description in enumerate(self._descriptions):
+                if description is not None:
+                    text = folded.get(description)
+                    if text is None:
+                        text = folded[description] = description.casefold()
+                        groups.setdefault(text, [])
+                    groups[text].append(slot)
+            self._by_description = array("I")
+            for text in sorted(groups):
+                self._by_description.extend(groups[text])
+        return self._by_description
+
+    def _index_text(self, description):
+        text_id = self._text_ids[description] = len(self._texts)
+        self._texts.append(description)
+        folded = description.casefold()
+        for gram in {folded[i:i + 3] for i in range(len(folded) - 2)}:
+            text_ids = self._grams.get(gram)
+            if text_ids is None:
+                text_ids = self._grams[gram] = array("I")
+            text_ids.append(text_id)
+
+    def _matching_texts(self, query):
+        """The set of descriptions containing `query`, ignoring case.
+
+        The trigram index holds each distinct description once; queries of three
+        or more characters only check descriptions with the query's rarest
+        trigram. Descriptions no longer in use stay indexed, which is harmless.
+        """
+        if self._grams is None:
+            self._grams = {}
+            for description in self._descriptions:
+                if description is not None and description not in self._text_ids:
+                    self._index_text(description)
+        query = query.casefold()
+        if len(query) < 3:
+            candidates = range(len(self._texts))
+        else:
+            postings = [self._grams.get(query[i:i + 3]) for i in range(len(query) - 2)]
+            if not all(postings):
+                return set()
+            candidates = min(postings, key=len)
+        texts = self._texts
+        return {texts[i] for i in candidates if query in texts[i].casefold()}
+
+class TaskView:
+    """The tasks of a store that match a filter and a search, in sort order.
+
+    `slots` holds store slots ascending by the sort key (reverse views read it
+    backwards). The store keeps an open view current as tasks change, at the
+    cost of a binary search per change; close() a view that is no longer shown.
+    """
+
+    def __init__(self, store, state, query, sort, reverse):
+        self.store = store
+        self.state = state
+        self.query = query
+        self.sort = sort
+        self.reverse = reverse
+        self._folded = query.casefold()
+        self._key = {"added": None, "status": store._status_key, "description": store._description_key}[sort]
+        self.by_status = state != "all" or sort == "status" # Whether completing a task can move it
+        self.slots = self._build()
+        store._views.append(self)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def close(self):
+        self.store._views.remove(self)
+
+    def page(self, number, size=PAGE_ROWS):
+        """(id, description, completed) tuples for page `number` of `size` tasks."""
+        return [self.store._task(slot) for slot in self.page_slots(number, size)]
+
+    def page_slots(self, number, size=PAGE_ROWS):
+        """The store slots on a page; comparing them tells cheaply whether a page holds other tasks than before."""
+        count = len(self.slots)
+        start, stop = min(number * size, count), min(number * size + size, count)
+        return self.slots[count - stop:count - start][::-1] if self.reverse else self.slots[start:stop]
+
+    def position(self, task_id):
+        """Where the task is in the view, or None if the view does not show it."""
+        slot = self.store._slots.get(_uuid_bytes(task_id))
+        if slot is None or not self._matches(slot):
+            return None
+        index = bisect_left(self.slots, slot if self._key is None else self._key(slot), key=self._key)
+        return len(self.slots) - 1 - index if self.reverse else index
+
+    def _matches(self, slot):
+        store = self.store
+        if self.state != "all" and store._is_completed(slot) != (self.state == "completed"):
+            return False
+        return not self._folded or self._folded in store._descriptions[slot].casefold()
+
+    def _discard(self, slot):
+        if self._matches(slot):
+            _remove_sorted(self.slots, slot, self._key)
+
+    def _insert(self, slot):
+        if self._matches(slot):
+            insort(self.slots, slot, key=self._key)
+
+    def _build(self):
+        store = self.store
+        if self.query:
+            texts = store._matching_texts(self.query)
+            descriptions = store._descriptions
+            slots = list(compress(range(len(descriptions)), map(texts.__contains__, descriptions))) if texts else []
+            if self.state != "all":
+                mask = _bit_mask(store._state_bits(self.state))
+                slots = list(compress(slots, map(mask.__getitem__, slots)))
+            return array("I", slots if self._key is None else sorted(slots, key=self._key))
+        if self.sort == "status" and self.state == "all":
+            slots = _set_bits(store._state_bits("ongoing"))
+            slots.extend(_set_bits(store._completed))
+            return slots
+        bits = store._state_bits(self.state)
+        if self.sort == "description":
+            order = store._description_order()
+            if self.state == "all":
+                return array("I", order)
+            return array("I", compress(order, map(_bit_mask(bits).__getitem__, order)))
+        return _set_bits(bits)
 
 class TodoApp:
-    def __init__(self, master):
+    def __init__(self, master, data_dir=DATA_DIR):
         self.master = master
         self.master.title("Prodigy To-Do Nexus ✨")
         self.master.geometry("800x600") # Higher resolution window size.
         self.master.resizable(True, True)
         self.master.configure(bg="#121212") # Very dark black background.
 
-        self.tasks = []
+        self.tasks = TaskStore()
+        self.storage = TaskStorage(data_dir)
+        self.workers = TkExecutor(master)
+        self._loading = True # Commands wait until the saved tasks are in.
+        self._read_only = False # Set if saved tasks could be neither loaded nor moved aside; nothing is written then.
+        self.view = None # TaskView behind the list, opened once the tasks are loaded.
+        self._filter = "all"
+        self._query = ""
+        self._sort = ("added", False) # (sort, reverse)
+        self._page = 0
+        self._page_ids = [] # Task IDs on the page shown, in order.
+        self._page_slots = None # view.page_slots() of the page shown.
+        # Styles go in before any widget exists: changing them later makes every ttk widget lay itself out again.
         self.style = ttk.Style()
         self._configure_styles()    
         self._create_widgets()
-        self._load_tasks() # Placeholder for persistent storage.
-        self._update_task_list_display()
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
+        after_first_paint(self.master, self._finish_startup)
+
+    def _finish_startup(self):
+        self._create_view_controls()
+        self._create_action_buttons()
+        self._load_tasks() # Snapshot + journal replay, on a worker thread.
 
     def _configure_styles(self):
         self.style.theme_use('clam')
@@ -40,12 +642,16 @@ class TodoApp:
         add_button.grid(row=0, column=1, pady=5)
         input_frame.grid_columnconfigure(0, weight=1)
 
+        # Holds the filter, search and page controls, which are added once the window is on screen.
+        self.view_frame = ttk.Frame(self.master, padding="15 0 15 0")
+        self.view_frame.pack(padx=10, fill=tk.X)
+
         task_list_frame = ttk.Frame(self.master, padding="10 10 10 10")
         task_list_frame.pack(pady=5, padx=10, fill=tk.BOTH, expand=True)
 
         self.task_list = ttk.Treeview(task_list_frame, columns=("Status", "Description"), show="headings", selectmode="browse")
-        self.task_list.heading("Status", text="Status", anchor=tk.CENTER)
-        self.task_list.heading("Description", text="Your Daily Tasks", anchor=tk.W) # Changed to "Tasks".
+        self.task_list.heading("Status", text=COLUMN_TITLES["Status"], anchor=tk.CENTER, command=lambda: self._sort_by("status"))
+        self.task_list.heading("Description", text=COLUMN_TITLES["Description"], anchor=tk.W, command=lambda: self._sort_by("description"))
         self.task_list.column("Status", width=100, anchor=tk.CENTER, stretch=tk.NO)
         self.task_list.column("Description", minwidth=200, anchor=tk.W, stretch=tk.YES)
         self.task_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -54,9 +660,34 @@ class TodoApp:
         task_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.task_list.config(yscrollcommand=task_scrollbar.set)
 
-        button_frame = ttk.Frame(self.master, padding="15 15 15 15")
-        button_frame.pack(pady=10, padx=10, fill=tk.X)
+        # Holds the task buttons, which are added once the window is on screen.
+        self.button_frame = ttk.Frame(self.master, padding="15 15 15 15")
+        self.button_frame.pack(pady=10, padx=10, fill=tk.X)
+
+        self.status_label = ttk.Label(self.master, text="Ready to conquer your day! 🚀", anchor="w", font=("Inter", 10, "italic"), foreground="#BB8FCE") # Brighter purple status text.
+        self.status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 10))
+
+    def _create_view_controls(self):
+        view_frame = self.view_frame
+        ttk.Label(view_frame, text="Show:").grid(row=0, column=0, padx=(0, 5), pady=5)
+        self.filter_var = tk.StringVar(value="All tasks")
+        filter_box = ttk.Combobox(view_frame, textvariable=self.filter_var, values=list(VIEW_FILTERS), state="readonly", width=12)
+        filter_box.grid(row=0, column=1, padx=(0, 15), pady=5)
+        filter_box.bind("<<ComboboxSelected>>", self._filter_changed)
+
+        ttk.Label(view_frame, text="Search 🔍").grid(row=0, column=2, padx=(0, 5), pady=5)
+        self.search_input = ttk.Entry(view_frame, width=25, font=("Inter", 12))
+        self.search_input.grid(row=0, column=3, padx=(0, 15), pady=5, sticky="ew")
+        self.search_input.bind("<KeyRelease>", self._schedule_search)
+
+        ttk.Button(view_frame, text="◀", width=3, command=lambda: self._turn_page(-1)).grid(row=0, column=4, pady=5)
+        self.page_label = ttk.Label(view_frame, text="", anchor=tk.CENTER)
+        self.page_label.grid(row=0, column=5, padx=10, pady=5)
+        ttk.Button(view_frame, text="▶", width=3, command=lambda: self._turn_page(1)).grid(row=0, column=6, pady=5)
+        view_frame.grid_columnconfigure(3, weight=1)
 
+    def _create_action_buttons(self):
+        button_frame = self.button_frame
         edit_button = ttk.Button(button_frame, text="Refine Task ✏️", command=self._edit_task)
         edit_button.grid(row=0, column=0, padx=5, pady=5, sticky="ew")
 
@@ -70,65 +701,180 @@ class TodoApp:
         button_frame.grid_columnconfigure(1, weight=1)
         button_frame.grid_columnconfigure(2, weight=1)
 
-        self.status_label = ttk.Label(self.master, text="Ready to conquer your day! 🚀", anchor="w", font=("Inter", 10, "italic"), foreground="#BB8FCE") # Brighter purple status text.
-        self.status_label.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 10))
-
     def _add_task_event(self, event=None):
         self._add_task()
 
+    def _ready(self):
+        if self._loading:
+            self._set_status("Still loading your tasks, one moment... ⏳")
+        return not self._loading
+
     def _add_task(self):
+        if not self._ready():
+            return
         task_description = self.task_input.get().strip()
         if task_description:
-            task = {"id": str(uuid.uuid4()), "description": task_description, "completed": False}
-            self.tasks.append(task)
+            task_id = self.tasks.add(task_description)
+            self._journal("add", task_id, description=task_description, completed=False)
             self.task_input.delete(0, tk.END)
-            self._update_task_list_display()
+            position = self.view.position(task_id)
+            if position is None or position // PAGE_ROWS == self._page:
+                self._task_changed(task_id)
+            else: # Turn to the new task, unless the filter or search hides it.
+                self._show_page(position // PAGE_ROWS)
+            if position is not None:
+                self.task_list.see(task_id)
             self._set_status(f"'{task_description}' added to your list! Let's do this. 💪")
         else:
             messagebox.showwarning("Input Error", "Looks like you forgot to type your task! Please enter a description. 🤔")
 
     def _get_selected_task_id(self):
-        selected_item = self.task_list.focus()
-        if selected_item:
-            return self.task_list.item(selected_item, "tags")[0]
-        return None
+        return self.task_list.focus() or None # Treeview items are keyed by task ID.
 
     def _get_task_by_id(self, task_id):
-        for task in self.tasks:
-            if task["id"] == task_id:
-                return task
-        return None
+        return self.tasks.get(task_id)
+
+    def _row_values(self, description, completed):
+        status_text = "✅ CONQUERED!" if completed else "⏳ ONGOING..."
+        return (status_text, description)
+
+    # The list shows one page of PAGE_ROWS tasks from self.view, so changing the
+    # filter, search, sort or page only ever redraws a page, however many tasks there are.
+
+    def _open_view(self):
+        """Shows the first page of a new view for the current filter, search and sort."""
+        if self._loading:
+            return # Opened once the tasks are in.
+        if self.view is not None:
+            self.view.close()
+        sort, reverse = self._sort
+        self.view = self.tasks.view(self._filter, self._query, sort, reverse)
+        self._show_page(0)
+
+    def _show_page(self, page=None):
+        pages = max(1, -(-len(self.view) // PAGE_ROWS))
+        self._page = max(0, min(self._page if page is None else page, pages - 1))
+        rows = self.view.page(self._page, PAGE_ROWS)
+        focus = self.task_list.focus()
+        self.task_list.delete(*self.task_list.get_children())
+        for task_id, description, completed in rows:
+            self.task_list.insert("", tk.END, iid=task_id, values=self._row_values(description, completed))
+        self._page_ids = [task_id for task_id, _, _ in rows]
+        self._page_slots = self.view.page_slots(self._page, PAGE_ROWS)
+        if focus in self._page_ids: # Keep the selected task selected if it is still shown.
+            self.task_list.focus(focus)
+            self.task_list.selection_set(focus)
+        self._show_page_label(pages)
+
+    def _show_page_label(self, pages):
+        self.page_label.config(text=f"Page {self._page + 1:,} of {pages:,} · {len(self.view):,} tasks")
+
+    def _task_changed(self, task_id):
+        """Updates the list after one task was added, changed or removed, touching only the rows that differ."""
+        pages = max(1, -(-len(self.view) // PAGE_ROWS))
+        if self._page >= pages: # The last page emptied.
+            self._show_page()
+            return
+        slots = self.view.page_slots(self._page, PAGE_ROWS)
+        if slots != self._page_slots:
+            self._sync_page(slots)
+        self._show_page_label(pages) # The task count may have changed even if this page did not.
+        if task_id in self._page_ids:
+            self._refresh_task_row(task_id)
+
+    def _sync_page(self, slots):
+        """Turns the shown rows into `slots`: rows that left the page are deleted, new ones inserted and moved ones moved.
+
+        One added or removed task changes the page by that row plus the one
+        row pushed over, or pulled back across, the page boundary.
+        """
+        shown = dict(zip(self._page_slots, self._page_ids))
+        kept = set(slots)
+        for slot, task_id in shown.items():
+            if slot not in kept:
+                self.task_list.delete(task_id)
+        staying = [slot for slot in self._page_slots if slot in kept]
+        arriving = [slot for slot in slots if slot in shown]
+        moved = set() # Rows between the first and last that changed place; everything else keeps its order.
+        if staying != arriving:
+            first = next(i for i, (a, b) in enumerate(zip(staying, arriving)) if a != b)
+            last = len(staying) - next(i for i, (a, b) in enumerate(zip(reversed(staying), reversed(arriving))) if a != b)
+            moved.update(arriving[first:last])
+        page_ids = []
+        for index, slot in enumerate(slots):
+            task_id = shown.get(slot)
+            if task_id is None:
+                task_id, description, completed = self.tasks._task(slot)
+                self.task_list.insert("", index, iid=task_id, values=self._row_values(description, completed))
+            elif slot in moved:
+                self.task_list.move(task_id, "", index)
+            page_ids.append(task_id)
+        self._page_ids = page_ids
+        self._page_slots = slots
+
+    def _refresh_task_row(self, task_id):
+        task = self.tasks.get(task_id)
+        self.task_list.item(task_id, values=self._row_values(task["description"], task["completed"]))
+
+    def _turn_page(self, step):
+        if self.view is not None:
+            self._show_page(self._page + step)
 
-    def _update_task_list_display(self):
-        for item in self.task_list.get_children():
-            self.task_list.delete(item)
+    def _filter_changed(self, event=None):
+        self._filter = VIEW_FILTERS[self.filter_var.get()]
+        self._open_view()
 
-        for task in self.tasks:
-            status_text = "✅ CONQUERED!" if task["completed"] else "⏳ ONGOING..."
-            tag = task["id"]
-            self.task_list.insert("", tk.END, tags=(tag,), values=(status_text, task["description"]))
+    def _schedule_search(self, event=None):
+        self.workers.coalesce("search", self._search_changed, delay_ms=SEARCH_DELAY_MS)
+
+    def _search_changed(self):
+        query = self.search_input.get().strip()
+        if query != self._query:
+            self._query = query
+            self._open_view()
+
+    def _sort_by(self, sort):
+        """Sorts by a column; clicking it again reverses the order, and a third time goes back to the order tasks were added in."""
+        current, reverse = self._sort
+        if current != sort:
+            self._sort = (sort, False)
+        elif not reverse:
+            self._sort = (sort, True)
+        else:
+            self._sort = ("added", False)
+        for column, column_sort in (("Status", "status"), ("Description", "description")):
+            arrow = (" ▼" if self._sort[1] else " ▲") if self._sort[0] == column_sort else ""
+            self.task_list.heading(column, text=COLUMN_TITLES[column] + arrow)
+        self._open_view()
 
     def _mark_task_complete(self):
+        if not self._ready():
+            return
         task_id = self._get_selected_task_id()
         if task_id:
             task = self._get_task_by_id(task_id)
             if task:
-                task["completed"] = not task["completed"]
-                self._update_task_list_display()
-                status_msg = "Marked as CONQUERED! 🎉 Time for your next victory! ✨" if task["completed"] else "Marked as ONGOING again. You got this! 💪"
+                completed = not task["completed"]
+                self.tasks.set_completed(task_id, completed)
+                self._journal("toggle", task_id, completed=completed)
+                self._task_changed(task_id)
+                status_msg = "Marked as CONQUERED! 🎉 Time for your next victory! ✨" if completed else "Marked as ONGOING again. You got this! 💪"
                 self._set_status(f"'{task['description']}' {status_msg}")
         else:
             messagebox.showwarning("Selection Error", "Please select a task to mark. No magic without a choice! ☝️")
 
     def _edit_task(self):
+        if not self._ready():
+            return
         task_id = self._get_selected_task_id()
         if task_id:
             task = self._get_task_by_id(task_id)
             if task:
                 new_description = simpledialog.askstring("Refine Your Task", "What's the new plan for this task?", initialvalue=task["description"])
                 if new_description is not None and new_description.strip():
-                    task["description"] = new_description.strip()
-                    self._update_task_list_display()
+                    self.tasks.set_description(task_id, new_description.strip())
+                    self._journal("edit", task_id, description=new_description.strip())
+                    self._task_changed(task_id)
                     self._set_status(f"Task updated to: '{new_description}'! Fresh start! ✨")
                 elif new_description is not None:
                     messagebox.showwarning("Input Error", "A task needs a description! Please try again. 🚫")
@@ -138,13 +884,16 @@ class TodoApp:
             messagebox.showwarning("Selection Error", "Please choose a task to refine. Can't edit what's not chosen! ☝️")
 
     def _delete_task(self):
+        if not self._ready():
+            return
         task_id = self._get_selected_task_id()
         if task_id:
             task_to_delete = self._get_task_by_id(task_id)
             if task_to_delete:
                 if messagebox.askyesno("Confirm Deletion", f"Are you sure you want to remove '{task_to_delete['description']}'? This cannot be undone. 😬"):
-                    self.tasks = [task for task in self.tasks if task["id"] != task_id]
-                    self._update_task_list_display()
+                    self.tasks.remove(task_id)
+                    self._journal("delete", task_id)
+                    self._task_changed(task_id)
                     self._set_status(f"'{task_to_delete['description']}' has been removed. One less thing to worry about! 👍")
             else:
                 self._set_status("Error: Hmm, couldn't find that task. Perhaps it vanished? 🐛")
@@ -155,15 +904,100 @@ class TodoApp:
         self.status_label.config(text=message)
 
     def _load_tasks(self):
-        pass
+        self._set_status("Loading your tasks... ⏳")
+        self.workers.submit("load", self._read_tasks, self.storage, on_done=self._tasks_loaded, on_error=self._load_failed)
+
+    @staticmethod
+    def _read_tasks(storage):
+        return storage.load()
+
+    def _tasks_loaded(self, tasks):
+        self.tasks = tasks
+        self._loading = False
+        self._open_view()
+        self._set_status("Ready to conquer your day! 🚀")
+
+    def _load_failed(self, error):
+        # The files that failed to load are moved aside before anything new is journaled,
+        # so saving the (empty) list can never overwrite the tasks still in them.
+        try:
+            kept = self.storage.set_aside()
+        except OSError as e:
+            self._read_only = True
+            kept_note = f"Changes won't be saved this session, so your saved tasks stay as they are ({e})."
+        else:
+            kept_note = f"The saved files were kept as {', '.join(kept)}." if kept else ""
+        self._loading = False
+        self._open_view()
+        self._set_status("Changes won't be saved this session ⚠️" if self._read_only else "")
+        messagebox.showerror("Storage Error", f"Couldn't load your saved tasks: {error} 🐛 {kept_note}")
 
     def _save_tasks(self):
-        pass
+        try:
+            self.storage.compact(self.tasks)
+        except OSError as e:
+            messagebox.showerror("Storage Error", f"Couldn't save your tasks: {e} 🐛")
+
+    def _journal(self, op, task_id, **fields):
+        if self._read_only:
+            return
+        try:
+            self.storage.append(op, task_id, **fields)
+            if self.storage.needs_compaction:
+                self._save_tasks()
+        except OSError as e:
+            self._set_status(f"Warning: this change couldn't be saved ({e}) ⚠️")
+
+    def _on_close(self):
+        self.workers.shutdown()
+        if self.storage.journal_ops and not self._loading and not self._read_only: # A half-loaded list must never replace the snapshot.
+            self._save_tasks()
+        self.storage.close()
+        self.master.destroy()
+
+def bench_memory(sizes=(10_000, 1_000_000, 5_000_000)):
+    """Prints bytes per task for the old list-of-dicts layout and for TaskStore.
+
+    Descriptions come from 1,000 distinct texts but are separate string objects,
+    like lines read from an imported file.
+    """
+    import gc
+    import tracemalloc
+    import uuid
+
+    def old_layout(n):
+        return [{"id": str(uuid.uuid4()), "description": f"Imported task #{i % 1000}", "completed": False} for i in range(n)]
+
+    def task_store(n):
+        store = TaskStore()
+        for i in range(n):
+            store.add(f"Imported task #{i % 1000}")
+        return store
+
+    print(f"{'tasks':>10} {'dicts B/task':>13} {'TaskStore B/task':>17} {'saving':>7}")
+    for n in sizes:
+        per_task = []
+        for build in (old_layout, task_store):
+            gc.collect()
+            tracemalloc.start()
+            tasks = build(n)
+            per_task.append(tracemalloc.get_traced_memory()[0] / n)
+            tracemalloc.stop()
+            del tasks
+        print(f"{n:>10,} {per_task[0]:>13.1f} {per_task[1]:>17.1f} {per_task[0] / per_task[1]:>6.1f}x")
 
-def run_app():
+def run_app(profile=False):
     root = tk.Tk()
+    if profile:
+        import tkprofile
+        tkprofile.install(root)
     app = TodoApp(root)
     root.mainloop()
 
 if __name__ == "__main__":
-    run_app()
+    profile = profiling_requested(sys.argv)
+    if "--bench-memory" in sys.argv:
+        sizes = [int(n) for n in sys.argv[sys.argv.index("--bench-memory") + 1:]]
+        bench_memory(sizes) if sizes else bench_memory()
+    else:
+        run_app(profile)
@@ -0,0 +1,540 @@
+"""Benchmarks for the five apps, run headless.
+
+    python benchmark.py                       # everything, compared with benchmark_baseline.json
+    python benchmark.py --only contacts --sizes 10000,100000
+    python benchmark.py --save-baseline       # record this machine's numbers as the baseline
+    python benchmark.py --only startup        # import time, first paint and time until ready
+
+GUI code runs on a real display when there is one, under Xvfb when it is
+installed, and otherwise against a small in-process stand-in for the Tk
+widgets the apps use (so app logic is timed but not Tk drawing). The mode is
+recorded with the results, and a baseline is only compared against results
+from the same mode. Dialogs are always replaced, so nothing waits for a click.
+
+Every suite runs --repeat times and each metric keeps its best value, along
+with its spread: how much slower the worst run was. A metric only counts as
+a regression when it is slower than the baseline by more than the tolerance
+plus the larger of the two spreads, so metrics that are noisy on this machine
+get a wider allowance than steady ones. With fewer than MIN_GATE_RUNS runs
+(--repeat 1), suites that show a regression are re-run until they have had
+that many before the check fails.
+
+Suites also check what they compute (batch against scalar evaluation, SQLite
+against in-memory search, the shown page against its view, ...). A wrong
+result fails the run whatever the timings.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tkinter as tk
+import tkinter.constants
+from types import SimpleNamespace
+
+import tkworkers
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(HERE, "benchmark_baseline.json")
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10_000,)
+DEFAULT_TOLERANCE = 0.25 # Allowed slowdown before a metric counts as a regression, on top of its spread
+DEFAULT_REPEAT = 3 # Runs of each suite; every metric keeps its best
+MIN_GATE_RUNS = 3 # Runs a regression must survive: suites that regress in fewer are re-run before failing
+MIN_DELTA_MS = 0.05 # Latencies closer than this are timer noise, whatever the ratio
+SUITES = ("calculator", "contacts", "todo", "passwords", "rps", "startup")
+APP_FILES = {"calculator": "Calculator.py", "contacts": "ContactBook.py", "passwords": "Passwordgenerator.py",
+             "todo": "To-Do_app.py", "rps": "RPS_GAME.py"}
+STARTUP_RUNS = 5 # Cold starts per app; the median is reported
+STARTUP_ROWS = 100_000 # Saved contacts and tasks waiting when the apps start
+_FIRST_PAINT_TIMEOUT_MS = tkworkers.FIRST_PAINT_TIMEOUT_MS
+
+# --- Loading the apps ---
+
+_apps = {}
+
+def load_app(filename):
+    """Imports one of the app scripts by file name (To-Do_app.py is not a valid module name)."""
+    if filename not in _apps:
+        name = os.path.splitext(filename)[0].replace("-", "_")
+        spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module # Process pool workers unpickle functions by module name
+        spec.loader.exec_module(module)
+        _apps[filename] = module
+    return _apps[filename]
+
+# --- Headless Tk ---
+
+def _noop(*args, **kwargs): return None
+
+class _StubWidget:
+    """Enough of a Tk widget for the apps' own logic to run without a display.
+
+    Layout, binding and styling calls are accepted and ignored; widgets whose
+    state the apps read back (entries, listboxes, treeviews, labels) keep it.
+    """
+
+    def __init__(self, master=None, *args, **options):
+        self.master = master; self._options = dict(options)
+
+    def __getattr__(self, name):
+        if name.startswith("_"): raise AttributeError(name)
+        return _noop # pack, grid, bind, title, geometry, heading, column, ...
+
+    def cget(self, key): return self._options.get(key, 10 if key == "height" else "")
+    def config(self, cnf=None, **options): self._options.update(cnf or {}, **options)
+    configure = config
+    def winfo_children(self): return []
+
+class _StubRoot(_StubWidget):
+    """A root window whose after() callbacks run when run_pending() is called."""
+
+    def __init__(self, *args, **options):
+        super().__init__(None); self._pending = {}; self._next_job = 0
+
+    def after(self, ms, func=None, *args):
+        if func is None: return None
+        self._next_job += 1; job = f"after#{self._next_job}"; self._pending[job] = (func, args); return job
+
+    def after_idle(self, func, *args): return self.after(0, func, *args)
+    def after_cancel(self, job): self._pending.pop(job, None)
+
+    def run_pending(self, limit=100_000):
+        """Runs queued callbacks (including ones they queue) until none are left."""
+        for _ in range(limit):
+            if not self._pending: return
+            job = next(iter(self._pending)); func, args = self._pending.pop(job); func(*args)
+
+class _StubEntry(_StubWidget):
+    def __init__(self, master=None, *args, **options): super().__init__(master, **options); self._text = ""
+    def get(self): return self._text
+    def insert(self, index, text):
+        i = len(self._text) if index in ("end", tk.END) else int(index); self._text = self._text[:i] + text + self._text[i:]
+    def delete(self, first, last=None):
+        a = int(first); b = len(self._text) if last in ("end", tk.END) else (a + 1 if last is None else int(last))
+        self._text = self._text[:a] + self._text[b:]
+
+class _StubListbox(_StubWidget):
+    def __init__(self, master=None, *args, **options): super().__init__(master, **options); self._items = []; self._selected = set()
+    def _index(self, i): return len(self._items) if i in ("end", tk.END) else int(i)
+    def insert(self, index, *items): i = self._index(index); self._items[i:i] = items
+    def delete(self, first, last=None):
+        a = self._index(first); b = a + 1 if last is None else self._index(last) + 1; del self._items[a:b]
+    def get(self, first, last=None): return self._items[self._index(first)] if last is None else tuple(self._items[self._index(first):self._index(last) + 1])
+    def size(self): return len(self._items)
+    def curselection(self): return tuple(sorted(i for i in self._selected if i < len(self._items)))
+    def selection_set(self, first, last=None): self._selected.update(range(self._index(first), (self._index(last) if last is not None else self._index(first)) + 1))
+    def selection_clear(self, first, last=None): self._selected.clear()
+
+class _StubTreeview(_StubWidget):
+    def __init__(self, master=None, *args, **options):
+        super().__init__(master, **options); self._rows = {}; self._focus = ""; self._selection = (); self._next_iid = 0
+    def insert(self, parent, index, iid=None, **kw):
+        if iid is None: self._next_iid += 1; iid = f"I{self._next_iid:03X}"
+        if iid in self._rows: raise tk.TclError(f"Item {iid} already exists")
+        values = list(kw.get("values", ()))
+        if index in ("end", tk.END) or int(index) >= len(self._rows): self._rows[iid] = values
+        else:
+            items = list(self._rows.items()); items.insert(int(index), (iid, values)); self._rows = dict(items)
+        return iid
+    def item(self, iid, option=None, **kw):
+        if iid not in self._rows: raise tk.TclError(f"Item {iid} not found")
+        if "values" in kw: self._rows[iid] = list(kw["values"])
+        elif not kw: return self._rows[iid] if option == "values" else {"values": self._rows[iid]}
+    def set(self, iid, column=None, value=None): return dict(enumerate(self._rows[iid]))
+    def delete(self, *iids):
+        for iid in iids:
+            if self._rows.pop(iid, None) is None: raise tk.TclError(f"Item {iid} not found")
+        if self._focus in iids: self._focus = ""
+    def move(self, iid, parent, index):
+        values = self._rows.pop(iid); items = list(self._rows.items()); items.insert(int(index), (iid, values)); self._rows = dict(items)
+    def index(self, iid): return list(self._rows).index(iid)
+    def exists(self, iid): return iid in self._rows
+    def get_children(self, item=""): return tuple(self._rows)
+    def focus(self, item=None):
+        if item is None: return self._focus
+        self._focus = item
+    def selection(self): return self._selection
+    def selection_set(self, *items): self._selection = tuple(items[0]) if len(items) == 1 and isinstance(items[0], (list, tuple)) else items
+
+class _StubStyle:
+    def __init__(self, master=None): pass
+    def configure(self, style, query_opt=None, **kw): return {}
+    def map(self, style, query_opt=None, **kw): return {}
+    def lookup(self, style, option, state=None, default=None): return default
+    def theme_use(self, theme=None): return "clam"
+
+class _StubVar:
+    def __init__(self, master=None, value=None, name=None): self._value = value
+    def get(self): return self._value
+    def set(self, value): self._value = value
+
+class _StubFont:
+    def __init__(self, root=None, font=None, **options): pass
+    def metrics(self, *options): return 15 if options else {"linespace": 15, "ascent": 12, "descent": 3, "fixed": 0}
+    def measure(self, text, displayof=None): return 7 * len(text)
+    def actual(self, option=None, displayof=None): return {}
+
+_stub_tk = SimpleNamespace(
+    **{k: v for k, v in vars(tkinter.constants).items() if k.isupper()},
+    Tk=_StubRoot, Toplevel=_StubRoot, Frame=_StubWidget, Label=_StubWidget, Button=_StubWidget, Scrollbar=_StubWidget,
+    Checkbutton=_StubWidget, Canvas=_StubWidget, Entry=_StubEntry, Listbox=_StubListbox,
+    StringVar=_StubVar, BooleanVar=_StubVar, IntVar=_StubVar, DoubleVar=_StubVar, TclError=tk.TclError,
+)
+_stub_ttk = SimpleNamespace(Frame=_StubWidget, Label=_StubWidget, Button=_StubWidget, Scrollbar=_StubWidget, Checkbutton=_StubWidget,
+                            Combobox=_StubEntry, Entry=_StubEntry, Treeview=_StubTreeview, Style=_StubStyle)
+_stub_font = SimpleNamespace(Font=_StubFont, nametofont=lambda name, root=None: _StubFont())
+# Dialogs never block a benchmark: information boxes return at once and questions are answered yes.
+_dialogs = SimpleNamespace(showinfo=_noop, showwarning=_noop, showerror=_noop, askyesno=lambda *a, **k: True,
+                           askokcancel=lambda *a, **k: True, askstring=lambda *a, **k: None,
+                           askopenfilename=lambda *a, **k: "", asksaveasfilename=lambda *a, **k: "")
+
+class TkHarness:
+    """Creates root windows for the apps: a real display, Xvfb, or the stand-in widgets."""
+
+    def __init__(self, mode="auto"):
+        self._xvfb = None
+        if mode == "auto":
+            mode = "display" if os.environ.get("DISPLAY") and self._display_works() else "xvfb" if shutil.which("Xvfb") else "stub"
+        if mode == "xvfb": self._start_xvfb()
+        self.mode = mode
+
+    @staticmethod
+    def _display_works():
+        try: tk.Tk().destroy(); return True
+        except tk.TclError: return False
+
+    def _start_xvfb(self):
+        display = f":{90 + os.getpid() % 100}"
+        self._xvfb = subprocess.Popen(["Xvfb", display, "-nolisten", "tcp", "-screen", "0", "1280x1024x24"],
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.environ["DISPLAY"] = display
+        for _ in range(50):
+            if self._display_works(): return
+            time.sleep(0.1)
+        self.close(); raise RuntimeError("Xvfb did not start")
+
+    def prepare(self, module):
+        """Points an app module's Tk names at the harness (always replacing its dialogs)."""
+        for name in ("messagebox", "simpledialog", "filedialog"):
+            if hasattr(module, name): setattr(module, name, _dialogs)
+        if self.mode == "stub":
+            for name, stub in (("tk", _stub_tk), ("ttk", _stub_ttk), ("tkfont", _stub_font)):
+                if hasattr(module, name): setattr(module, name, stub)
+        return module
+
+    def root(self, visible=False):
+        """A new root window, hidden unless `visible`.
+
+        Hidden windows are never exposed, so work the apps defer until their
+        first paint runs at the next settle() instead of after a timeout.
+        """
+        tkworkers.FIRST_PAINT_TIMEOUT_MS = _FIRST_PAINT_TIMEOUT_MS if visible else 0
+        root = _StubRoot() if self.mode == "stub" else tk.Tk()
+        if self.mode != "stub" and not visible: root.withdraw()
+        return root
+
+    def paint(self, root):
+        """Runs the event loop until `root` has been drawn once (stand-in roots have nothing to draw)."""
+        if self.mode == "stub": return
+        exposed = []; root.bind("<Expose>", exposed.append, add="+")
+        deadline = time.perf_counter() + 10
+        while not exposed and time.perf_counter() < deadline: root.update()
+
+    def settle(self, root):
+        """Lets pending callbacks and redraws run, so their cost lands in the timed section."""
+        if self.mode == "stub": root.run_pending()
+        else: root.update()
+
+    def close(self):
+        if self._xvfb: self._xvfb.terminate(); self._xvfb.wait(); self._xvfb = None
+
+# --- Measuring ---
+
+class Results:
+    """Metrics from one or more runs; a metric recorded again keeps its best value and widens its spread."""
+
+    def __init__(self): self.metrics = {}; self._values = {}
+
+    def add(self, name, value, unit, better="higher"):
+        values = self._values.setdefault(name, []); values.append(round(value, 4))
+        best, worst = (max(values), min(values)) if better == "higher" else (min(values), max(values))
+        slowdown = (best / worst if better == "higher" else worst / best) - 1 if best and worst else 0.0
+        self.metrics[name] = {"value": best, "unit": unit, "better": better, "spread": round(slowdown, 4)}
+        print(f"  {name:<52} {value:>14,.3f} {unit}", file=sys.stderr)
+
+    def rate(self, name, count, seconds, unit="ops/s"): self.add(name, count / max(seconds, 1e-9), unit)
+
+    def latency(self, name, samples):
+        """Records the median and 99th percentile of a list of seconds, in ms."""
+        ordered = sorted(samples)
+        self.add(name + ".p50_ms", statistics.median(ordered) * 1000, "ms", "lower")
+        self.add(name + ".p99_ms", ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))] * 1000, "ms", "lower")
+
+class WrongResult(Exception):
+    """A suite computed something other than what its workload should produce."""
+
+def check(ok, what):
+    if not ok: raise WrongResult(what)
+
+def timed(func, *args):
+    start = time.perf_counter(); value = func(*args); return value, time.perf_counter() - start
+
+def _size_label(n): return f"{n // 1_000_000}m" if n % 1_000_000 == 0 else f"{n // 1000}k" if n % 1000 == 0 else str(n)
+
+def synthetic_contacts(n, seed=1):
+    rng = random.Random(seed)
+    first = ["Ann", "Bob", "Carla", "Dan", "Eve", "Omar", "Li", "Sara", "Ivan", "Kim"]
+    streets = ["Elm", "Oak", "Pine", "Maple", "Cedar"]
+    for i in range(n):
+        yield {"name": f"{rng.choice(first)} Person{i}", "phone": f"({rng.randint(200, 999)}) 555-{i % 10000:04d}",
+               "email": f"user{i}@example.com", "address": f"{rng.randint(1, 999)} {rng.choice(streets)} St"}
+
+# --- Suites ---
+
+def bench_calculator(results, harness, sizes):
+    calc = load_app("Calculator.py")
+    rng = random.Random(2)
+    exprs = [f"{rng.randint(1, 999)}{rng.choice('+-*/')}{rng.randint(1, 999)}*{rng.randint(1, 99)}-{rng.randint(1, 9)}.5" for _ in range(50_000)]
+    calc.compile_expression.cache_clear()
+    values, seconds = timed(lambda: [calc.evaluate(e) for e in exprs])
+    results.rate("calculator.evaluate_unique", len(exprs), seconds, "evals/s")
+    cached, seconds = timed(lambda: [calc.evaluate(e) for e in exprs[:1000] * 50])
+    results.rate("calculator.evaluate_cached", 50_000, seconds, "evals/s")
+    check(cached == values[:1000] * 50, "calculator: cached evaluations differ from fresh ones")
+    batch = exprs * 4
+    batched, seconds = timed(calc.evaluate_batch, batch)
+    results.rate("calculator.evaluate_batch", len(batch), seconds, "evals/s")
+    check(batched == [(value, calc.ERR_OK) for value in values] * 4, "calculator: evaluate_batch() differs from evaluate()")
+    samples = []
+    for e in exprs[:2000]:
+        expr = calc.IncrementalExpression()
+        start = time.perf_counter()
+        for ch in e: expr.push(ch); expr.preview()
+        samples.append((time.perf_counter() - start) / len(e))
+        check(expr.value() == calc.evaluate(e), f"calculator: incremental value of {e!r} differs from evaluate()")
+    results.latency("calculator.keystroke_preview", samples)
+
+def bench_contacts(results, harness, sizes):
+    cb = harness.prepare(load_app("ContactBook.py"))
+    queries = ["person12", "an", "555-01", "elm st", "zzz"]
+    for n in sizes:
+        label = _size_label(n); contacts = list(synthetic_contacts(n))
+        mem = cb.MemoryContactRepository()
+        _, seconds = timed(mem.add_many, contacts)
+        results.rate(f"contacts.memory.{label}.add", n, seconds, "contacts/s")
+        results.latency(f"contacts.memory.{label}.search", [timed(mem.rows, q)[1] for q in queries * 3])
+        results.latency(f"contacts.memory.{label}.search_window", [timed(mem.index.search, q, cb.SEARCH_WINDOW)[1] for q in queries * 3])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "contacts.db")
+            repo = cb.ContactRepository(path); start = time.perf_counter()
+            for i in range(0, n, cb.IMPORT_BATCH_SIZE): repo.add_many(contacts[i:i + cb.IMPORT_BATCH_SIZE])
+            results.rate(f"contacts.sqlite.{label}.add", n, time.perf_counter() - start, "contacts/s")
+            repo.close()
+            root = harness.root()
+            start = time.perf_counter(); app = cb.ContactBookApp(root, path); harness.settle(root); seconds = time.perf_counter() - start
+            results.add(f"contacts.sqlite.{label}.startup_ms", seconds * 1000, "ms", "lower")
+            results.latency(f"contacts.sqlite.{label}.search", [timed(app.contacts.rows, q)[1] for q in queries * 3])
+            for q in queries: check(list(app.contacts.rows(q)) == list(mem.rows(q)), f"contacts.{label}: SQLite and memory search disagree on {q!r}")
+            samples = []
+            for top in range(0, min(n, 200 * 20), 20): # Scroll 200 screens down
+                start = time.perf_counter(); app.view.yview("scroll", 20, "units"); harness.settle(root); samples.append(time.perf_counter() - start)
+            results.latency(f"contacts.sqlite.{label}.scroll", samples)
+            app._on_close()
+
+        root = harness.root(); app = cb.ContactBookApp(root, ":memory:"); harness.settle(root); app.contacts.close(); app.contacts = mem
+        results.latency(f"contacts.app.{label}.refresh", [timed(lambda: (app._refresh_list(), harness.settle(root)))[1] for _ in range(5)])
+        samples = []
+        for q in queries:
+            app.search_entry.delete(0, tk.END); app.search_entry.insert(0, q)
+            samples.append(timed(lambda: (app._live_search(), app.workers.join(), harness.settle(root)))[1])
+        results.latency(f"contacts.app.{label}.live_search", samples)
+        app._on_close()
+
+def bench_todo(results, harness, sizes):
+    todo = harness.prepare(load_app("To-Do_app.py"))
+    for n in sizes:
+        label = _size_label(n)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = harness.root(); app = todo.TodoApp(root, data_dir=tmp); harness.settle(root); app.workers.join(); harness.settle(root)
+            for i in range(n): app.tasks.add(f"Imported task #{i % 1000}")
+            _, seconds = timed(lambda: (app._open_view(), harness.settle(root)))
+            results.add(f"todo.{label}.render_ms", seconds * 1000, "ms", "lower")
+            rng = random.Random(3); pages = -(-n // todo.PAGE_ROWS); samples = []
+            for _ in range(200):
+                app._show_page(rng.randrange(pages)); app.task_list.focus(rng.choice(app._page_ids))
+                samples.append(timed(lambda: (app._mark_task_complete(), harness.settle(root)))[1])
+            results.latency(f"todo.{label}.toggle", samples)
+            check(len(app.tasks) == n and app.view.state == "all" and len(app.view) == n, f"todo.{label}: tasks lost while toggling")
+            results.latency(f"todo.{label}.page_turn", [timed(lambda: (app._turn_page(1), harness.settle(root)))[1] for _ in range(50)])
+            _check_page(app, f"todo.{label} after turning pages")
+            # Filters, searches and sorts, in the order a user might try them; the first
+            # search and the first sort by description also build their index.
+            def set_view(name, value): setattr(app, name, value); app._open_view()
+            changes = [lambda: set_view("_filter", "ongoing"), lambda: set_view("_filter", "completed"), lambda: set_view("_filter", "all"),
+                       lambda: set_view("_query", "task #12"), lambda: set_view("_query", "#9"), lambda: set_view("_query", "zzz"),
+                       lambda: set_view("_query", ""), lambda: app._sort_by("description"), lambda: app._sort_by("description"),
+                       lambda: app._sort_by("status"), lambda: set_view("_filter", "ongoing")]
+            samples = []
+            for change in changes:
+                samples.append(timed(lambda: (change(), harness.settle(root)))[1]); _check_page(app, f"todo.{label} after a view change")
+            results.latency(f"todo.{label}.view_change", samples)
+            app._on_close()
+
+def _check_page(app, what):
+    check(list(app.task_list.get_children()) == [task_id for task_id, _, _ in app.view.page(app._page)], f"{what}: the list does not show the view's page")
+
+def bench_passwords(results, harness, sizes):
+    pw = load_app("Passwordgenerator.py")
+    _, seconds = timed(lambda: sum(1 for _ in pw.generate_passwords(200_000, 16)))
+    results.rate("passwords.generate", 200_000, seconds, "passwords/s")
+    policy = pw.PasswordPolicy(16)
+    _, seconds = timed(lambda: sum(1 for _ in policy.generate(200_000)))
+    results.rate("passwords.policy_generate", 200_000, seconds, "passwords/s")
+    check(all(len(p) == 16 and all(set(p) & set(chars) for chars in policy.required_sets) for p in policy.generate(1000)),
+          "passwords: a generated password breaks its policy")
+
+def bench_rps(results, harness, sizes):
+    rps = load_app("RPS_GAME.py")
+    tally, seconds = timed(rps.simulate, 10_000_000, 1)
+    results.rate("rps.simulate", 10_000_000, seconds, "rounds/s")
+    check(sum(tally) == 10_000_000 and all(abs(count - 10_000_000 / 3) < 50_000 for count in tally), f"rps: random play gave {tally}")
+    for name in ("frequency", "markov2", "ensemble"):
+        tally, seconds = timed(rps.play_match, rps.make_strategy(name, 1), rps.make_strategy("random", 2), 100_000)
+        results.rate(f"rps.match.{name}", 100_000, seconds, "rounds/s")
+        check(sum(tally) == 100_000, f"rps: a {name} match did not play every round")
+
+# --- Baselines ---
+
+def _import_seconds(filename):
+    """Imports an app in a fresh interpreter and returns how long the import took."""
+    code = ("import importlib.util, time\n"
+            "start = time.perf_counter()\n"
+            f"spec = importlib.util.spec_from_file_location('app', {os.path.join(HERE, filename)!r})\n"
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+            "print(time.perf_counter() - start)\n")
+    return float(subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, check=True).stdout)
+
+def bench_startup(results, harness, sizes):
+    """Cold import time of every app, then time to first paint and until fully ready for the Tk apps.
+
+    "Ready" means deferred panels are built and saved data is loaded and shown;
+    the contact book and to-do list start with STARTUP_ROWS saved items.
+    """
+    for name, filename in APP_FILES.items():
+        seconds = statistics.median(_import_seconds(filename) for _ in range(STARTUP_RUNS))
+        results.add(f"startup.{name}.import_ms", seconds * 1000, "ms", "lower")
+
+    calc, cb, pw, todo = (harness.prepare(load_app(APP_FILES[name])) for name in ("calculator", "contacts", "passwords", "todo"))
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "contacts.db"); repo = cb.ContactRepository(db_path)
+        for batch in cb._batched(synthetic_contacts(STARTUP_ROWS), cb.IMPORT_BATCH_SIZE): repo.add_many(batch)
+        repo.close()
+        todo_dir = os.path.join(tmp, "todo"); os.makedirs(todo_dir)
+        todo.TaskSnapshot.write(os.path.join(todo_dir, "tasks.snapshot"),
+                                ((todo._uuid_text(todo._new_uuid_bytes()), f"Imported task #{i % 1000}", i % 3 == 0) for i in range(STARTUP_ROWS)))
+
+        def calculator(root): app = calc.CalculatorApp(root); return app.workers, root.destroy
+        def contacts(root): app = cb.ContactBookApp(root, db_path); return app.workers, app._on_close
+        def passwords(root): pw.build_window(root); return pw.workers, root.destroy
+        def tasks(root): app = todo.TodoApp(root, data_dir=todo_dir); return app.workers, app._on_close
+
+        for name, build in (("calculator", calculator), ("contacts", contacts), ("passwords", passwords), ("todo", tasks)):
+            paint, ready = [], []
+            for _ in range(STARTUP_RUNS):
+                start = time.perf_counter(); root = harness.root(visible=True); workers, close = build(root)
+                harness.paint(root); paint.append(time.perf_counter() - start)
+                harness.settle(root); workers.join(); harness.settle(root); ready.append(time.perf_counter() - start)
+                close()
+            results.add(f"startup.{name}.first_paint_ms", statistics.median(paint) * 1000, "ms", "lower")
+            results.add(f"startup.{name}.ready_ms", statistics.median(ready) * 1000, "ms", "lower")
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Returns (name, baseline value, current value, change) for metrics that got worse by more than their allowance.
+
+    The allowance is `tolerance` plus the larger spread recorded for the metric
+    in either report; latencies that moved by less than MIN_DELTA_MS never count.
+    """
+    regressions = []
+    for name, metric in current["metrics"].items():
+        base = baseline["metrics"].get(name)
+        if not base or not base["value"] or not metric["value"]: continue
+        if metric["unit"] == "ms" and abs(metric["value"] - base["value"]) < MIN_DELTA_MS: continue
+        ratio = metric["value"] / base["value"] if metric["better"] == "higher" else base["value"] / metric["value"]
+        allowed = tolerance + max(base.get("spread", 0.0), metric.get("spread", 0.0))
+        if ratio * (1 + allowed) < 1: regressions.append((name, base["value"], metric["value"], ratio - 1))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the apps headlessly and compare with a baseline.")
+    parser.add_argument("--only", default=",".join(SUITES), help="comma-separated suites: " + ", ".join(SUITES))
+    parser.add_argument("--sizes", default=None, help="comma-separated list sizes for contacts/todo (default 10k,100k,1M)")
+    parser.add_argument("--quick", action="store_true", help="only the 10k size")
+    parser.add_argument("--tk", choices=("auto", "display", "xvfb", "stub"), default="auto", help="how GUI code runs")
+    parser.add_argument("--output", "-o", default="-", help="where to write the JSON results")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="allowed slowdown on top of a metric's spread (0.25 = 25%%)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs of each suite; every metric keeps its best")
+    args = parser.parse_args(argv)
+
+    suites = [s for s in args.only.split(",") if s]
+    unknown = set(suites) - set(SUITES)
+    if unknown: parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    if args.repeat < 1: parser.error("--repeat must be at least 1")
+    sizes = QUICK_SIZES if args.quick else tuple(int(s) for s in args.sizes.split(",")) if args.sizes else DEFAULT_SIZES
+
+    harness = TkHarness(args.tk); results = Results()
+    print(f"Tk mode: {harness.mode}", file=sys.stderr)
+    try:
+        for run in range(1, args.repeat + 1): _run_suites(suites, results, harness, sizes, f" run {run}/{args.repeat}" if args.repeat > 1 else "")
+        baseline = None
+        if not args.save_baseline and os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f: baseline = json.load(f)
+            if baseline["meta"].get("tk_mode") != harness.mode:
+                print(f"Baseline was recorded with Tk mode '{baseline['meta'].get('tk_mode')}'; skipping the comparison.", file=sys.stderr); baseline = None
+        runs = args.repeat
+        regressions = compare({"metrics": results.metrics}, baseline, args.tolerance) if baseline else []
+        while regressions and runs < MIN_GATE_RUNS: # Too few runs to tell a regression from noise: re-run the suites that regressed
+            runs += 1
+            again = [s for s in suites if any(name.startswith(s + ".") for name, *_ in regressions)]
+            _run_suites(again, results, harness, sizes, f" confirming {len(regressions)} regression(s), run {runs}/{MIN_GATE_RUNS}")
+            regressions = compare({"metrics": results.metrics}, baseline, args.tolerance)
+    except WrongResult as e:
+        print(f"WRONG RESULT {e}", file=sys.stderr); return 1
+    finally: harness.close()
+
+    report = {"meta": {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+                       "cpus": os.cpu_count(), "tk_mode": harness.mode, "sizes": list(sizes), "suites": suites, "repeat": args.repeat,
+                       "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+              "metrics": results.metrics}
+    text = json.dumps(report, indent=2)
+    if args.output == "-": print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f: f.write(text + "\n")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f: f.write(text + "\n")
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr); return 0
+    if baseline is None: return 0
+    for name, before, after, change in regressions:
+        print(f"REGRESSION {name}: {before:,.3f} -> {after:,.3f} ({change:+.0%})", file=sys.stderr)
+    print(f"{len(regressions)} regression(s) against {os.path.basename(args.baseline)}", file=sys.stderr)
+    return 1 if regressions else 0
+
+def _run_suites(suites, results, harness, sizes, note=""):
+    for suite in suites:
+        print(f"[{suite}]{note}", file=sys.stderr)
+        globals()["bench_" + suite](results, harness, sizes)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,20 @@
+"""The app scripts, imported as modules for the tests (To-Do_app.py is not a valid module name)."""
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT) # The apps import tkworkers from next to them
+
+def _load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+calculator = _load("calculator_app", "Calculator.py")
+contacts = _load("contact_book_app", "ContactBook.py")
+todo = _load("todo_app", "To-Do_app.py")
+rps = _load("rps_game", "RPS_GAME.py")
+passwords = _load("password_generator", "Passwordgenerator.py")
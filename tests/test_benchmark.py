@@ -0,0 +1,30 @@
+import apps # Puts the repository on sys.path
+import benchmark
+
+
+def _report(**metrics):
+    return {"metrics": {name: {"value": value, "unit": unit, "better": better, "spread": spread}
+                        for name, (value, unit, better, spread) in metrics.items()}}
+
+
+def test_results_keep_the_best_value_and_its_spread():
+    results = benchmark.Results()
+    for value in (200.0, 400.0, 300.0): results.add("rate", value, "ops/s")
+    for value in (2.0, 1.0, 3.0): results.add("latency", value, "ms", "lower")
+    assert results.metrics["rate"]["value"] == 400.0 and results.metrics["rate"]["spread"] == 1.0
+    assert results.metrics["latency"]["value"] == 1.0 and results.metrics["latency"]["spread"] == 2.0
+
+
+def test_compare_allows_each_metric_its_own_noise():
+    baseline = _report(steady=(100.0, "ops/s", "higher", 0.0), noisy=(100.0, "ops/s", "higher", 1.0), tiny=(0.01, "ms", "lower", 0.0))
+    current = _report(steady=(70.0, "ops/s", "higher", 0.0), noisy=(70.0, "ops/s", "higher", 0.0), tiny=(0.04, "ms", "lower", 0.0))
+    assert [name for name, *_ in benchmark.compare(current, baseline, 0.25)] == ["steady"]
+    assert benchmark.compare(_report(steady=(81.0, "ops/s", "higher", 0.0)), baseline, 0.25) == []
+
+
+def test_a_wrong_result_fails_the_run(monkeypatch, tmp_path, capsys):
+    def bench_rps(results, harness, sizes):
+        results.add("rps.simulate", 1.0, "rounds/s"); benchmark.check(False, "rps: random play gave Tally(wins=0, losses=0, ties=0)")
+    monkeypatch.setattr(benchmark, "bench_rps", bench_rps)
+    assert benchmark.main(["--only", "rps", "--tk", "stub", "--repeat", "1", "--save-baseline", "--baseline", str(tmp_path / "b.json"), "-o", str(tmp_path / "r.json")]) == 1
+    assert "WRONG RESULT rps: random play" in capsys.readouterr().err and not (tmp_path / "b.json").exists()
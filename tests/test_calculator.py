@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from apps import calculator as C
+
+
+def _scalar(expressions):
+    return [C._evaluate_row(expression) for expression in expressions]
+
+
+def test_batch_rows_with_a_stray_slot_character_fall_back_to_the_scalar_path():
+    pytest.importorskip("numpy")
+    rows = ['14-278.7'] * 40 + ['5-.', '5-#', '.', '#'] * 10 + ['1+#'] * 40
+    assert C.evaluate_batch(rows) == _scalar(rows)
+    assert C.evaluate_batch(['14-278.7'] * 40 + ['5-.'])[-1] == (None, C.ERR_SYNTAX)
+
+
+def test_batch_matches_scalar_on_fuzzed_shapes():
+    pytest.importorskip("numpy")
+    rng = random.Random(7)
+    pieces = ['1', '23', '4.5', '.5', '6.', '0', '.', '#', '+', '-', '*', '/', ' ', '999999999999999999']
+    shapes = [''.join(rng.choice(pieces) for _ in range(rng.randint(1, 6))) for _ in range(300)]
+    rows = [shape for shape in shapes for _ in range(C.VECTORIZE_MIN_ROWS)]
+    assert C.evaluate_batch(rows) == _scalar(rows)
+
+
+def test_evaluate_file_reports_every_line():
+    lines = ["1+2\n", "5-.\n", "1/0\n", "2*3.5\n"]
+    assert [(value, error) for _, value, error in C.evaluate_file(lines)] == [
+        (3, C.ERR_OK), (None, C.ERR_SYNTAX), (None, C.ERR_ZERO_DIVISION), (7.0, C.ERR_OK)]
+
+
+def _random_expression(rng, terms):
+    numbers = ['0', '7', '12', '3.5', '.25', '6.', '1000000007', str(10 ** 30)]
+    parts = []
+    for i in range(terms):
+        if i: parts.append(rng.choice(C.OPERATORS))
+        parts.append(rng.choice(['', '', '-', '- ', '+']) + rng.choice(numbers))
+    return ' '.join(parts) if rng.random() < 0.3 else ''.join(parts)
+
+
+def _reference(expression):
+    """What Python itself makes of the expression: the behaviour the engine replaced eval() with."""
+    try: return eval(expression, {"__builtins__": {}})
+    except ZeroDivisionError: return ZeroDivisionError
+
+
+def _engine(expression):
+    try: return C.evaluate(expression)
+    except ZeroDivisionError: return ZeroDivisionError
+
+
+def test_evaluate_matches_python_arithmetic():
+    rng = random.Random(3)
+    for _ in range(3000):
+        expression = _random_expression(rng, rng.randint(1, 8))
+        expected, result = _reference(expression), _engine(expression)
+        assert result == expected and type(result) is type(expected), expression
+
+
+@pytest.mark.parametrize("expression, error", [
+    ("", SyntaxError), ("1+", SyntaxError), ("*2", SyntaxError), ("2**3", SyntaxError), ("1 2", SyntaxError), ("1..2", SyntaxError),
+    ("(1+2)", SyntaxError), ("2^3", SyntaxError), ("1/0", ZeroDivisionError), ("5/(0)", SyntaxError), ("1/0.0", ZeroDivisionError),
+    ("9" * (C.MAX_OPERAND_DIGITS + 1), OverflowError), ("1+" * C.MAX_EXPRESSION_LENGTH + "1", OverflowError),
+    ("*".join(["99999999999999999999"] * 80), OverflowError), ("1" + "0" * 300 + ".0*1" + "0" * 300, OverflowError),
+])
+def test_evaluate_rejects_what_it_cannot_compute(expression, error):
+    with pytest.raises(error):
+        C.evaluate(expression)
+
+
+def test_deep_chains_compile_without_recursion():
+    assert C.evaluate("-" * 3001 + "2") == -2
+    assert C.evaluate("+".join(["1"] * 2000)) == 2000
+
+
+def test_repeated_expressions_reuse_the_compiled_program():
+    C.compile_expression.cache_clear()
+    assert C.evaluate("12*3+4") == C.evaluate("12*3+4") == 40
+    info = C.compile_expression.cache_info()
+    assert (info.hits, info.misses) == (1, 1)
+    assert C.compile_expression("12*3+4") is C.compile_expression("12*3+4")
+
+
+def _outcome(compute):
+    try: return compute()
+    except (SyntaxError, ZeroDivisionError, OverflowError) as exc: return type(exc)
+
+
+def _preview(text):
+    """What preview() should show: the text without its trailing operators, if it could still be completed."""
+    if _outcome(lambda: C.evaluate(text + "1")) is SyntaxError:
+        return None
+    value = _outcome(lambda: C.evaluate(text.rstrip(C.OPERATORS)))
+    return None if isinstance(value, type) else value
+
+
+def test_incremental_expression_agrees_with_evaluate_as_it_is_typed():
+    rng = random.Random(9)
+    keys = list('0123456789') + ['.', '.', '+', '-', '*', '/', '/', '0', '9' * 30]
+    for _ in range(400):
+        expression, typed = C.IncrementalExpression(), ""
+        for _ in range(rng.randint(1, 30)):
+            if typed and rng.random() < 0.2:
+                assert expression.pop() == typed[-1]; typed = typed[:-1]
+            else:
+                key = rng.choice(keys); expression.extend(key); typed += key
+            assert str(expression) == typed and len(expression) == len(typed)
+            value, expected = _outcome(expression.value), _outcome(lambda: C.evaluate(typed))
+            assert value == expected and type(value) is type(expected), typed
+            assert expression.preview() == _preview(typed), typed
+
+
+def test_incremental_expression_keeps_syntax_errors_ahead_of_arithmetic_ones():
+    assert _outcome(C.IncrementalExpression("1/0+").value) is SyntaxError
+    assert _outcome(C.IncrementalExpression("1/0+2").value) is ZeroDivisionError
+    assert _outcome(C.IncrementalExpression("1/0+2a").value) is SyntaxError
+
+
+def test_incremental_expression_edits():
+    expression = C.IncrementalExpression(" 12 + 3 ")
+    assert str(expression) == "12+3" and expression.last_char == "3" and expression.value() == 15
+    expression.push("*"); assert expression.preview() == 15
+    assert expression.pop() == "*" and expression.pop() == "3" and expression.preview() == 12
+    expression.clear()
+    assert str(expression) == "" and expression.pop() == "" and expression.last_char == "" and expression.preview() is None
@@ -0,0 +1,157 @@
+import queue
+import random
+import sqlite3
+import threading
+
+import pytest
+
+from apps import contacts as CB
+
+
+def _contact(name, phone="555 0100", email="", address=""):
+    return {"name": name, "phone": phone, "email": email, "address": address}
+
+
+def test_contact_count_survives_reopening(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    repo = CB.ContactRepository(path)
+    ids = repo.add_many([_contact(f"Person {i}") for i in range(5)])
+    repo.close()
+    for _ in range(3):
+        repo = CB.ContactRepository(path); repo.close()
+    repo = CB.ContactRepository(path)
+    try:
+        assert repo._db.execute("SELECT n FROM contact_count").fetchall() == [(5,)]
+        repo.delete(ids[0]); repo.add(_contact("Late Comer"))
+        assert len(repo) == 5 and len(repo.rows()) == 5
+    finally: repo.close()
+
+
+def test_reopening_repairs_a_count_table_with_extra_rows(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    repo = CB.ContactRepository(path); repo.add_many([_contact("Ann Lee"), _contact("Bob Ray")]); repo.close()
+    with sqlite3.connect(path) as db: db.executemany("INSERT INTO contact_count VALUES (?)", [(0,), (0,)])
+    repo = CB.ContactRepository(path)
+    try: assert repo._db.execute("SELECT n FROM contact_count").fetchall() == [(2,)]
+    finally: repo.close()
+
+
+_PEOPLE = [("Éva Núñez", "+36 1 555 0101", "eva@example.hu", "Fő utca 1"), ("Eve Nunez", "(555) 010-2020", "eve@example.com", "1 Elm St"),
+           ("Zoë Brontë", "555 0303", "zoe@example.co.uk", "Haworth"), ("Zoe Bronte", "555-0404", "", "Leeds"),
+           ("José Álvarez", "555 0505", "jose@example.es", "Calle Mayor 5"), ("Jose Alvarez", "555 0606", "ja@example.com", "Évora"),
+           ("Ann Lee", "555 0707", "ann.lee@example.com", "7 Oak Ave"), ("Anne Leé", "0708", "", "")]
+
+
+def _both_backends(tmp_path, people=_PEOPLE):
+    memory, saved = CB.MemoryContactRepository(), CB.ContactRepository(str(tmp_path / "contacts.db"))
+    for name, phone, email, address in people:
+        data = _contact(name, phone, email, address); memory.add(data); saved.add(data)
+    return memory, saved
+
+
+def test_sqlite_and_memory_search_agree_on_accents(tmp_path):
+    memory, saved = _both_backends(tmp_path)
+    try:
+        for q in ["é", "e", "ev", "év", "zo", "zoë", "jos", "álv", "a", "an", "lee", "leé", "555", "0707", "ô"]:
+            assert list(saved.rows(q)) == list(memory.rows(q)), q
+    finally: saved.close()
+
+
+def test_reopening_retokenizes_an_accent_folding_word_table(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    repo = CB.ContactRepository(path); repo.add(_contact("Éva Núñez")); repo.close()
+    with sqlite3.connect(path) as db:
+        db.execute("DROP TABLE contacts_words")
+        db.execute("CREATE VIRTUAL TABLE contacts_words USING fts5(name, phone, email, address, content='contacts', content_rowid='id', prefix='1 2')")
+        db.execute("INSERT INTO contacts_words(contacts_words) VALUES ('rebuild')")
+    repo = CB.ContactRepository(path)
+    try: assert list(repo.rows("ev")) == [] and list(repo.rows("év")) == [1]
+    finally: repo.close()
+
+
+def _brute_force(contacts, query):
+    """Ranked matches worked out the slow, obvious way: the behaviour ContactSearchIndex indexes."""
+    q = query.strip().lower()
+    digits = "".join(ch for ch in q if ch.isdigit()) if q.strip("0123456789+-(). ") == "" else ""
+    digits = digits if len(digits) >= 3 else ""
+    found = []
+    for cid, c in contacts.items():
+        name, phone, email, address = (c[f].lower() for f in CB.SEARCH_FIELDS)
+        phone_digits = "".join(ch for ch in c["phone"] if ch.isdigit())
+        if len(q) >= 3: hit = any(q in field for field in (name, phone, email, address)) or bool(digits and digits in phone_digits)
+        else: hit = any(word.startswith(q) for word in CB._WORD_RE.findall("\n".join((name, phone, email, address, phone_digits))))
+        if not hit: continue
+        score = (0 if name == q else 1) if name.startswith(q) else 2 if q in name else 3 if q in phone or (digits and digits in phone_digits) else 4 if q in email else 5
+        found.append((score, name, cid))
+    return [cid for *_, cid in sorted(found)]
+
+
+def test_search_matches_brute_force_filtering():
+    rng = random.Random(5)
+    first, last = ["Ann", "Anna", "Bob", "Éva", "Jo", "Joan", "Li", "Omar", "5th"], ["Lee", "Leeds", "Ray", "Smith", "Núñez", "O'Hara"]
+    index, contacts = CB.ContactSearchIndex(), {}
+    for cid in range(1, 3001):
+        c = contacts[cid] = {"name": f"{rng.choice(first)} {rng.choice(last)}", "phone": f"({rng.randint(200, 999)}) 55{rng.randint(0, 9)}-{rng.randint(0, 9999):04d}",
+                             "email": f"{rng.choice(first).lower()}{cid}@mail{rng.randint(1, 3)}.com", "address": f"{rng.randint(1, 99)} {rng.choice(last)} St"}
+        index.add(cid, c)
+    for cid in rng.sample(sorted(contacts), 300): index.remove(cid); del contacts[cid]
+    for cid in rng.sample(sorted(contacts), 300):
+        contacts[cid] = {**contacts[cid], "name": rng.choice(first) + " " + rng.choice(last)}; index.update(cid, contacts[cid])
+    queries = ["a", "an", "ann", "5", "55", "(55", "555", "(55) 5", "2", "23", "234", "lee", "o'", "éva", "mail2", "st", "x", "zzz", " Jo ", "-0"]
+    for q in queries:
+        expected = _brute_force(contacts, q)
+        assert index.search(q) == expected, q
+        assert index.count(q) == len(expected), q
+        for limit in (1, 10, CB.SEARCH_WINDOW): assert index.search(q, limit) == expected[:limit], (q, limit)
+        rows = CB.SearchRows(index, q, threading.Lock())
+        assert len(rows) == len(expected) and list(rows) == expected, q
+        assert all(cid in rows for cid in expected) and sum(cid in rows for cid in contacts) == len(expected), q
+
+
+def _failing(exc):
+    yield 1, _contact("Ann Lee")
+    raise exc
+
+
+def _adding_then(exc):
+    def add_batches(batches):
+        for batch in batches: yield list(range(len(batch)))
+        raise exc
+    return add_batches
+
+
+@pytest.mark.parametrize("run", [
+    lambda q, tmp: CB.ContactBookApp._dedupe_worker(q, _failing(sqlite3.DatabaseError("disk image is malformed"))),
+    lambda q, tmp: CB.ContactBookApp._export_worker(q, str(tmp / "out.csv"), (c for _, c in _failing(RuntimeError("boom"))), 2),
+    lambda q, tmp: CB.ContactBookApp._import_worker(q, str(tmp / "in.csv"), _adding_then(LookupError("unknown encoding"))),
+])
+def test_io_workers_report_any_error(tmp_path, run):
+    (tmp_path / "in.csv").write_text("name,phone\nAnn,555\n", encoding="utf-8")
+    q = queue.Queue()
+    run(q, tmp_path)
+    messages = [q.get_nowait() for _ in range(q.qsize())]
+    assert messages[-1][0] == "error" and "'pct'" not in messages[-1][1]
+
+
+def test_find_duplicates_compares_each_contact_with_a_full_window(monkeypatch):
+    compared = set(); score = CB.duplicate_score
+    def recording(a, b, threshold=0.0):
+        compared.add((a[2], b[2])); return score(a, b, threshold)
+    monkeypatch.setattr(CB, "duplicate_score", recording)
+    names = [f"Person {chr(97 + i)}" for i in range(CB.DEDUPE_WINDOW + 2)] # In name order
+    CB.find_duplicates([(i, _contact(name, "555 123 4567")) for i, name in enumerate(names)])
+    first, last, beyond = (CB.normalize_name(names[i]) for i in (0, CB.DEDUPE_WINDOW, CB.DEDUPE_WINDOW + 1))
+    assert (first, last) in compared and (first, beyond) not in compared
+
+
+def test_find_duplicates_groups_short_numbers_with_the_same_name():
+    items = [(1, _contact("Ann Lee", "123")), (2, _contact("Lee, Ann", "1-2-3")), (3, _contact("Bob Ray", "123")), (4, _contact("Ann Lee", "124"))]
+    assert CB.find_duplicates(items) == [[1, 2]]
+
+
+def test_find_duplicates_keeps_people_sharing_a_phone_apart():
+    items = [(1, _contact("Jane Smith", "555-123-4567")), (2, _contact("John Smith", "(555) 123 4567")), (3, _contact("J. Smith", "5551234567")),
+             (4, _contact("Smith, John", "555 123 4567", "js@x.com")), (5, _contact("Jon Smith", "555.123.4567"))]
+    groups = CB.find_duplicates(items)
+    assert not any({1, 2} <= set(group) for group in groups)
+    assert [2, 4, 5] in groups
@@ -0,0 +1,58 @@
+from collections import Counter
+
+import pytest
+
+from apps import passwords as P
+
+
+def _compliant(policy, password):
+    return (len(password) == policy.length and set(password) <= set(policy.alphabet)
+            and all(set(password) & set(chars) for chars in policy.required_sets))
+
+
+@pytest.mark.parametrize("policy", [
+    P.PasswordPolicy(), P.PasswordPolicy(length=4), P.PasswordPolicy(length=300, exclude_ambiguous=True),
+    P.PasswordPolicy(length=6, classes=("lower", "digits"), required=("digits",)), P.PasswordPolicy(length=5, alphabet="abc123", required=("digits",)),
+])
+def test_every_generated_password_meets_its_policy(policy):
+    generated = list(policy.generate(2000 if policy.length < 100 else 200))
+    assert len(generated) == (2000 if policy.length < 100 else 200)
+    assert all(_compliant(policy, password) for password in generated)
+
+
+def test_excluded_characters_never_appear():
+    policy = P.PasswordPolicy(length=64, exclude_ambiguous=True)
+    assert not set("".join(policy.generate(500))) & set(P.AMBIGUOUS_CHARACTERS)
+
+
+@pytest.mark.parametrize("alphabet", ["abcdefg", P.DEFAULT_ALPHABET])
+def test_characters_are_equally_likely(alphabet):
+    counts = Counter(P.random_characters(10000 * len(alphabet), alphabet))
+    assert set(counts) == set(alphabet) and max(counts.values()) < 1.15 * min(counts.values())
+
+
+def test_required_characters_land_anywhere():
+    policy = P.PasswordPolicy(length=8, classes=("lower", "digits"), required=("digits",))
+    positions = Counter(i for password in policy.generate(20000) for i, ch in enumerate(password) if ch.isdigit())
+    assert sorted(positions) == list(range(8)) and max(positions.values()) < 1.15 * min(positions.values())
+
+
+def test_bulk_generation_yields_exactly_count_passwords():
+    assert [len(p) for p in P.generate_passwords(3, 7, "xy")] == [7, 7, 7]
+    assert len(list(P.generate_passwords(P.RANDOM_CHUNK_SIZE // 10 + 3, 10))) == P.RANDOM_CHUNK_SIZE // 10 + 3
+    assert list(P.generate_passwords(0, 5)) == []
+
+
+def test_parallel_generation_keeps_count_and_policy():
+    policy = P.PasswordPolicy(length=10)
+    generated = list(P.generate_passwords_parallel(policy, 25, workers=2, chunk_size=10))
+    assert len(generated) == 25 and all(_compliant(policy, password) for password in generated)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"classes": ("lower", "emoji")}, {"length": 3}, {"length": 0, "classes": ()}, {"alphabet": ""}, {"alphabet": "abc", "required": ("digits",)},
+    {"alphabet": "é"}, {"length": 8, "min_entropy": 128},
+])
+def test_impossible_policies_are_rejected(kwargs):
+    with pytest.raises(ValueError):
+        P.PasswordPolicy(**kwargs)
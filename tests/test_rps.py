@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from apps import rps
+
+
+def test_ring_buffer_evicts_in_push_order():
+    ring = rps.RingBuffer(3)
+    assert [ring.push(v) for v in range(6)] == [None, None, None, 0, 1, 2]
+    single = rps.RingBuffer(1)
+    assert [single.push(v) for v in (7, 8, 9)] == [None, 7, 8]
+
+
+@pytest.mark.parametrize("capacity", [0, -1])
+def test_ring_buffer_needs_room_for_one_value(capacity):
+    with pytest.raises(ValueError):
+        rps.RingBuffer(capacity)
+
+
+def test_counting_strategy_counts_only_its_window():
+    rng = random.Random(4)
+    strategy = rps.MarkovStrategy(2, window=50, rng=rng)
+    moves = [rng.randrange(3) for _ in range(500)]
+    for move in moves:
+        strategy.observe(move, strategy.choose())
+    expected = [0] * len(strategy.counts)
+    for i in range(len(moves) - 50, len(moves)): # The context before each move is the two moves played before it
+        context = (moves[i - 2] * 3 + moves[i - 1]) % strategy.contexts
+        expected[context * 3 + moves[i]] += 1
+    assert list(strategy.counts) == expected
+
+
+def test_markov_strategy_beats_a_cycle():
+    strategy = rps.make_strategy("markov1", seed=1)
+    cycle = [rps.ROCK, rps.PAPER, rps.SCISSORS] * 200
+    tally = rps.score_moves(list(_play(strategy, cycle)), cycle)
+    assert tally.wins > 0.9 * len(cycle)
+
+
+def _play(strategy, their_moves):
+    for move in their_moves:
+        mine = strategy.choose(); strategy.observe(move, mine); yield mine
+
+
+def test_score_moves_agrees_with_the_outcome_table():
+    rng = random.Random(2)
+    user, computer = [rng.randrange(3) for _ in range(1000)], [rng.randrange(3) for _ in range(1000)]
+    tally = rps.score_moves(user, computer)
+    outcomes = [rps.OUTCOMES[u][c] for u, c in zip(user, computer)]
+    assert (tally.wins, tally.losses, tally.ties) == (outcomes.count(rps.WIN), outcomes.count(rps.LOSE), outcomes.count(rps.TIE))
+
+
+def test_load_report_without_latencies():
+    assert rps.load_report([], 1.5) == "0 rounds in 1.50s: no latencies recorded"
+    assert rps.load_report([], 0.0).startswith("0 rounds")
+
+
+def test_load_report_percentiles():
+    report = rps.load_report([i / 1000 for i in range(1, 101)], 2.0)
+    assert report.startswith("100 rounds in 2.00s: 50 rounds/s") and "p50 51.00 ms" in report and "max 100.00 ms" in report
@@ -0,0 +1,43 @@
+import time
+
+import apps # Puts the repository on sys.path
+import tkworkers
+
+
+class _Widget:
+    """Enough of a Tk widget for a TkExecutor that is only ever join()ed."""
+    def after(self, ms, func, *args): return "after#1"
+    def after_cancel(self, job): pass
+
+
+def test_profiling_requested_takes_the_flag_out_of_argv(monkeypatch):
+    monkeypatch.delenv(tkworkers.PROFILE_ENV_VAR, raising=False)
+    argv = ["app.py", "--profile", "--db", "x.db"]
+    assert tkworkers.profiling_requested(argv) and argv == ["app.py", "--db", "x.db"]
+    assert not tkworkers.profiling_requested(argv)
+    for value, expected in (("1", True), ("trace.json", True), ("off", False), ("0", False)):
+        monkeypatch.setenv(tkworkers.PROFILE_ENV_VAR, value)
+        assert tkworkers.profiling_requested(["app.py"]) is expected
+
+
+def test_join_delivers_work_submitted_by_callbacks():
+    executor = tkworkers.TkExecutor(_Widget())
+    delivered = []
+    def chain(n):
+        delivered.append(n)
+        if n < 5: executor.submit(f"step{n}", time.sleep, 0.001, on_done=lambda _: chain(n + 1))
+    try:
+        for _ in range(50):
+            delivered.clear(); chain(0); executor.join()
+            assert delivered == [0, 1, 2, 3, 4, 5]
+    finally: executor.shutdown()
+
+
+def test_superseded_requests_are_never_delivered():
+    executor = tkworkers.TkExecutor(_Widget())
+    delivered = []
+    try:
+        for q in ("j", "jo", "joh", "john"): executor.submit("search", str.upper, q, on_done=delivered.append)
+        executor.join()
+        assert delivered == ["JOHN"] and not executor.busy("search")
+    finally: executor.shutdown()
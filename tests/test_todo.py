@@ -0,0 +1,249 @@
+import os
+import random
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+import apps # Puts the repository on sys.path
+import benchmark
+
+todo = benchmark.load_app("To-Do_app.py") # Pointed at the benchmark's stand-in Tk widgets below
+
+
+@pytest.fixture
+def app(tmp_path):
+    """A loaded, empty TodoApp on the stand-in widgets."""
+    harness = benchmark.TkHarness("stub"); harness.prepare(todo)
+    root = harness.root()
+    app = todo.TodoApp(root, data_dir=str(tmp_path))
+    harness.settle(root); app.workers.join(); harness.settle(root)
+    yield app
+    app.workers.shutdown()
+
+
+def _shown(app):
+    return [(task_id, tuple(app.task_list.item(task_id, "values"))) for task_id in app.task_list.get_children()]
+
+
+def _expected(app):
+    return [(task_id, app._row_values(description, completed)) for task_id, description, completed in app.view.page(app._page)]
+
+
+def _count_row_changes(app):
+    calls = {"insert": 0, "delete": 0, "move": 0}
+    for name in calls:
+        def counted(*args, _method=getattr(app.task_list, name), _name=name, **kw):
+            calls[_name] += 1
+            return _method(*args, **kw)
+        setattr(app.task_list, name, counted)
+    return calls
+
+
+def _add(app, description):
+    app.task_input.insert(0, description)
+    app._add_task()
+
+
+def test_adding_and_deleting_touch_only_the_rows_that_change(app):
+    for i in range(todo.PAGE_ROWS + 50):
+        app.tasks.add(f"Task {i}")
+    app._open_view()
+    calls = _count_row_changes(app)
+    app.task_list.focus(app._page_ids[0])
+    app._delete_task() # The rest move up one, and one row comes back from page 2.
+    assert calls == {"insert": 1, "delete": 1, "move": 0}
+    assert _shown(app) == _expected(app)
+    app._sort_by("description"); app._sort_by("description") # Descending, so a new "ZZZ" task lands on page 1.
+    calls = _count_row_changes(app)
+    _add(app, "ZZZ newest")
+    assert calls == {"insert": 1, "delete": 1, "move": 0}
+    assert _shown(app) == _expected(app)
+
+
+def test_the_shown_page_always_matches_its_view(app, monkeypatch):
+    rng = random.Random(11)
+    for i in range(450):
+        app.tasks.add(f"{rng.choice('abcde')} task {i}")
+    app._open_view()
+    for step in range(600):
+        action = rng.random()
+        if action < 0.03:
+            app.filter_var.set(rng.choice(list(todo.VIEW_FILTERS))); app._filter_changed()
+        elif action < 0.06:
+            app._sort_by(rng.choice(["added", "status", "description"]))
+        elif action < 0.1:
+            app._turn_page(rng.choice([-1, 1, 2]))
+        elif action < 0.3:
+            _add(app, f"{rng.choice('abcde')} new {step}")
+        elif app._page_ids:
+            app.task_list.focus(rng.choice(app._page_ids))
+            if action < 0.5:
+                app._delete_task()
+            elif action < 0.65:
+                monkeypatch.setattr(todo, "simpledialog", SimpleNamespace(askstring=lambda *a, **k: f"{rng.choice('abcde')} edited {step}"))
+                app._edit_task()
+            else:
+                app._mark_task_complete()
+        assert _shown(app) == _expected(app), step
+
+
+def _task_id(n):
+    return todo._uuid_text(n.to_bytes(16, "big"))
+
+
+def _apply(tasks, storage, op, task_id, **fields):
+    """Journals one change and makes it to `tasks`, a dict of id -> (description, completed) in display order."""
+    storage.append(op, task_id, **fields)
+    if op == "delete":
+        del tasks[task_id]
+    else:
+        description, completed = tasks.get(task_id, ("", False))
+        tasks[task_id] = (fields.get("description", description), fields.get("completed", completed))
+
+
+def _random_changes(rng, tasks, storage, count, first_id=1):
+    next_id = first_id
+    for _ in range(count):
+        if not tasks or rng.random() < 0.4:
+            _apply(tasks, storage, "add", _task_id(next_id), description=rng.choice(["milk", "Eggs ☕", "call\0mum", ""]) + str(next_id), completed=rng.random() < 0.3)
+            next_id += 1
+        else:
+            task_id = rng.choice(list(tasks))
+            op = rng.choice(["edit", "toggle", "delete"])
+            fields = {"edit": {"description": f"edited {rng.random()}"}, "toggle": {"completed": rng.random() < 0.5}, "delete": {}}[op]
+            _apply(tasks, storage, op, task_id, **fields)
+    return next_id
+
+
+def _store(tasks):
+    store = todo.TaskStore()
+    for task_id, (description, completed) in tasks.items(): store.add(description, task_id, completed)
+    return store
+
+
+def _loaded(directory):
+    storage = todo.TaskStorage(str(directory))
+    try: return [(task_id, (description, completed)) for task_id, description, completed in storage.load()]
+    finally: storage.close()
+
+
+def test_snapshot_plus_journal_replay_restores_every_change(tmp_path):
+    rng = random.Random(8)
+    storage, tasks = todo.TaskStorage(str(tmp_path), fsync="never"), {}
+    storage.load()
+    next_id = _random_changes(rng, tasks, storage, 500)
+    storage.compact(_store(tasks))
+    _random_changes(rng, tasks, storage, 500, next_id)
+    storage.close()
+    assert _loaded(tmp_path) == list(tasks.items())
+    reopened = todo.TaskStorage(str(tmp_path)); store = reopened.load(); reopened.compact(store); reopened.close()
+    assert os.path.getsize(reopened.journal_path) == 0 and _loaded(tmp_path) == list(tasks.items())
+
+
+def test_replaying_a_journal_over_the_snapshot_it_was_folded_into_changes_nothing(tmp_path):
+    storage, tasks = todo.TaskStorage(str(tmp_path), fsync="never"), {}
+    _random_changes(random.Random(1), tasks, storage, 300)
+    storage.close()
+    todo.TaskSnapshot.write(storage.snapshot_path, [(task_id, *task) for task_id, task in tasks.items()]) # A crash before the journal was emptied.
+    assert _loaded(tmp_path) == list(tasks.items())
+
+
+def test_a_torn_last_line_is_cut_off_and_the_journal_carries_on(tmp_path):
+    storage = todo.TaskStorage(str(tmp_path), fsync="never")
+    storage.append("add", _task_id(1), description="kept", completed=False); storage.close()
+    with open(storage.journal_path, "ab") as f: f.write(b'{"op": "add", "id": "')
+    storage = todo.TaskStorage(str(tmp_path))
+    assert [d for _, d, _ in storage.load()] == ["kept"] and storage.journal_ops == 1
+    storage.append("add", _task_id(2), description="after", completed=True); storage.close()
+    assert [task for _, task in _loaded(tmp_path)] == [("kept", False), ("after", True)]
+
+
+@pytest.mark.parametrize("line", [b'{"op": "rename", "id": "x"}\n', b'["add"]\n', b'{"op": "add", "id": "%s"}\n', b'{"op": "toggle", "id": "%s", "completed": 1}\n'])
+def test_a_bad_complete_entry_is_an_error_not_a_crash_tail(tmp_path, line):
+    storage = todo.TaskStorage(str(tmp_path))
+    storage.append("add", _task_id(1), description="a", completed=False); storage.close()
+    with open(storage.journal_path, "ab") as f: f.write(line.replace(b"%s", _task_id(1).encode()) + b'{"op": "delete", "id": "%s"}\n' % _task_id(1).encode())
+    size = os.path.getsize(storage.journal_path)
+    with pytest.raises(ValueError, match="line 2"):
+        todo.TaskStorage(str(tmp_path)).load()
+    assert os.path.getsize(storage.journal_path) == size
+
+
+def test_older_snapshots_are_still_read(tmp_path):
+    tasks = [(_task_id(1), "first", False), (_task_id(2), "zweite Aufgabe ✓", True), (_task_id(3), "", False)]
+    records = [todo.TaskSnapshot._V1_RECORD.pack(todo._uuid_bytes(i), done, len(d.encode())) + d.encode() for i, d, done in tasks]
+    offsets, pos = [], todo.TaskSnapshot._HEADER.size + 8 * len(tasks)
+    for record in records: offsets.append(pos); pos += len(record)
+    with open(tmp_path / "tasks.snapshot", "wb") as f:
+        f.write(todo.TaskSnapshot._HEADER.pack(b"TODOSNP1", len(tasks)) + struct.pack(f"<{len(tasks)}Q", *offsets) + b"".join(records))
+    assert _loaded(tmp_path) == [(i, (d, done)) for i, d, done in tasks]
+
+
+@pytest.mark.parametrize("cut", [4, 30, -1])
+def test_damaged_snapshots_raise_value_error(tmp_path, cut):
+    path = str(tmp_path / "tasks.snapshot")
+    todo.TaskSnapshot.write(path, [(_task_id(1), "a task", False), (_task_id(2), "another", True)])
+    with open(path, "r+b") as f: f.truncate(os.path.getsize(path) + cut if cut < 0 else cut)
+    with pytest.raises(ValueError):
+        _loaded(tmp_path)
+
+
+def test_set_aside_keeps_the_files_out_of_the_way(tmp_path):
+    storage = todo.TaskStorage(str(tmp_path))
+    storage.append("add", _task_id(1), description="a", completed=False); storage.compact(storage.load())
+    storage.append("add", _task_id(2), description="b", completed=False)
+    moved = storage.set_aside()
+    assert len(moved) == 2 and all(os.path.exists(path) for path in moved)
+    assert _loaded(tmp_path) == [] and storage.journal_ops == 0
+
+
+def _brute_force_view(store, state, query, sort, reverse):
+    """The ids a view should list, worked out from the store's tasks in display order."""
+    tasks = [task for task in store if state == "all" or task[2] == (state == "completed")]
+    tasks = [task for task in tasks if query.casefold() in task[1].casefold()]
+    key = {"added": None, "status": lambda task: task[2], "description": lambda task: task[1].casefold()}[sort]
+    ordered = sorted(tasks, key=key) if key else tasks
+    return [task_id for task_id, _, _ in (ordered[::-1] if reverse else ordered)]
+
+
+def test_open_views_stay_equal_to_freshly_built_ones():
+    rng = random.Random(21)
+    words = ["Milk", "milk", "Straße", "STRASSE", "call mum", "ab", "abc", "ABCD", "ß"]
+    store = todo.TaskStore()
+    for i in range(300): store.add(f"{rng.choice(words)} {i % 7}", completed=rng.random() < 0.4)
+    specs = [(state, query, sort, reverse) for state in ("all", "ongoing", "completed") for query in ("", "m", "ab", "strasse", "abc")
+             for sort in ("added", "status", "description") for reverse in (False, True)]
+    views = [store.view(*spec) for spec in specs]
+    for step in range(400):
+        ids = [task_id for task_id, _, _ in store]
+        action = rng.random()
+        if action < 0.3:
+            store.add(f"{rng.choice(words)} {step}", completed=rng.random() < 0.4)
+        elif action < 0.5:
+            store.remove(rng.choice(ids))
+        elif action < 0.8:
+            task_id = rng.choice(ids); store.set_completed(task_id, not store.get(task_id)["completed"])
+        else:
+            store.set_description(rng.choice(ids), f"{rng.choice(words)} {step}")
+        if step % 20: continue
+        for spec, view in zip(specs, views):
+            expected = _brute_force_view(store, *spec)
+            assert [task_id for task_id, _, _ in view.page(0, len(store) + 1)] == expected, spec
+            fresh = store.view(*spec)
+            assert list(view.slots) == list(fresh.slots), spec
+            fresh.close()
+            assert all(view.position(task_id) == index for index, task_id in enumerate(expected)), spec
+    for view in views: view.close()
+    assert store._views == []
+
+
+def test_views_page_through_every_task_once():
+    store = todo.TaskStore()
+    for i in range(505): store.add(f"task {i}", completed=i % 3 == 0)
+    for reverse in (False, True):
+        view = store.view("ongoing", sort="description", reverse=reverse)
+        pages = [view.page(n, 50) for n in range(len(view) // 50 + 2)]
+        assert [len(page) for page in pages][-2:] == [len(view) % 50, 0]
+        assert [task for page in pages for task in page] == view.page(0, len(view))
+        view.close()
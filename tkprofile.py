@@ -0,0 +1,326 @@
+"""Opt-in UI-latency profiler for the Tk apps.
+
+Turned on with the --profile flag or the TK_PROFILE environment variable
+(TK_PROFILE=1, or TK_PROFILE=path/to/trace.json to also write a Chrome trace
+on exit). Once installed, every Tk callback (button commands, event bindings,
+scrollbar commands, after() callbacks) is timed, with the time spent inside
+Tcl calls (widget updates) split from the Python time around it (model work).
+An after() heartbeat measures event-loop lag, which is where idle redraws show
+up, and Listbox/Treeview item inserts, updates and deletes are counted per
+callback. Ctrl+Shift+P opens a live overlay; traces open in chrome://tracing
+or https://ui.perfetto.dev.
+"""
+import tkinter as tk
+from tkinter import filedialog, ttk
+from bisect import bisect_left
+from collections import deque
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from tkworkers import PROFILE_ENV_VAR, PROFILE_OFF_VALUES, profiling_requested
+
+ENV_VAR = PROFILE_ENV_VAR
+HEARTBEAT_MS = 50 # Interval between event-loop heartbeats.
+OVERLAY_REFRESH_MS = 1000
+MAX_TRACE_EVENTS = 200_000 # Oldest trace events are dropped past this.
+BUCKET_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 16, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+OVERLAY_KEY = "<Control-Shift-KeyPress-P>"
+_OFF_VALUES = PROFILE_OFF_VALUES
+_ON_VALUES = ("1", "yes", "true", "on")
+
+_profiler = None
+
+class Histogram:
+    """Fixed log-spaced latency buckets in milliseconds; percentiles are bucket upper bounds."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms):
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKET_BOUNDS_MS[i], self.max) if i < len(BUCKET_BOUNDS_MS) else self.max
+        return self.max
+
+    def summary(self):
+        return {"count": self.count, "mean_ms": self.mean, "p50_ms": self.percentile(50),
+                "p99_ms": self.percentile(99), "max_ms": self.max,
+                "buckets": dict(zip([*map(str, BUCKET_BOUNDS_MS), "inf"], self.counts))}
+
+class CallbackStats:
+    """Latency, Tcl time and widget churn for one callback name."""
+
+    def __init__(self):
+        self.latency = Histogram()
+        self.tcl_ms = 0.0
+        self.churn = 0
+        self.max_churn = 0
+
+    def summary(self):
+        summary = self.latency.summary()
+        summary.update(tcl_ms=self.tcl_ms, model_ms=self.latency.total - self.tcl_ms,
+                       churn=self.churn, max_churn=self.max_churn)
+        return summary
+
+class _Span:
+    __slots__ = ("name", "start", "tcl", "churn")
+
+    def __init__(self, name, start):
+        self.name = name
+        self.start = start
+        self.tcl = 0.0
+        self.churn = 0
+
+class _TimedTcl:
+    """Stands in for a root's tkapp object so Tcl calls are timed; everything else passes through."""
+
+    def __init__(self, tkapp, profiler):
+        self._tkapp = tkapp
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._tkapp, name)
+
+    def call(self, *args):
+        start = time.perf_counter()
+        try:
+            return self._tkapp.call(*args)
+        finally:
+            self._profiler._add_tcl(time.perf_counter() - start)
+
+    def eval(self, script):
+        start = time.perf_counter()
+        try:
+            return self._tkapp.eval(script)
+        finally:
+            self._profiler._add_tcl(time.perf_counter() - start)
+
+def _callback_name(func):
+    target = getattr(func, "__func__", func)
+    name = getattr(target, "__qualname__", None) or type(func).__qualname__
+    code = getattr(target, "__code__", None)
+    if code is not None and "<" in name: # Lambdas and nested functions need a location to be told apart.
+        name = f"{name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    return name
+
+class Profiler:
+    """Collects callback spans, heartbeat lag and widget churn for one Tk root."""
+
+    def __init__(self, trace_path=None):
+        self.trace_path = trace_path
+        self.stats = {} # callback name -> CallbackStats
+        self.lag = Histogram()
+        self.events = deque(maxlen=MAX_TRACE_EVENTS)
+        self._stack = []
+        self._origin = time.perf_counter()
+        self._thread = threading.get_ident()
+        self._root = None
+        self._overlay = None
+        self._last_beat = None
+
+    def reset(self):
+        self.stats = {}
+        self.lag = Histogram()
+        self.events.clear()
+
+    def run(self, name, func, args):
+        if threading.get_ident() != self._thread:
+            return func(*args)
+        span = _Span(name, time.perf_counter())
+        self._stack.append(span)
+        try:
+            return func(*args)
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            self._record(span, end)
+
+    def _record(self, span, end):
+        ms = (end - span.start) * 1000
+        stats = self.stats.get(span.name)
+        if stats is None:
+            stats = self.stats[span.name] = CallbackStats()
+        stats.latency.add(ms)
+        stats.tcl_ms += span.tcl * 1000
+        stats.churn += span.churn
+        stats.max_churn = max(stats.max_churn, span.churn)
+        if self._stack: # Nested callbacks (event_generate, update) count towards their parent's churn too.
+            self._stack[-1].churn += span.churn
+        self.events.append({"name": span.name, "cat": "callback", "ph": "X", "pid": 1, "tid": 1,
+                            "ts": (span.start - self._origin) * 1e6, "dur": ms * 1000,
+                            "args": {"tcl_ms": round(span.tcl * 1000, 3), "churn": span.churn}})
+
+    def _add_tcl(self, seconds):
+        if self._stack and threading.get_ident() == self._thread:
+            self._stack[-1].tcl += seconds
+
+    def churned(self, items):
+        if self._stack and threading.get_ident() == self._thread:
+            self._stack[-1].churn += items
+
+    def attach(self, root):
+        """Starts profiling `root`; call right after creating it, before the app builds its widgets."""
+        self._root = root
+        root.tk = _TimedTcl(root.tk, self)
+        root.bind_all(OVERLAY_KEY, lambda event: self.toggle_overlay(), add="+")
+        self._last_beat = time.perf_counter()
+        root.after(HEARTBEAT_MS, self._heartbeat)
+
+    def _heartbeat(self):
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self._last_beat) * 1000 - HEARTBEAT_MS)
+        self.lag.add(lag_ms)
+        self.events.append({"name": "event loop lag", "ph": "C", "pid": 1, "tid": 1,
+                            "ts": (now - self._origin) * 1e6, "args": {"lag_ms": round(lag_ms, 3)}})
+        self._last_beat = now
+        try:
+            self._root.after(HEARTBEAT_MS, self._heartbeat)
+        except tk.TclError:
+            pass # The root is being destroyed.
+
+    def summary(self):
+        return {"event_loop_lag": self.lag.summary(),
+                "callbacks": {name: stats.summary() for name, stats in self.stats.items()}}
+
+    def report_lines(self, limit=25):
+        lag = self.lag
+        lines = [f"event loop lag  p50 {lag.percentile(50):.1f} ms  p99 {lag.percentile(99):.1f} ms  max {lag.max:.1f} ms",
+                 "",
+                 f"{'callback':<40} {'calls':>7} {'p50':>7} {'p99':>7} {'max':>8} {'model%':>7} {'churn':>9}"]
+        ranked = sorted(self.stats.items(), key=lambda item: item[1].latency.total, reverse=True)
+        for name, stats in ranked[:limit]:
+            h = stats.latency
+            model = 100 * (1 - stats.tcl_ms / h.total) if h.total else 0.0
+            lines.append(f"{name[:40]:<40} {h.count:>7} {h.percentile(50):>7.1f} {h.percentile(99):>7.1f} "
+                         f"{h.max:>8.1f} {model:>6.0f}% {stats.churn:>9,}")
+        return lines
+
+    def export_trace(self, path):
+        """Writes the collected events as Chrome-trace JSON."""
+        trace = {"traceEvents": [{"name": "thread_name", "ph": "M", "pid": 1, "tid": 1, "args": {"name": "Tk main loop"}},
+                                 *self.events],
+                 "displayTimeUnit": "ms", "otherData": self.summary()}
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+
+    def _export_on_exit(self):
+        if self.trace_path:
+            self.export_trace(self.trace_path)
+            print(f"Profiler trace written to {self.trace_path}")
+
+    def toggle_overlay(self):
+        if self._overlay is not None:
+            self._overlay.destroy()
+            self._overlay = None
+            return
+        self._overlay = overlay = tk.Toplevel(self._root)
+        overlay.title("UI latency profile")
+        overlay.geometry("760x420")
+        overlay.protocol("WM_DELETE_WINDOW", self.toggle_overlay)
+        text = tk.Text(overlay, font=("Courier", 10), wrap="none")
+        buttons = ttk.Frame(overlay)
+        ttk.Button(buttons, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buttons, text="Export trace...", command=self._ask_export).pack(side=tk.LEFT, padx=5, pady=5)
+        buttons.pack(side=tk.BOTTOM, fill=tk.X)
+        text.pack(fill=tk.BOTH, expand=True)
+
+        def refresh():
+            if self._overlay is not overlay:
+                return
+            text.delete("1.0", tk.END)
+            text.insert("1.0", "\n".join(self.report_lines()))
+            overlay.after(OVERLAY_REFRESH_MS, refresh)
+        refresh()
+
+    def _ask_export(self):
+        path = filedialog.asksaveasfilename(parent=self._overlay, defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json")])
+        if path:
+            self.export_trace(path)
+
+def _patch_tkinter(profiler):
+    register = tk.Misc._register
+    after = tk.Misc.after
+
+    def timed(func, name):
+        @functools.wraps(func)
+        def wrapper(*args):
+            return profiler.run(name, func, args)
+        return wrapper
+
+    def _register(self, func, subst=None, needcleanup=1):
+        # after() registers its own wrapper, which is labelled below; the profiler's own callbacks are skipped.
+        if getattr(func, "__module__", None) != __name__ and not getattr(func, "__qualname__", "").startswith("Misc.after."):
+            func = timed(func, _callback_name(func))
+        return register(self, func, subst, needcleanup)
+
+    def _after(self, ms, func=None, *args):
+        if func is not None and getattr(func, "__module__", None) != __name__:
+            func = timed(func, "after: " + _callback_name(func))
+        return after(self, ms, func, *args)
+
+    tk.Misc._register = tk.Misc.register = _register
+    tk.Misc.after = _after # after_idle() goes through after() too.
+
+    def counting(method, count):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kw):
+            profiler.churned(count(self, args, kw))
+            return method(self, *args, **kw)
+        return wrapper
+
+    def listbox_deleted(listbox, args, kw):
+        first = listbox.index(args[0])
+        last = listbox.index(args[1]) if len(args) > 1 and args[1] is not None else first
+        return max(min(last, listbox.size() - 1) - first + 1, 0)
+
+    tk.Listbox.insert = counting(tk.Listbox.insert, lambda listbox, args, kw: max(len(args) - 1, 0))
+    tk.Listbox.delete = counting(tk.Listbox.delete, listbox_deleted)
+    ttk.Treeview.insert = counting(ttk.Treeview.insert, lambda tree, args, kw: 1)
+    ttk.Treeview.delete = counting(ttk.Treeview.delete, lambda tree, args, kw: len(args))
+    ttk.Treeview.move = counting(ttk.Treeview.move, lambda tree, args, kw: 1)
+    ttk.Treeview.detach = counting(ttk.Treeview.detach, lambda tree, args, kw: len(args))
+    ttk.Treeview.item = counting(ttk.Treeview.item, lambda tree, args, kw: 1 if kw else 0) # Only updates churn.
+
+requested = profiling_requested # The apps call it from tkworkers, so asking does not import this module.
+
+def install(root, trace_path=None):
+    """Profiles every callback of `root` from now on and returns the Profiler.
+
+    The trace path defaults to TK_PROFILE when that holds a file name rather than a flag.
+    """
+    global _profiler
+    if trace_path is None:
+        value = os.environ.get(ENV_VAR, "")
+        if value.lower() not in _OFF_VALUES + _ON_VALUES:
+            trace_path = value
+    if _profiler is None:
+        _profiler = Profiler(trace_path)
+        _patch_tkinter(_profiler)
+        atexit.register(_profiler._export_on_exit)
+    elif trace_path:
+        _profiler.trace_path = trace_path
+    _profiler.attach(root)
+    return _profiler
@@ -0,0 +1,188 @@
+"""Runs model work off the Tk thread and hands the results back on it.
+
+Tk widgets may only be touched from the thread running the main loop, so a
+TkExecutor runs functions on a thread (or process) pool and finished calls
+are put on a queue that the Tk thread drains with after(); completion
+callbacks therefore run on the Tk thread, where they can update widgets.
+
+Requests carry a key. Submitting a new request under a key that is still
+busy supersedes the old one: it is dropped if it has not started yet, and its
+result is thrown away if it has, so a search for "jo" can never overwrite the
+results for "john". coalesce() does the same for work that must stay on the
+Tk thread, such as repainting a list: any number of calls before it runs
+turn into one.
+
+after_first_paint() defers startup work until the window has been drawn.
+concurrent.futures is only imported when the first request is submitted, as
+it costs more at startup than the rest of an app's imports. For the same
+reason profiling_requested() lives here rather than in tkprofile: every app
+asks it at startup, and only imports tkprofile when the answer is yes.
+"""
+import os
+import queue
+
+DEFAULT_WORKERS = 2
+POLL_MS = 15 # How often finished work is collected while anything is in flight.
+FIRST_PAINT_TIMEOUT_MS = 500 # Deferred startup work runs by then even if the window is never drawn.
+PROFILE_FLAG = "--profile"
+PROFILE_ENV_VAR = "TK_PROFILE"
+PROFILE_OFF_VALUES = ("", "0", "no", "false", "off")
+
+class Request:
+    """One submitted call; `cancelled` is set once it has been superseded or cancelled."""
+    __slots__ = ("key", "future", "on_done", "on_error", "cancelled")
+
+    def __init__(self, key, on_done, on_error):
+        self.key = key
+        self.future = None
+        self.on_done = on_done
+        self.on_error = on_error
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+class TkExecutor:
+    """A worker pool whose results are delivered on the Tk thread of `widget`.
+
+    Threads suit work that releases the GIL (SQLite, file IO) or that needs
+    the app's own objects; processes=True suits pure-Python number crunching
+    over picklable arguments. The pool is created on first use.
+    """
+
+    def __init__(self, widget, workers=DEFAULT_WORKERS, processes=False, poll_ms=POLL_MS):
+        self.widget = widget
+        self.workers = workers
+        self.processes = processes
+        self.poll_ms = poll_ms
+        self._pool = None
+        self._done = queue.Queue() # Finished Requests, filled from worker threads.
+        self._active = {} # key -> newest Request not yet delivered
+        self._polling = None # after() id while draining
+        self._coalesced = {} # key -> [after id, func, args]
+
+    def submit(self, key, func, *args, on_done=None, on_error=None):
+        """Runs func(*args) on the pool and then on_done(result), or on_error(exc), on the Tk thread.
+
+        Returns the Request; a still-pending request with the same key is cancelled.
+        """
+        self.cancel(key)
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+            pool_class = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+            self._pool = pool_class(max_workers=self.workers)
+        request = self._active[key] = Request(key, on_done, on_error)
+        request.future = self._pool.submit(func, *args)
+        request.future.add_done_callback(lambda future: self._done.put(request))
+        if self._polling is None:
+            self._polling = self.widget.after(self.poll_ms, self._drain)
+        return request
+
+    def cancel(self, key):
+        """Drops the pending request or coalesced call under `key`, if any; its callbacks will not run."""
+        request = self._active.pop(key, None)
+        if request is not None:
+            request.cancel()
+        pending = self._coalesced.pop(key, None)
+        if pending is not None:
+            self.widget.after_cancel(pending[0])
+
+    def busy(self, key):
+        return key in self._active
+
+    def join(self, timeout=None):
+        """Delivers results as work finishes until none is in flight; for scripts and benchmarks.
+
+        Work submitted by the callbacks is waited for too. Waiting on the queue
+        rather than the futures matters: a future counts as done before its
+        done-callback has put the request on the queue.
+        """
+        import time
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._deliver()
+        while self._active:
+            try:
+                request = self._done.get(timeout=None if deadline is None else max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break # Timed out.
+            self._complete(request)
+
+    def _drain(self):
+        self._polling = None
+        self._deliver()
+        if self._active and self._polling is None: # A callback may have submitted more work already.
+            self._polling = self.widget.after(self.poll_ms, self._drain)
+
+    def _deliver(self):
+        while True:
+            try:
+                request = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._complete(request)
+
+    def _complete(self, request):
+        """Runs the callbacks of one finished request, unless it was superseded."""
+        if request.cancelled or self._active.get(request.key) is not request:
+            return # Superseded; whatever it computed is stale.
+        del self._active[request.key]
+        error = request.future.exception()
+        if error is None:
+            if request.on_done is not None:
+                request.on_done(request.future.result())
+        elif request.on_error is not None:
+            request.on_error(error)
+        else:
+            self.widget.report_callback_exception(type(error), error, error.__traceback__)
+
+    def coalesce(self, key, func, *args, delay_ms=0):
+        """Runs func(*args) once on the Tk thread after `delay_ms`, however often it is asked for meanwhile.
+
+        Later calls replace the arguments but do not push the run back.
+        """
+        pending = self._coalesced.get(key)
+        if pending is not None:
+            pending[1:] = [func, args]
+            return
+        def run():
+            _, func, args = self._coalesced.pop(key)
+            func(*args)
+        self._coalesced[key] = [self.widget.after(delay_ms or "idle", run), func, args]
+
+    def shutdown(self):
+        """Cancels everything outstanding and stops the pool without waiting for running work."""
+        for key in [*self._active, *self._coalesced]:
+            self.cancel(key)
+        if self._polling is not None:
+            self.widget.after_cancel(self._polling)
+            self._polling = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+def after_first_paint(widget, func, *args):
+    """Runs func(*args) on the Tk thread once `widget`'s window has been drawn for the first time.
+
+    Startup work that can wait (secondary panels, loading data) goes here so the
+    window shows up first. It is queued behind the redraws of the first <Expose>,
+    or runs after FIRST_PAINT_TIMEOUT_MS if the window is never shown.
+    """
+    state = {"pending": True}
+    def run():
+        if state.pop("pending", False):
+            func(*args)
+    def exposed(event):
+        if state.get("pending") and "timeout" in state:
+            widget.after_cancel(state.pop("timeout"))
+            widget.after_idle(run) # Tk queued the redraws before this binding ran.
+    widget.bind("<Expose>", exposed, add="+") # Later exposes return at once.
+    state["timeout"] = widget.after(FIRST_PAINT_TIMEOUT_MS, run)
+
+def profiling_requested(argv):
+    """True if tkprofile was asked for; a --profile flag is removed from `argv` so the app's own parsing never sees it."""
+    if PROFILE_FLAG in argv:
+        argv.remove(PROFILE_FLAG)
+        return True
+    return os.environ.get(PROFILE_ENV_VAR, "").lower() not in PROFILE_OFF_VALUES